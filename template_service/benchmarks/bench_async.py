@@ -0,0 +1,85 @@
+"""
+Load benchmark: async render and read paths under concurrent clients.
+
+Awaits the service's async methods directly on the event loop, the way the
+API's async views call them. Run from the template_service directory:
+
+    python -m benchmarks.bench_async
+    BENCH_CACHE=redis python -m benchmarks.bench_async
+"""
+
+import asyncio
+import statistics
+import time
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+
+from template_service.models import Template  # noqa: E402
+from template_service.schemas import RenderTemplateRequest  # noqa: E402
+from template_service.services import TemplateService  # noqa: E402
+
+CONCURRENCY = (1, 10, 50)
+REQUESTS_PER_CLIENT = 200
+
+
+async def drive(call, concurrency: int) -> dict:
+    latencies = []
+
+    async def client():
+        for _ in range(REQUESTS_PER_CLIENT):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "ops": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def scenarios(template: Template) -> dict:
+    by_name = RenderTemplateRequest(
+        name=template.name,
+        category=template.category,
+        language=template.language,
+        context={"user_name": "Ada", "company_name": "Acme"},
+    )
+    return {
+        "render by name": lambda: TemplateService.arender_template(by_name),
+        "get by id": lambda: TemplateService.aget_template_by_id(template.id),
+    }
+
+
+async def main():
+    template = await Template.objects.acreate(
+        name="welcome_email",
+        category="email",
+        subject="Welcome {{user_name}}!",
+        body="<p>Hello {{user_name}}, welcome to {{company_name}}.</p>\n" * 100,
+        language="en",
+        context=["user_name", "company_name"],
+    )
+    for name, call in scenarios(template).items():
+        for concurrency in CONCURRENCY:
+            await sync_to_async(cache.clear)()
+            stats = await drive(call, concurrency)
+            print(
+                f"{name:<15} x{concurrency:<3} | "
+                f"{stats['ops']:8.0f} ops/s "
+                f"p50 {stats['p50'] * 1e3:7.3f} ms "
+                f"p99 {stats['p99'] * 1e3:7.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""
+Benchmark: bulk template import vs one create_template call per template.
+
+Run from the template_service directory:
+
+    python -m benchmarks.bench_bulk_import
+"""
+
+import time
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from template_service.models import Template  # noqa: E402
+from template_service.schemas import CreateTemplate  # noqa: E402
+from template_service.services import TemplateService  # noqa: E402
+
+SINGLE_COUNT = 1_000
+BULK_COUNT = 50_000
+LANGUAGES = ("en", "fr", "de", "es", "pt")
+
+
+def payloads(count: int, prefix: str) -> list:
+    return [
+        CreateTemplate(
+            name=f"{prefix}_{i // len(LANGUAGES)}",
+            category="email",
+            subject="Hello {{user_name}}",
+            body="<p>Hello {{user_name}}, this is template %d</p>" % i,
+            language=LANGUAGES[i % len(LANGUAGES)],
+            context=["user_name"],
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    single = payloads(SINGLE_COUNT, "single")
+    start = time.perf_counter()
+    for payload in single:
+        TemplateService.create_template(payload)
+    single_time = time.perf_counter() - start
+    print(
+        f"create_template x{SINGLE_COUNT}: {single_time:.2f}s "
+        f"({SINGLE_COUNT / single_time:,.0f} templates/s)"
+    )
+
+    bulk = payloads(BULK_COUNT, "bulk")
+    start = time.perf_counter()
+    result = TemplateService.bulk_import_templates(bulk)
+    bulk_time = time.perf_counter() - start
+    print(
+        f"bulk_import_templates x{BULK_COUNT}: {bulk_time:.2f}s "
+        f"({BULK_COUNT / bulk_time:,.0f} templates/s, {result['families']} families)"
+    )
+
+    start = time.perf_counter()
+    result = TemplateService.bulk_import_templates(bulk)
+    print(
+        f"re-import unchanged x{BULK_COUNT}: {time.perf_counter() - start:.2f}s "
+        f"({result['unchanged']} unchanged)"
+    )
+    assert Template.objects.count() == SINGLE_COUNT + BULK_COUNT
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: database loads when many requests miss the same hot key at once.
+
+Compares loading every miss with single-flight loading. Run from the
+template_service directory:
+
+    python -m benchmarks.bench_coalescing
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+
+from template_service.caching import miss_coalescer, template_l1_cache  # noqa: E402
+from template_service.models import Template  # noqa: E402
+from template_service.services import TemplateService  # noqa: E402
+
+CONCURRENCY = (8, 32, 64)
+
+
+@contextmanager
+def uncoalesced():
+    """Temporarily run every miss's loader, as before single-flight loading"""
+
+    async def load(key, loader, lookup):
+        return await loader()
+
+    miss_coalescer.aload = load
+    try:
+        yield
+    finally:
+        del miss_coalescer.aload
+
+
+def herd(requests: int) -> tuple:
+    cache.clear()
+    template_l1_cache.clear()
+    loads = []
+    original = TemplateService._aload_latest_template.__func__
+
+    async def counting_loader(cls, *args):
+        loads.append(1)
+        return await original(cls, *args)
+
+    TemplateService._aload_latest_template = classmethod(counting_loader)
+
+    async def run():
+        await asyncio.gather(
+            *(
+                TemplateService.aget_latest_template("welcome_email", "email", "en")
+                for _ in range(requests)
+            )
+        )
+
+    start = time.perf_counter()
+    async_to_sync(run)()
+    elapsed = time.perf_counter() - start
+    TemplateService._aload_latest_template = classmethod(original)
+    return len(loads), elapsed
+
+
+def main():
+    Template.objects.create(
+        name="welcome_email", category="email", body="Hello {{user_name}}" * 500
+    )
+    for requests in CONCURRENCY:
+        with uncoalesced():
+            before_loads, before_time = herd(requests)
+        loads, elapsed = herd(requests)
+        print(
+            f"{requests:>3} concurrent misses | "
+            f"uncoalesced: {before_loads:>3} loads {before_time * 1e3:7.1f} ms | "
+            f"single-flight: {loads:>3} loads {elapsed * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: precompiled templates vs per-call regex substitution.
+
+Run from the template_service directory:
+
+    python -m benchmarks.bench_compiler
+"""
+
+import re
+import timeit
+
+from template_service.compiler import CompiledTemplateCache
+
+VARIABLES = ["user_name", "company_name", "order_id", "reset_link", "support_email"]
+
+
+def legacy_replace_variables(text: str, context: dict) -> str:
+    """The regex substitution previously used by TemplateService._replace_variables"""
+
+    def replace_match(match):
+        var_name = match.group(1)
+        return str(context.get(var_name, match.group(0)))
+
+    pattern = r"\{\{(\w+)\}\}"
+    return re.sub(pattern, replace_match, text)
+
+
+def build_html_body(rows: int) -> str:
+    row = (
+        '<tr><td style="padding:8px;font-family:Arial,sans-serif">'
+        "Hi {{user_name}}, order {{order_id}} from {{company_name}} has shipped. "
+        '<a href="{{reset_link}}">Track it</a> or write to {{support_email}}.'
+        "</td></tr>\n"
+    )
+    return f"<html><body><table>\n{row * rows}</table></body></html>"
+
+
+def run(rows: int, number: int) -> None:
+    subject = "Your order {{order_id}} from {{company_name}}"
+    body = build_html_body(rows)
+    context = {name: f"value-of-{name}" for name in VARIABLES}
+    compiled_cache = CompiledTemplateCache()
+
+    def legacy():
+        legacy_replace_variables(subject, context)
+        legacy_replace_variables(body, context)
+
+    def compiled():
+        template = compiled_cache.get(("bench", 1), subject, body)
+        template.subject.render(context)
+        template.body.render(context)
+
+    assert legacy_replace_variables(body, context) == compiled_cache.get(
+        ("bench", 1), subject, body
+    ).body.render(context)
+
+    legacy_time = min(timeit.repeat(legacy, number=number, repeat=5)) / number
+    compiled_time = min(timeit.repeat(compiled, number=number, repeat=5)) / number
+    print(
+        f"{len(body) / 1024:8.1f} KiB body | "
+        f"regex: {legacy_time * 1e6:9.1f} us | "
+        f"compiled: {compiled_time * 1e6:9.1f} us | "
+        f"speedup: {legacy_time / compiled_time:5.2f}x"
+    )
+
+
+def main():
+    for rows, number in ((10, 2000), (100, 500), (1000, 50), (5000, 10)):
+        run(rows, number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: template list cache invalidation cost as cached pages grow.
+
+Compares the previous KEYS-pattern scan with the generation counter.
+Run from the template_service directory:
+
+    python -m benchmarks.bench_list_invalidation
+    BENCH_CACHE=redis python -m benchmarks.bench_list_invalidation
+"""
+
+import fnmatch
+import time
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+
+from template_service.services import (  # noqa: E402
+    TemplateCacheKeys,
+    TemplateService,
+)
+
+PAGE_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+TEMPLATE = ("welcome_email", "email", "en", "550e8400-e29b-41d4-a716-446655440000")
+
+
+def cache_keys(pattern: str) -> list:
+    """KEYS on Redis; an equivalent full scan on the local-memory cache"""
+    if hasattr(cache, "keys"):
+        return cache.keys(pattern)
+    prefix = cache.make_key("")
+    return [
+        key[len(prefix) :]
+        for key in list(cache._cache)
+        if fnmatch.fnmatchcase(key[len(prefix) :], pattern)
+    ]
+
+
+def legacy_invalidate(name, category, language, template_id) -> None:
+    """The KEYS based invalidation previously used by _invalidate_template_cache"""
+    cache.delete_many(
+        [
+            TemplateCacheKeys.template_latest(name, category, language),
+            TemplateCacheKeys.template_versions(name, category, language),
+            TemplateCacheKeys.template_by_id(template_id),
+        ]
+    )
+    keys = cache_keys("template:list:*")
+    if keys:
+        cache.delete_many(keys)
+
+
+def populate(pages: int) -> None:
+    generation = async_to_sync(TemplateService._alist_generation)()
+    entries = {}
+    for page in range(1, pages + 1):
+        entries[TemplateCacheKeys.template_list(generation, "all", "all", page, 20)] = {
+            "data": [],
+            "meta": {},
+        }
+        if len(entries) == 10_000:
+            cache.set_many(entries, 3600)
+            entries = {}
+    cache.set_many(entries, 3600)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn(*TEMPLATE)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"cache backend: {settings.CACHES['default']['BACKEND']}")
+    for pages in PAGE_COUNTS:
+        cache.clear()
+        populate(pages)
+        legacy_time = timed(legacy_invalidate)
+
+        cache.clear()
+        populate(pages)
+        generation_time = timed(TemplateService._invalidate_template_cache)
+
+        print(
+            f"{pages:>7} cached pages | "
+            f"KEYS scan: {legacy_time * 1e3:9.3f} ms | "
+            f"generation bump: {generation_time * 1e3:7.3f} ms"
+        )
+    cache.clear()
+
+
+if __name__ == "__main__":
+    main()
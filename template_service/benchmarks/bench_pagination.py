@@ -0,0 +1,82 @@
+"""
+Benchmark: offset vs keyset (cursor) pagination of the template list.
+
+Times uncached list queries at increasing depths; offset pages also pay a
+COUNT(*) per request. Run from the template_service directory:
+
+    python -m benchmarks.bench_pagination
+"""
+
+import time
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from django.core.paginator import Paginator  # noqa: E402
+
+from template_service.models import Template, TemplateBody  # noqa: E402
+from template_service.services import TemplateService  # noqa: E402
+
+ROWS = 100_000
+LIMIT = 20
+DEPTHS = (1, 10, 100, 1_000, 4_999)
+REPEAT = 20
+
+
+def populate() -> None:
+    # bulk_create skips Template.save, which stores the body row
+    body = Template(body="Hello {{user_name}}").body_ref
+    TemplateBody.store([body])
+    batch = []
+    for i in range(ROWS):
+        batch.append(Template(name=f"template_{i}", body_ref=body))
+        if len(batch) == 10_000:
+            Template.objects.bulk_create(batch)
+            batch = []
+    Template.objects.bulk_create(batch)
+
+
+def offset_page(page: int) -> list:
+    paginator = Paginator(
+        TemplateService._filtered_queryset({}).order_by("-created_at"), LIMIT
+    )
+    page_obj = paginator.get_page(page)
+    TemplateService.create_pagination_meta(paginator, page_obj)
+    return list(page_obj.object_list)
+
+
+def cursor_for(page: int) -> str:
+    """The cursor a client would hold when asking for the given page"""
+    if page == 1:
+        return ""
+    queryset = TemplateService._filtered_queryset({}).order_by("-created_at", "-id")
+    return TemplateService.encode_cursor(queryset[(page - 1) * LIMIT - 1])
+
+
+def cursor_page(cursor: str) -> list:
+    query = {"cursor": cursor, "limit": LIMIT}
+    return list(TemplateService._cursor_queryset(query))
+
+
+def timed(fn, arg) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(arg)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    populate()
+    print(f"{ROWS} templates, {LIMIT} per page")
+    for page in DEPTHS:
+        offset_time = timed(offset_page, page)
+        cursor_time = timed(cursor_page, cursor_for(page))
+        print(
+            f"page {page:>5} | offset + COUNT: {offset_time * 1e3:8.3f} ms | "
+            f"cursor: {cursor_time * 1e3:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Micro-benchmark: render responses validated by Ninja vs encoded directly.
+
+Both operations declare the same response schema and return the same
+service-built data; the first lets Ninja validate it into pydantic models
+and dump it again, the second encodes it with json_response (orjson when
+installed, else the stdlib encoder). Run from the template_service
+directory:
+
+    python -m benchmarks.bench_render_response
+"""
+
+import timeit
+import uuid
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from django.test import RequestFactory  # noqa: E402
+from ninja import NinjaAPI  # noqa: E402
+
+from template_service import utils  # noqa: E402
+from template_service.schemas import (  # noqa: E402
+    BatchRenderedTemplateResponse,
+    RenderedTemplateResponse,
+)
+from template_service.utils import json_response  # noqa: E402
+
+ROW = "<tr><td>Hi Ada, order A-1042 from Acme has shipped.</td></tr>\n"
+META = {
+    "template_id": str(uuid.uuid4()),
+    "template_name": "order_shipped",
+    "version": 3,
+    "category": "email",
+    "language": "en",
+}
+
+
+def single(body_size: int) -> dict:
+    return {
+        "success": True,
+        "message": "Template rendered successfully",
+        "data": {
+            **META,
+            "subject": "Order A-1042 shipped",
+            "body": ROW * max(1, body_size // len(ROW)),
+        },
+    }
+
+
+def batch(items: int, body_size: int) -> dict:
+    body = ROW * max(1, body_size // len(ROW))
+    return {
+        "success": True,
+        "message": "Templates rendered successfully",
+        "data": {
+            **META,
+            "items": [
+                {
+                    "index": index,
+                    "success": True,
+                    "subject": "Order A-1042 shipped",
+                    "body": body,
+                    "error": None,
+                }
+                for index in range(items)
+            ],
+        },
+    }
+
+
+def views(schema, payload: dict) -> dict:
+    api = NinjaAPI(urls_namespace=f"bench-{uuid.uuid4().hex}")
+
+    @api.post("/validated", response=schema)
+    def validated(request):
+        return payload
+
+    @api.post("/direct", response=schema)
+    def direct(request):
+        return json_response(payload)
+
+    return {str(url.pattern): url.callback for url in api.urls[0]}
+
+
+def run(label: str, schema, payload: dict, number: int) -> None:
+    callbacks = views(schema, payload)
+    factory = RequestFactory()
+
+    def call(path: str):
+        request = factory.post(f"/{path}", data=b"", content_type="application/json")
+        return lambda: callbacks[path](request)
+
+    validated = call("validated")
+    direct = call("direct")
+    assert validated().status_code == direct().status_code == 200
+
+    orjson = utils.orjson
+    timings = {}
+    timings["validated"] = min(timeit.repeat(validated, number=number, repeat=5))
+    timings["orjson"] = min(timeit.repeat(direct, number=number, repeat=5))
+    utils.orjson = None
+    try:
+        timings["json"] = min(timeit.repeat(direct, number=number, repeat=5))
+    finally:
+        utils.orjson = orjson
+
+    size = len(direct().content) / 1024
+    print(
+        f"{label:<22} {size:8.1f} KiB | "
+        + " | ".join(
+            f"{name}: {seconds / number * 1e6:9.1f} us"
+            for name, seconds in timings.items()
+        )
+        + f" | {timings['validated'] / timings['orjson']:5.1f}x"
+    )
+
+
+def main():
+    if utils.orjson is None:
+        print("orjson is not installed; the orjson column uses the stdlib encoder")
+    for body_size, number in ((1024, 5000), (16384, 2000), (65536, 500)):
+        run(
+            f"render {body_size // 1024} KiB",
+            RenderedTemplateResponse,
+            single(body_size),
+            number,
+        )
+    for items, number in ((10, 500), (100, 100), (1000, 10)):
+        run(
+            f"batch {items} x 2 KiB",
+            BatchRenderedTemplateResponse,
+            batch(items, 2048),
+            number,
+        )
+
+
+if __name__ == "__main__":
+    main()
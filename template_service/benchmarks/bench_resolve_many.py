@@ -0,0 +1,123 @@
+"""
+Benchmark: resolving many templates one at a time vs with resolve_templates.
+
+Resolves 10 to 500 template references, by id and by name, with cold
+caches (database) and with only the shared cache warm (in-process cache
+cleared), and counts the shared cache calls and queries each side makes.
+Against the default local-memory cache the times show CPU cost only; run
+with BENCH_CACHE=redis to include the Redis round trips. Run from the
+template_service directory:
+
+    python -m benchmarks.bench_resolve_many
+"""
+
+import time
+from unittest.mock import patch
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from template_service.caching import template_l1_cache  # noqa: E402
+from template_service.schemas import CreateTemplate, TemplateReference  # noqa: E402
+from template_service.services import TemplateService  # noqa: E402
+
+TEMPLATES = 500
+SIZES = (10, 100, 500)
+CACHE_CALLS = ("get", "get_many", "set", "set_many", "add")
+
+
+def seed() -> list:
+    TemplateService.bulk_import_templates(
+        [
+            CreateTemplate(
+                name=f"template_{i}",
+                category="email",
+                body=f"<p>Hello {{{{name}}}}, this is template {i}.</p>",
+            )
+            for i in range(TEMPLATES)
+        ]
+    )
+    return list(
+        TemplateService._latest_templates().order_by("name").values_list("id", "name")
+    )
+
+
+def one_by_one(references: list) -> list:
+    resolve = async_to_sync(TemplateService._aresolve_template)
+    results = []
+    for reference in references:
+        try:
+            results.append(resolve(reference))
+        except ValueError as e:
+            results.append(e)
+    return results
+
+
+def run(label: str, resolve, references: list, warm: bool) -> None:
+    cache.clear()
+    template_l1_cache.clear()
+    if warm:
+        TemplateService.resolve_templates(references)
+        template_l1_cache.clear()
+
+    calls = {name: 0 for name in CACHE_CALLS}
+    depth = [0]
+
+    def counting(name):
+        method = getattr(cache, name)
+
+        # Only calls from the service count: the local-memory cache
+        # implements get_many and set_many with get and set
+        def call(*args, **kwargs):
+            calls[name] += not depth[0]
+            depth[0] += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+
+        return call
+
+    with CaptureQueriesContext(connection) as queries:
+        with patch.multiple(cache, **{name: counting(name) for name in CACHE_CALLS}):
+            start = time.perf_counter()
+            resolve(references)
+            elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<40} {elapsed * 1e3:9.2f} ms | "
+        f"{sum(calls.values()):5d} cache calls | {len(queries):4d} queries"
+    )
+
+
+def main():
+    families = seed()
+    for size in SIZES:
+        by_id = [TemplateReference(id=str(id)) for id, _name in families[:size]]
+        by_name = [
+            TemplateReference(name=name, category="email", language="en")
+            for _id, name in families[:size]
+        ]
+        for kind, references in (("id", by_id), ("name", by_name)):
+            for warm in (False, True):
+                state = "redis warm" if warm else "cold"
+                for method, resolve in (
+                    ("one by one", one_by_one),
+                    ("resolve_templates", TemplateService.resolve_templates),
+                ):
+                    run(
+                        f"{size:>3} by {kind:<4} {state:<10} {method}",
+                        resolve,
+                        references,
+                        warm,
+                    )
+
+
+if __name__ == "__main__":
+    main()
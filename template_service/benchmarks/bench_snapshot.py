@@ -0,0 +1,73 @@
+"""
+Benchmark: cached render snapshots vs pickled Template model instances.
+
+Reports bytes per cache entry and deserialize time for each, using the
+same pickle serializer django_redis applies to cached values.
+Run from the template_service directory:
+
+    python -m benchmarks.bench_snapshot
+"""
+
+import pickle
+import timeit
+import uuid
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from django.utils import timezone  # noqa: E402
+
+from template_service.models import Template  # noqa: E402
+from template_service.snapshots import TemplateSnapshot  # noqa: E402
+
+
+def build_template(body_size: int) -> Template:
+    now = timezone.now()
+    row = "<p>Hello {{user_name}}, welcome to {{company_name}}.</p>\n"
+    template = Template(
+        id=uuid.uuid4(),
+        name="welcome_email",
+        category="email",
+        subject="Welcome {{user_name}}!",
+        body=row * max(1, body_size // len(row)),
+        language="en",
+        version=3,
+        context=["user_name", "company_name"],
+        created_at=now,
+        updated_at=now,
+    )
+    template._state.adding = False
+    template._state.db = "default"
+    return template
+
+
+def run(body_size: int, number: int) -> None:
+    template = build_template(body_size)
+    pickled_model = pickle.dumps(template, pickle.HIGHEST_PROTOCOL)
+    pickled_snapshot = pickle.dumps(
+        TemplateSnapshot.from_model(template).encode(), pickle.HIGHEST_PROTOCOL
+    )
+
+    def load_model():
+        pickle.loads(pickled_model)
+
+    def load_snapshot():
+        TemplateSnapshot.decode(pickle.loads(pickled_snapshot))
+
+    model_time = min(timeit.repeat(load_model, number=number, repeat=5)) / number
+    snapshot_time = min(timeit.repeat(load_snapshot, number=number, repeat=5)) / number
+    print(
+        f"{len(template.body) / 1024:7.1f} KiB body | "
+        f"model: {len(pickled_model):>8} B {model_time * 1e6:8.2f} us | "
+        f"snapshot: {len(pickled_snapshot):>8} B {snapshot_time * 1e6:8.2f} us"
+    )
+
+
+def main():
+    for body_size, number in ((256, 20000), (4096, 20000), (65536, 2000)):
+        run(body_size, number)
+
+
+if __name__ == "__main__":
+    main()
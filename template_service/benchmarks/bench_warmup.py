@@ -0,0 +1,74 @@
+"""
+Benchmark: cache warm-up time by template count.
+
+Compares warm_cache with the cold path it replaces, one aget_latest_template
+miss per family. Run from the template_service directory:
+
+    python -m benchmarks.bench_warmup
+    BENCH_CACHE=redis python -m benchmarks.bench_warmup
+"""
+
+import time
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+
+from template_service.caching import template_l1_cache  # noqa: E402
+from template_service.schemas import CreateTemplate  # noqa: E402
+from template_service.services import TemplateService  # noqa: E402
+
+TEMPLATE_COUNTS = (1_000, 10_000, 50_000)
+VERSIONS = 2
+BODY = "<p>Hello {{user_name}}, your order {{order_id}} has shipped.</p>" * 40
+
+
+def seed(start: int, stop: int) -> None:
+    payloads = [
+        CreateTemplate(
+            name=f"template_{i}",
+            category="email",
+            subject="Order {{order_id}}",
+            body=f"{BODY} v{version}",
+            context=["user_name", "order_id"],
+        )
+        for version in range(VERSIONS)
+        for i in range(start, stop)
+    ]
+    TemplateService.bulk_import_templates(payloads)
+
+
+def cold_lookups(count: int) -> float:
+    cache.clear()
+    template_l1_cache.clear()
+    get_latest_template = async_to_sync(TemplateService.aget_latest_template)
+    start = time.perf_counter()
+    for i in range(count):
+        get_latest_template(f"template_{i}", "email", "en")
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"cache backend: {settings.CACHES['default']['BACKEND']}")
+    seeded = 0
+    for count in TEMPLATE_COUNTS:
+        seed(seeded, count)
+        seeded = count
+
+        cold_time = cold_lookups(count)
+        cache.clear()
+        result = TemplateService.warm_cache()
+        print(
+            f"{count:>6} templates ({VERSIONS} versions each) | "
+            f"warm_cache: {result['seconds']:6.2f}s | "
+            f"cold misses: {cold_time:6.2f}s"
+        )
+    cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark: render worker batches vs rendering one message at a time.
+
+Both sides render the same notification messages against the in-memory
+broker; the per-message side resolves the template for every message, as
+the channel services do today (minus their HTTP round trip). Run from the
+template_service directory:
+
+    python -m benchmarks.bench_worker
+"""
+
+import json
+import time
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+
+from template_service.schemas import (  # noqa: E402
+    CreateTemplate,
+    NotificationMessage,
+    RenderTemplateRequest,
+)
+from template_service.services import TemplateService  # noqa: E402
+from template_service.worker import (  # noqa: E402
+    EXCHANGE,
+    RENDER_QUEUE,
+    RENDER_ROUTING_KEY,
+    InMemoryBroker,
+    RenderWorker,
+)
+
+MESSAGES = 20_000
+TEMPLATES = 20
+BATCH_SIZES = (1, 10, 100, 500)
+BODY = "<p>Hello {{name}}, follow {{link}} to continue.</p>" * 20
+
+
+def messages() -> list:
+    return [
+        json.dumps(
+            {
+                "notification_type": "email",
+                "template_code": f"template_{i % TEMPLATES}",
+                "variables": {"name": f"user {i}", "link": f"https://x.io/{i}"},
+                "request_id": f"req-{i}",
+            }
+        ).encode()
+        for i in range(MESSAGES)
+    ]
+
+
+def broker_with(bodies: list) -> InMemoryBroker:
+    broker = InMemoryBroker()
+    broker.declare("email.queue", EXCHANGE, "email")
+    broker.declare(RENDER_QUEUE, EXCHANGE, RENDER_ROUTING_KEY)
+    for body in bodies:
+        broker.publish(EXCHANGE, RENDER_ROUTING_KEY, body)
+    return broker
+
+
+def one_at_a_time(bodies: list) -> float:
+    broker = broker_with(bodies)
+    render_template = async_to_sync(TemplateService.arender_template)
+    start = time.perf_counter()
+    while True:
+        deliveries = broker.get_batch(RENDER_QUEUE, 1, 0)
+        if not deliveries:
+            break
+        message = NotificationMessage.model_validate_json(deliveries[0].body)
+        data = render_template(
+            RenderTemplateRequest(
+                name=message.template_code,
+                category=message.notification_type,
+                language=message.language,
+                context=message.variables,
+            )
+        )
+        payload = {**message.model_dump(mode="json"), "rendered": data}
+        broker.publish(EXCHANGE, "email", json.dumps(payload).encode())
+        broker.ack(deliveries[0].delivery_tag)
+    return time.perf_counter() - start
+
+
+def batched(bodies: list, batch_size: int) -> float:
+    broker = broker_with(bodies)
+    worker = RenderWorker(broker, batch_size=batch_size, timeout=0)
+    start = time.perf_counter()
+    while True:
+        deliveries = broker.get_batch(RENDER_QUEUE, batch_size, 0)
+        if not deliveries:
+            break
+        worker.process_batch(deliveries)
+    assert len(broker.queues["email.queue"]) == MESSAGES
+    return time.perf_counter() - start
+
+
+def main():
+    for i in range(TEMPLATES):
+        TemplateService.create_template(
+            CreateTemplate(
+                name=f"template_{i}",
+                category="email",
+                subject="Hi {{name}}",
+                body=BODY,
+                context=["name", "link"],
+            )
+        )
+    bodies = messages()
+    one_at_a_time(bodies[:100])  # warm the template caches
+
+    elapsed = one_at_a_time(bodies)
+    print(
+        f"{MESSAGES} messages, {TEMPLATES} templates\n"
+        f"one at a time:  {elapsed:.2f}s ({MESSAGES / elapsed:,.0f} msg/s)"
+    )
+    for batch_size in BATCH_SIZES:
+        elapsed = batched(bodies, batch_size)
+        print(
+            f"batch of {batch_size:>4}:  {elapsed:.2f}s ({MESSAGES / elapsed:,.0f} msg/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
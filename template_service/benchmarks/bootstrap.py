@@ -0,0 +1,18 @@
+import os
+
+
+def setup_django() -> None:
+    """Configure Django with the benchmark settings and create fresh tables"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmarks-only")
+    os.environ.setdefault("USE_SQLITE", "True")
+
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    django.setup()
+    database = getattr(settings, "BENCH_DATABASE", None)
+    if database and os.path.exists(database):
+        os.remove(database)
+    call_command("migrate", run_syncdb=True, verbosity=0)
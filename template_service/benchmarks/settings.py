@@ -0,0 +1,67 @@
+"""
+Settings for running benchmarks offline.
+
+A throwaway SQLite file and a local-memory cache by default; set BENCH_CACHE=redis
+to benchmark against the Redis instance at REDIS_URL instead, or
+BENCH_CACHE=fakeredis for django_redis against an in-process fake (needs
+pip install "fakeredis[lua]", as django_redis increments through a Lua script).
+"""
+
+import os
+import tempfile
+
+from config.settings import *  # noqa: F401,F403
+from config.settings import REDIS_URL
+
+# A file rather than ":memory:" so threads used by the async ORM share it.
+BENCH_DATABASE = os.path.join(tempfile.gettempdir(), "template_service_bench.sqlite3")
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BENCH_DATABASE,
+    }
+}
+
+BENCH_CACHE = os.environ.get("BENCH_CACHE", "locmem")
+
+if BENCH_CACHE == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        }
+    }
+elif BENCH_CACHE == "fakeredis":
+    import fakeredis
+
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://fakeredis:6379/0",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.FakeConnection,
+                    "server": fakeredis.FakeServer(),
+                },
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 1_000_000},
+        }
+    }
+
+# Tables are created straight from the models for the throwaway database.
+MIGRATION_MODULES = {"template_service": None}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "root": {"level": "WARNING"},
+}
@@ -0,0 +1,374 @@
+"""
+Benchmark suite: throughput, latency and allocations of the service hot paths.
+
+Runs offline against a throwaway SQLite database and a local-memory cache
+(see benchmarks/settings.py for the Redis and fakeredis options) and
+prints one JSON document with ops/s, p50/p99 latency and the peak bytes
+allocated per operation for every scenario. Save a run as a baseline and
+compare later runs against it; the exit status is 1 when a scenario
+regressed by more than the threshold. Run from the template_service
+directory:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json
+    python -m benchmarks.suite --filter 'render.*' --scale 0.2
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, NamedTuple, Optional
+
+from benchmarks.bootstrap import setup_django
+
+setup_django()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+
+from template_service.caching import render_cache, template_l1_cache  # noqa: E402
+from template_service.compiler import compiled_templates  # noqa: E402
+from template_service.schemas import (  # noqa: E402
+    BatchRenderTemplateRequest,
+    CreateTemplate,
+    RenderTemplateRequest,
+    TemplatesQuerySchema,
+    UpdateTemplate,
+)
+from template_service.services import TemplateService  # noqa: E402
+
+FAMILIES = 5_000
+LIST_LIMIT = 20
+LIST_DEPTH = 100
+BATCH_CONTEXTS = 100
+CONTEXT_KEYS = 200
+BODY = "<p>Hello {{user_name}}, your order {{order_id}} ships to {{city}}.</p>\n" * 50
+CONTEXT = {"user_name": "Ada", "order_id": "A-1042", "city": "Lagos"}
+
+# The service reads asynchronously; scenarios drive it the way a sync caller would
+render_template = async_to_sync(TemplateService.arender_template)
+render_batch = async_to_sync(TemplateService.arender_batch)
+get_all_templates = async_to_sync(TemplateService.aget_all_templates)
+
+
+class Case(NamedTuple):
+    """An operation to time and an untimed reset run before each call"""
+
+    op: Callable[[], object]
+    before: Optional[Callable[[], None]] = None
+
+
+class Scenario(NamedTuple):
+    name: str
+    build: Callable[[dict], Case]
+    iterations: int
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str, iterations: int):
+    def register(build):
+        SCENARIOS[name] = Scenario(name, build, iterations)
+        return build
+
+    return register
+
+
+def clear_caches() -> None:
+    cache.clear()
+    template_l1_cache.clear()
+    render_cache.clear()
+    compiled_templates.clear()
+
+
+def seed() -> dict:
+    TemplateService.bulk_import_templates(
+        [
+            CreateTemplate(
+                name=f"template_{i}",
+                category="email",
+                subject="Order {{order_id}}",
+                body=f"{BODY}<!-- {i} -->",
+                context=list(CONTEXT),
+            )
+            for i in range(FAMILIES)
+        ]
+    )
+    template = TemplateService.create_template(
+        CreateTemplate(
+            name="order_shipped",
+            category="email",
+            subject="Order {{order_id}} shipped",
+            body=BODY,
+            context=list(CONTEXT),
+        )
+    )
+    return {"template": template}
+
+
+def by_id(fixtures: dict) -> RenderTemplateRequest:
+    return RenderTemplateRequest(id=str(fixtures["template"].id), context=CONTEXT)
+
+
+def by_name(fixtures: dict) -> RenderTemplateRequest:
+    template = fixtures["template"]
+    return RenderTemplateRequest(
+        name=template.name,
+        category=template.category,
+        language=template.language,
+        context=CONTEXT,
+    )
+
+
+@scenario("render.id.hot", iterations=5_000)
+def render_by_id_hot(fixtures: dict) -> Case:
+    payload = by_id(fixtures)
+    return Case(lambda: render_template(payload))
+
+
+@scenario("render.name.hot", iterations=5_000)
+def render_by_name_hot(fixtures: dict) -> Case:
+    payload = by_name(fixtures)
+    return Case(lambda: render_template(payload))
+
+
+@scenario("render.id.cold", iterations=1_000)
+def render_by_id_cold(fixtures: dict) -> Case:
+    payload = by_id(fixtures)
+    return Case(lambda: render_template(payload), clear_caches)
+
+
+@scenario("render.name.cold", iterations=1_000)
+def render_by_name_cold(fixtures: dict) -> Case:
+    payload = by_name(fixtures)
+    return Case(lambda: render_template(payload), clear_caches)
+
+
+@scenario("render.batch.large_contexts", iterations=200)
+def render_batch_large_contexts(fixtures: dict) -> Case:
+    padding = {f"extra_{key}": "x" * 32 for key in range(CONTEXT_KEYS)}
+    payload = BatchRenderTemplateRequest(
+        id=str(fixtures["template"].id),
+        contexts=[
+            {**padding, **CONTEXT, "order_id": f"A-{i}"} for i in range(BATCH_CONTEXTS)
+        ],
+    )
+    return Case(lambda: render_batch(payload))
+
+
+@scenario("list.offset.deep", iterations=200)
+def list_offset_deep(fixtures: dict) -> Case:
+    query = TemplatesQuerySchema(page=LIST_DEPTH, limit=LIST_LIMIT)
+    return Case(lambda: get_all_templates(query), cache.clear)
+
+
+@scenario("list.cursor.deep", iterations=500)
+def list_cursor_deep(fixtures: dict) -> Case:
+    cursor = ""
+    for _ in range(LIST_DEPTH - 1):
+        page = get_all_templates(
+            TemplatesQuerySchema(cursor=cursor, limit=LIST_LIMIT, fields="summary")
+        )
+        cursor = page["meta"]["next_cursor"]
+    query = TemplatesQuerySchema(cursor=cursor, limit=LIST_LIMIT)
+    return Case(lambda: get_all_templates(query), cache.clear)
+
+
+@scenario("list.cached", iterations=5_000)
+def list_cached(fixtures: dict) -> Case:
+    query = TemplatesQuerySchema(page=1, limit=LIST_LIMIT)
+    return Case(lambda: get_all_templates(query))
+
+
+@scenario("write.create", iterations=500)
+def write_create(fixtures: dict) -> Case:
+    counter = iter(range(sys.maxsize))
+
+    def create():
+        TemplateService.create_template(
+            CreateTemplate(
+                name=f"created_{next(counter)}",
+                category="email",
+                body=BODY,
+                context=list(CONTEXT),
+            )
+        )
+
+    return Case(create)
+
+
+@scenario("write.update", iterations=500)
+def write_update(fixtures: dict) -> Case:
+    template_id = str(fixtures["template"].id)
+    counter = iter(range(sys.maxsize))
+    # Cache the template and a list page so each update has work to invalidate
+    warm = (by_id(fixtures), TemplatesQuerySchema(page=1, limit=LIST_LIMIT))
+
+    def update():
+        TemplateService.update_template(
+            template_id,
+            UpdateTemplate(subject=f"Order {{{{order_id}}}} update {next(counter)}"),
+        )
+
+    def before():
+        render_template(warm[0])
+        get_all_templates(warm[1])
+
+    return Case(update, before)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def measure(case: Case, iterations: int) -> dict:
+    op, before = case
+    for _ in range(max(1, iterations // 10)):
+        if before:
+            before()
+        op()
+
+    latencies = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    # Traced separately: tracemalloc slows every allocation down
+    allocations = []
+    tracemalloc.start()
+    try:
+        for _ in range(max(1, iterations // 20)):
+            if before:
+                before()
+            tracemalloc.reset_peak()
+            baseline, _peak = tracemalloc.get_traced_memory()
+            op()
+            _current, peak = tracemalloc.get_traced_memory()
+            allocations.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    allocations.sort()
+
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / sum(latencies), 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 4),
+        "alloc_peak_bytes": percentile(allocations, 0.50),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """
+    Relative change of each metric against the baseline
+
+    A scenario regressed when its throughput dropped, or its allocations
+    grew, by more than ``threshold``. Latency changes are reported only:
+    p99 over a few hundred iterations is too noisy to gate on.
+    """
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        changes = {
+            metric: round(current[metric] / previous[metric] - 1, 4)
+            for metric in ("ops_per_sec", "p50_ms", "p99_ms", "alloc_peak_bytes")
+            if previous.get(metric)
+        }
+        changes["regressed"] = (
+            changes.get("ops_per_sec", 0) < -threshold
+            or changes.get("alloc_peak_bytes", 0) > threshold
+        )
+        comparison[name] = changes
+    return comparison
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="Also write the results to this file")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Relative change that counts as a regression (default: 0.15)",
+    )
+    parser.add_argument(
+        "--filter",
+        default="*",
+        help="Only run scenarios matching this glob (default: all)",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every scenario's iteration count, e.g. 0.1 for a smoke run",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    selected = [
+        s for name, s in SCENARIOS.items() if fnmatch.fnmatchcase(name, args.filter)
+    ]
+    fixtures = seed()
+
+    results = {}
+    for entry in selected:
+        clear_caches()
+        iterations = max(1, int(entry.iterations * args.scale))
+        results[entry.name] = measure(entry.build(fixtures), iterations)
+        result = results[entry.name]
+        print(
+            f"{entry.name:<28} {result['ops_per_sec']:>10.1f} ops/s | "
+            f"p50 {result['p50_ms']:8.3f} ms | p99 {result['p99_ms']:8.3f} ms | "
+            f"{result['alloc_peak_bytes'] / 1024:8.1f} KiB peak",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cache": settings.CACHES["default"]["BACKEND"],
+            "scale": args.scale,
+        },
+        "results": results,
+    }
+    regressed = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(results, json.load(f), args.threshold)
+        regressed = [
+            name for name, change in report["comparison"].items() if change["regressed"]
+        ]
+
+    document = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(document + "\n")
+    print(document)
+
+    if regressed:
+        print(f"Regressed: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
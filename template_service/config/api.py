@@ -1,13 +1,21 @@
+from django.http import HttpResponse
 from ninja import NinjaAPI
 
 from config.utils import get_attr, get_status_code
 from template_service.api import router
+from template_service.metrics import CONTENT_TYPE, registry
 
 api = NinjaAPI()
 
 api.add_router("template-service/", router)
 
 
+@api.get("/metrics", include_in_schema=False)
+def metrics(request):
+    """Prometheus scrape endpoint"""
+    return HttpResponse(registry.expose(), content_type=CONTENT_TYPE)
+
+
 @api.exception_handler(Exception)
 def global_exception_handler(request, exc):
     message = get_attr(exc, "message", "An unexpected error occurred.")
@@ -7,10 +7,31 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
+import logging
 import os
+import threading
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.db import connection
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+
+def warm_template_cache():
+    from template_service.services import TemplateService
+
+    try:
+        TemplateService.warm_cache(local=True)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Template cache warm-up failed: {e}")
+    finally:
+        connection.close()
+
+
+# Warm in the background: servers may import this module inside a running
+# event loop, where the ORM cannot be used, and startup should not wait
+if settings.TEMPLATE_CACHE_WARM_ON_STARTUP:
+    threading.Thread(target=warm_template_cache, daemon=True).start()
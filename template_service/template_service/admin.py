@@ -1,6 +1,32 @@
+from django import forms
 from django.contrib import admin
 
 from template_service.models import Template
 
 admin.site.site_header = "Template Service Admin"
-admin.site.register(Template)
+
+
+class TemplateAdminForm(forms.ModelForm):
+    """Edit the body text; saving stores it as a content-addressed TemplateBody"""
+
+    body = forms.CharField(widget=forms.Textarea)
+
+    class Meta:
+        model = Template
+        exclude = ["body_ref", "placeholders"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.body_ref_id:
+            self.fields["body"].initial = self.instance.body
+
+    def save(self, commit=True):
+        if self.instance.body_ref_id is None or "body" in self.changed_data:
+            self.instance.body = self.cleaned_data["body"]
+        return super().save(commit)
+
+
+@admin.register(Template)
+class TemplateAdmin(admin.ModelAdmin):
+    form = TemplateAdminForm
+    list_display = ["name", "category", "language", "version", "is_active"]
@@ -1,6 +1,13 @@
 from ninja import Query, Router
 
+from template_service.exceptions import BaseException
+from template_service.profiling import profiled_view
 from template_service.schemas import (
+    BatchRenderedTemplateResponse,
+    BatchRenderTemplateRequest,
+    BulkImportResponse,
+    BulkImportTemplatesRequest,
+    CacheStatsResponse,
     CreateTemplate,
     ErrorResponse,
     RenderedTemplateResponse,
@@ -11,11 +18,13 @@ from template_service.schemas import (
     UpdateTemplate,
 )
 from template_service.services import TemplateService
+from template_service.utils import json_response, ndjson_response, wants_ndjson
 
 router = Router()
 
 
 @router.post("/templates", response={201: TemapleteDataResponse, 400: ErrorResponse})
+@profiled_view
 def create_template(request, payload: CreateTemplate):
     try:
         template = TemplateService.create_template(payload)
@@ -28,21 +37,62 @@ def create_template(request, payload: CreateTemplate):
         return 400, {"success": False, "message": str(e)}
 
 
+@router.post("/templates/bulk", response={201: BulkImportResponse, 400: ErrorResponse})
+@profiled_view
+def bulk_import_templates(request, payload: BulkImportTemplatesRequest):
+    try:
+        result = TemplateService.bulk_import_templates(payload.templates)
+        return 201, {
+            "success": True,
+            "message": "Templates imported successfully",
+            "data": result,
+        }
+    except Exception as e:
+        return 400, {"success": False, "message": str(e)}
+
+
 @router.post(
     "templates/render", response={200: RenderedTemplateResponse, 400: ErrorResponse}
 )
-def render_template(request, payload: RenderTemplateRequest):
+@profiled_view
+async def render_template(request, payload: RenderTemplateRequest):
     try:
-        data = TemplateService.render_template(payload)
-        return {"message": "Template rendered successfully", "data": data}
+        data = await TemplateService.arender_template(payload)
+        # Rendered data is built by the service in the documented shape, so
+        # large bodies skip a validate-then-dump round trip through pydantic
+        return json_response(
+            {"success": True, "message": "Template rendered successfully", "data": data}
+        )
+    except Exception as e:
+        return 400, {"success": False, "message": str(e)}
+
+
+@router.post(
+    "templates/render/batch",
+    response={200: BatchRenderedTemplateResponse, 400: ErrorResponse},
+)
+@profiled_view
+async def render_template_batch(request, payload: BatchRenderTemplateRequest):
+    try:
+        if wants_ndjson(request):
+            return ndjson_response(await TemplateService.astream_render_batch(payload))
+        data = await TemplateService.arender_batch(payload)
+        return json_response(
+            {
+                "success": True,
+                "message": "Templates rendered successfully",
+                "data": data,
+            }
+        )
     except Exception as e:
         return 400, {"success": False, "message": str(e)}
 
 
 @router.patch(
     "/templates/{template_id}",
-    response={200: TemapleteDataResponse, 404: ErrorResponse},
+    response={200: TemapleteDataResponse, 400: ErrorResponse, 404: ErrorResponse},
 )
+@profiled_view
 def update_template(request, template_id: str, payload: UpdateTemplate):
     try:
         template = TemplateService.update_template(template_id, payload)
@@ -50,13 +100,21 @@ def update_template(request, template_id: str, payload: UpdateTemplate):
             "message": "Template updated successfully",
             "data": template,
         }
+    except BaseException as e:
+        return e.status_code, {"success": False, "message": str(e)}
     except Exception as e:
         return 404, {"success": False, "message": str(e)}
 
 
-@router.get("/templates", response={200: TemplateListResponse})
-def get_all_templates(request, query: Query[TemplatesQuerySchema]):
-    data = TemplateService.get_all_templates(query)
+@router.get("/templates", response={200: TemplateListResponse, 400: ErrorResponse})
+@profiled_view
+async def get_all_templates(request, query: Query[TemplatesQuerySchema]):
+    try:
+        if wants_ndjson(request):
+            return ndjson_response(await TemplateService.aiter_templates(query))
+        data = await TemplateService.aget_all_templates(query)
+    except Exception as e:
+        return 400, {"success": False, "message": str(e)}
     data["message"] = "Templates retrieved successfully"
     return data
 
@@ -65,8 +123,9 @@ def get_all_templates(request, query: Query[TemplatesQuerySchema]):
     "/templates/{template_id}",
     response={200: TemapleteDataResponse, 404: ErrorResponse},
 )
-def get_template_by_id(request, template_id: str):
-    template = TemplateService.get_template_by_id(template_id)
+@profiled_view
+async def get_template_by_id(request, template_id: str):
+    template = await TemplateService.aget_template_by_id(template_id)
     if not template:
         return 404, {
             "success": False,
@@ -79,9 +138,19 @@ def get_template_by_id(request, template_id: str):
 
 
 @router.delete("/templates/{template_id}", response={200: dict, 404: ErrorResponse})
+@profiled_view
 def delete_template(request, template_id: str):
     try:
         TemplateService.delete_template(template_id)
         return {"success": True, "message": "Template deleted successfully"}
     except Exception as e:
         return 404, {"success": False, "message": str(e)}
+
+
+@router.get("/cache/stats", response={200: CacheStatsResponse})
+@profiled_view
+def get_cache_stats(request):
+    return {
+        "message": "Cache statistics retrieved successfully",
+        "data": TemplateService.cache_stats(),
+    }
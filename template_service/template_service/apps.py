@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class TemplateServiceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'template_service'
+
+    def ready(self):
+        from template_service.metrics import install_query_counter
+
+        connection_created.connect(install_query_counter)
@@ -0,0 +1,556 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable, NamedTuple, Optional
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from django_redis.client import DefaultClient
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with a per-entry TTL.
+
+    Least recently used entries are evicted once ``max_entries`` is reached;
+    expired entries are dropped lazily when read.
+    """
+
+    def __init__(self, max_entries: int = 512, timeout: float = 60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value, timeout: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AsyncCache:
+    """
+    Async access to a Django cache.
+
+    With django_redis, commands go straight to Redis over a redis.asyncio
+    connection, using django_redis' own key and value encoding so entries
+    are shared with the sync cache. Other backends fall back to Django's
+    async cache API.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else cache
+        self._clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def _redis_client(self) -> Optional[aioredis.Redis]:
+        django_redis_client = getattr(self.backend, "client", None)
+        if not isinstance(django_redis_client, DefaultClient):
+            return None
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            options = django_redis_client._options
+            pool_class = aioredis.ConnectionPool
+            if issubclass(
+                import_string(
+                    options.get("CONNECTION_POOL_CLASS", "redis.ConnectionPool")
+                ),
+                redis.BlockingConnectionPool,
+            ):
+                pool_class = aioredis.BlockingConnectionPool
+            client = aioredis.Redis.from_pool(
+                pool_class.from_url(
+                    django_redis_client._server[0],
+                    **options.get("CONNECTION_POOL_KWARGS", {}),
+                )
+            )
+            self._clients[loop] = client
+        return client
+
+    def connection_pools(self) -> dict:
+        """Redis connection pools of the sync client and of each loop's client"""
+        django_redis_client = getattr(self.backend, "client", None)
+        if not isinstance(django_redis_client, DefaultClient):
+            return {}
+        return {
+            "sync": [
+                client.connection_pool
+                for client in django_redis_client._clients
+                if client is not None
+            ],
+            "async": [
+                client.connection_pool for client in list(self._clients.values())
+            ],
+        }
+
+    async def get(self, key: str, default=None):
+        client = self._redis_client()
+        if client is None:
+            return await self.backend.aget(key, default)
+        codec = self.backend.client
+        value = await client.get(codec.make_key(key))
+        return default if value is None else codec.decode(value)
+
+    async def get_many(self, keys: list) -> dict:
+        client = self._redis_client()
+        if client is None:
+            return await self.backend.aget_many(keys)
+        if not keys:
+            return {}
+        codec = self.backend.client
+        values = await client.mget([codec.make_key(key) for key in keys])
+        return {
+            key: codec.decode(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    @staticmethod
+    def _expiry(timeout: Optional[float]) -> dict:
+        """
+        SET arguments expiring a key after a Django cache timeout
+
+        Milliseconds, as django_redis sends them: redis-py only takes whole
+        seconds in ``ex`` and the timeouts from settings are floats.
+        """
+        if timeout is None:
+            return {}
+        return {"px": max(1, int(timeout * 1000))}
+
+    async def set(self, key: str, value, timeout: Optional[float]) -> None:
+        client = self._redis_client()
+        if client is None:
+            return await self.backend.aset(key, value, timeout)
+        codec = self.backend.client
+        await client.set(
+            codec.make_key(key), codec.encode(value), **self._expiry(timeout)
+        )
+
+    async def add(self, key: str, value, timeout: Optional[float]) -> bool:
+        client = self._redis_client()
+        if client is None:
+            return await self.backend.aadd(key, value, timeout)
+        codec = self.backend.client
+        return bool(
+            await client.set(
+                codec.make_key(key),
+                codec.encode(value),
+                nx=True,
+                **self._expiry(timeout),
+            )
+        )
+
+    async def delete(self, key: str) -> None:
+        client = self._redis_client()
+        if client is None:
+            return await self.backend.adelete(key)
+        await client.delete(self.backend.client.make_key(key))
+
+
+class TemplateL1Cache(LocalCache):
+    """
+    Per-process cache in front of the shared Redis cache.
+
+    Workers stay coherent through a version stamp kept in the shared cache:
+    invalidating bumps the stamp, and every worker compares it with the last
+    stamp it saw at most once per ``stamp_check_interval`` seconds, dropping
+    all of its entries when it changed.
+    """
+
+    STAMP_KEY = "template:l1:stamp"
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        timeout: float = 60,
+        stamp_check_interval: float = 1.0,
+        shared_cache=None,
+    ):
+        super().__init__(max_entries, timeout)
+        self.stamp_check_interval = stamp_check_interval
+        self.shared_cache = shared_cache if shared_cache is not None else cache
+        self.async_shared_cache = AsyncCache(self.shared_cache)
+        self._stamp = None
+        self._stamp_checked_at = float("-inf")
+
+    def get(self, key: Hashable, default=None):
+        if self._stamp_check_due():
+            self._sync_stamp()
+        return super().get(key, default)
+
+    async def aget(self, key: Hashable, default=None):
+        """Like get, but reads the shared stamp without blocking the event loop"""
+        if self._stamp_check_due():
+            try:
+                stamp = await self.async_shared_cache.get(self.STAMP_KEY)
+            except Exception as e:
+                logger.warning(f"Could not read L1 cache stamp: {e}")
+                self.clear()
+            else:
+                self._apply_stamp(stamp)
+        return super().get(key, default)
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """Drop keys locally and tell the other workers to drop their entries"""
+        self.delete_many(keys)
+        try:
+            self.shared_cache.incr(self.STAMP_KEY)
+        except ValueError:
+            self.shared_cache.add(self.STAMP_KEY, 1, None)
+        except Exception as e:
+            logger.warning(f"Could not bump L1 cache stamp: {e}")
+
+    def _stamp_check_due(self) -> bool:
+        now = time.monotonic()
+        if now - self._stamp_checked_at < self.stamp_check_interval:
+            return False
+        self._stamp_checked_at = now
+        return True
+
+    def _sync_stamp(self) -> None:
+        try:
+            stamp = self.shared_cache.get(self.STAMP_KEY)
+        except Exception as e:
+            logger.warning(f"Could not read L1 cache stamp: {e}")
+            self.clear()
+            return
+        self._apply_stamp(stamp)
+
+    def _apply_stamp(self, stamp) -> None:
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.clear()
+
+
+class RenderCache(LocalCache):
+    """
+    Memoized render output keyed by body hash, subject and context hash.
+
+    Changed content renders under a new key, so updates invalidate
+    naturally, and versions or languages sharing a body and subject share
+    their entries. Disabled when ``max_entries`` is 0.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key_for(template, context: dict) -> tuple:
+        """
+        Key a render by the str() values of the placeholders it uses
+
+        That is exactly what substitution consumes, so equal keys always
+        mean equal output and unrelated context keys do not split entries.
+        The placeholders are the sorted names stored with the template.
+        """
+        values = []
+        for var_name in template.placeholders:
+            value = context.get(var_name, _MISSING)
+            values.append(None if value is _MISSING else str(value))
+        encoded = json.dumps(values, separators=(",", ":"))
+        digest = hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+        return (template.body_hash, template.subject, digest)
+
+
+class CachedValue(NamedTuple):
+    """
+    A shared cache entry carrying what probabilistic early refresh needs.
+
+    ``expires_at`` is wall-clock time, as entries are shared between hosts;
+    ``delta`` is how long loading the value took.
+    """
+
+    value: Any
+    expires_at: float
+    delta: float
+
+    @classmethod
+    def wrap(cls, value, timeout: float, delta: float = 0.0) -> "CachedValue":
+        return cls(value, time.time() + timeout, delta)
+
+    def should_refresh(self, beta: float) -> bool:
+        """
+        Whether this reader should reload the value ahead of its expiry
+
+        XFetch: the chance rises as expiry nears and with the load cost, so
+        under load one reader refreshes a hot key while the others are still
+        served the cached value, and the key never actually expires.
+        """
+        if beta <= 0:
+            return False
+        jitter = -math.log(1.0 - random.random())
+        return time.time() + self.delta * beta * jitter >= self.expires_at
+
+
+class NegativeCache:
+    """
+    Short-lived markers for templates that do not exist.
+
+    Lookups of unknown ids or names are answered from the marker until it
+    expires or the key is invalidated, so a producer sending bad references
+    costs one database query per key per ``timeout`` rather than one per
+    message. Disabled when ``timeout`` is 0.
+    """
+
+    MARKER = "template:not-found"
+
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+        self.hits = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout > 0
+
+    def is_marker(self, value) -> bool:
+        return isinstance(value, str) and value == self.MARKER
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_store(self) -> None:
+        with self._lock:
+            self.stores += 1
+
+    def stats(self) -> dict:
+        return {"timeout": self.timeout, "hits": self.hits, "stores": self.stores}
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MissCoalescer:
+    """
+    Single-flight loading of cache misses.
+
+    Within a process one caller per key runs the loader while concurrent
+    callers wait for its result. With a ``lock_timeout``, the loader also
+    takes a short lock in the shared cache: callers in other processes
+    that find it held poll the cache for the value instead of querying the
+    database, and load it themselves if it has not appeared by the time
+    the lock expires.
+    """
+
+    LOCK_PREFIX = "lock:"
+
+    def __init__(
+        self,
+        lock_timeout: float = 0,
+        early_refresh_beta: float = 1.0,
+        poll_interval: float = 0.05,
+        shared_cache=None,
+    ):
+        self.lock_timeout = lock_timeout
+        self.early_refresh_beta = early_refresh_beta
+        self.poll_interval = poll_interval
+        self.shared_cache = shared_cache if shared_cache is not None else cache
+        self.async_shared_cache = AsyncCache(self.shared_cache)
+        self._flights: dict = {}
+        self._lock = threading.Lock()
+        self._async_flights: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def load(self, key: str, loader: Callable, lookup: Callable):
+        """
+        Load a missed key once, however many threads ask for it
+
+        ``lookup`` reads the key from the cache; it is polled while another
+        process holds the shared lock.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._load_locked(key, loader, lookup)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def aload(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable],
+        lookup: Callable[[], Awaitable],
+    ):
+        """Like load, for coroutines sharing the running event loop"""
+        loop = asyncio.get_running_loop()
+        flights = self._async_flights.setdefault(loop, {})
+        flight = flights.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = flights[key] = loop.create_future()
+        try:
+            result = await self._aload_locked(key, loader, lookup)
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # waiters re-raise it; don't log it as unretrieved
+            raise
+        except BaseException:
+            flight.cancel()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            flights.pop(key, None)
+
+    def _load_locked(self, key: str, loader: Callable, lookup: Callable):
+        if self.lock_timeout <= 0:
+            return loader()
+        lock_key = self.LOCK_PREFIX + key
+        try:
+            acquired = self.shared_cache.add(lock_key, 1, self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"Could not take cache lock {lock_key}: {e}")
+            return loader()
+
+        if not acquired:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                value = lookup()
+                if value is not None:
+                    return value
+            return loader()
+
+        try:
+            return loader()
+        finally:
+            try:
+                self.shared_cache.delete(lock_key)
+            except Exception as e:
+                logger.warning(f"Could not release cache lock {lock_key}: {e}")
+
+    async def _aload_locked(self, key: str, loader, lookup):
+        if self.lock_timeout <= 0:
+            return await loader()
+        lock_key = self.LOCK_PREFIX + key
+        try:
+            acquired = await self.async_shared_cache.add(lock_key, 1, self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"Could not take cache lock {lock_key}: {e}")
+            return await loader()
+
+        if not acquired:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                value = await lookup()
+                if value is not None:
+                    return value
+            return await loader()
+
+        try:
+            return await loader()
+        finally:
+            try:
+                await self.async_shared_cache.delete(lock_key)
+            except Exception as e:
+                logger.warning(f"Could not release cache lock {lock_key}: {e}")
+
+
+template_l1_cache = TemplateL1Cache(
+    max_entries=getattr(settings, "TEMPLATE_L1_CACHE_MAX_ENTRIES", 512),
+    timeout=getattr(settings, "TEMPLATE_L1_CACHE_TIMEOUT", 60),
+    stamp_check_interval=getattr(settings, "TEMPLATE_L1_STAMP_CHECK_INTERVAL", 1.0),
+)
+
+render_cache = RenderCache(
+    max_entries=getattr(settings, "TEMPLATE_RENDER_CACHE_MAX_ENTRIES", 0),
+    timeout=getattr(settings, "TEMPLATE_RENDER_CACHE_TIMEOUT", 300),
+)
+
+async_cache = AsyncCache()
+
+negative_cache = NegativeCache(
+    timeout=getattr(settings, "TEMPLATE_NEGATIVE_CACHE_TIMEOUT", 30),
+)
+
+miss_coalescer = MissCoalescer(
+    lock_timeout=getattr(settings, "TEMPLATE_CACHE_LOCK_TIMEOUT", 0),
+    early_refresh_beta=getattr(settings, "TEMPLATE_CACHE_EARLY_REFRESH_BETA", 1.0),
+)
@@ -0,0 +1,142 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+_MISSING = object()
+
+
+def extract_placeholders(*texts: Optional[str]) -> frozenset:
+    """Names of the ``{{variable}}`` placeholders used across texts"""
+    return frozenset(
+        name for text in texts if text for name in PLACEHOLDER_PATTERN.findall(text)
+    )
+
+
+class CompiledText:
+    """
+    A ``{{variable}}`` text parsed once into literal segments and variable slots.
+
+    ``literals`` always has exactly one more item than ``variables``, so a
+    render is ``literals[0] + value(variables[0]) + literals[1] + ...``.
+    """
+
+    __slots__ = ("literals", "variables", "placeholders")
+
+    def __init__(self, text: str):
+        parts = PLACEHOLDER_PATTERN.split(text)
+        self.literals = tuple(parts[0::2])
+        self.variables = tuple(parts[1::2])
+        self.placeholders = frozenset(self.variables)
+
+    def render(self, context: dict) -> str:
+        """
+        Render the text with values from context
+
+        Placeholders without a value in context are kept as-is, matching
+        the behaviour of the regex based substitution.
+        """
+        literals = self.literals
+        if not self.variables:
+            return literals[0]
+
+        parts = [literals[0]]
+        append = parts.append
+        get = context.get
+        for index, var_name in enumerate(self.variables, 1):
+            value = get(var_name, _MISSING)
+            append(f"{{{{{var_name}}}}}" if value is _MISSING else str(value))
+            append(literals[index])
+        return "".join(parts)
+
+
+class CompiledTemplate:
+    """Compiled subject and body of a single template version"""
+
+    __slots__ = ("subject", "body", "placeholders", "variable_names")
+
+    def __init__(
+        self,
+        subject: Optional[str],
+        body: str,
+        compiled_body: Optional[CompiledText] = None,
+    ):
+        self.subject = CompiledText(subject or "")
+        self.body = compiled_body if compiled_body is not None else CompiledText(body)
+        self.placeholders = self.subject.placeholders | self.body.placeholders
+        self.variable_names = tuple(sorted(self.placeholders))
+
+
+class CompiledTemplateCache:
+    """
+    Bounded LRU of compiled templates.
+
+    Keys are derived from template content, which never changes under a
+    key, so entries never need invalidating. Bodies passed with a
+    ``body_key`` are also compiled once per key and shared by every
+    template using them, whatever their subject.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+        self._bodies: "OrderedDict[Hashable, CompiledText]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        subject: Optional[str],
+        body: str,
+        body_key: Optional[Hashable] = None,
+    ) -> CompiledTemplate:
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+
+        compiled_body = None if body_key is None else self._body(body_key, body)
+        compiled = CompiledTemplate(subject, body, compiled_body)
+        with self._lock:
+            self._store(self._entries, key, compiled)
+        return compiled
+
+    def _body(self, key: Hashable, body: str) -> CompiledText:
+        with self._lock:
+            compiled = self._bodies.get(key)
+            if compiled is not None:
+                self._bodies.move_to_end(key)
+                return compiled
+
+        compiled = CompiledText(body)
+        with self._lock:
+            self._store(self._bodies, key, compiled)
+        return compiled
+
+    def _store(self, entries: OrderedDict, key: Hashable, value) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bodies.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+compiled_templates = CompiledTemplateCache()
+
+
+def compile_template(template) -> CompiledTemplate:
+    """Get the compiled form of a template, keyed by its body hash and subject"""
+    body_hash = template.body_hash
+    return compiled_templates.get(
+        (body_hash, template.subject), template.subject, template.body, body_hash
+    )
@@ -0,0 +1,81 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from pydantic import ValidationError
+
+from template_service.schemas import CreateTemplate
+from template_service.services import TemplateService
+
+
+def read_rows(stream, fmt: str) -> list:
+    """Read template dicts from a JSON array/object or an NDJSON stream"""
+    if fmt == "ndjson":
+        return [json.loads(line) for line in stream if line.strip()]
+    data = json.load(stream)
+    if isinstance(data, dict):
+        data = data.get("templates", [])
+    if not isinstance(data, list):
+        raise CommandError("Expected a JSON array of templates")
+    return data
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import templates from a JSON or NDJSON file in one transaction. "
+        "Templates identical to their family's current version are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument(
+            "--format",
+            choices=["json", "ndjson"],
+            help="Input format (default: guessed from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TemplateService.BULK_BATCH_SIZE,
+            help="Rows per INSERT statement",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "json"
+        )
+
+        start = time.perf_counter()
+        try:
+            if path == "-":
+                rows = read_rows(sys.stdin, fmt)
+            else:
+                with open(path, encoding="utf-8") as stream:
+                    rows = read_rows(stream, fmt)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        payloads = []
+        for index, row in enumerate(rows, 1):
+            try:
+                payloads.append(CreateTemplate.model_validate(row))
+            except ValidationError as e:
+                raise CommandError(f"Template #{index} is invalid: {e}")
+
+        if not payloads:
+            self.stdout.write("Nothing to import")
+            return
+
+        result = TemplateService.bulk_import_templates(
+            payloads, batch_size=options["batch_size"]
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created']} templates across "
+                f"{result['families']} families ({result['unchanged']} unchanged) "
+                f"in {elapsed:.2f}s"
+            )
+        )
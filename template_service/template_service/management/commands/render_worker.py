@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from template_service.worker import PikaBroker, RenderWorker
+
+
+class Command(BaseCommand):
+    help = (
+        "Consume notification messages from RabbitMQ, render their templates "
+        "and publish ready-to-send payloads to the email and push queues."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default=settings.RABBITMQ_URL,
+            help="AMQP URL of the broker (default: RABBITMQ_URL)",
+        )
+        parser.add_argument(
+            "--queue",
+            default=settings.TEMPLATE_RENDER_QUEUE,
+            help="Queue to consume notification messages from",
+        )
+        parser.add_argument(
+            "--prefetch",
+            type=int,
+            default=settings.TEMPLATE_RENDER_PREFETCH,
+            help="Messages prefetched and rendered per batch",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            broker = PikaBroker(options["url"], prefetch=options["prefetch"])
+        except Exception as e:
+            raise CommandError(f"Could not connect to the broker: {e}")
+
+        worker = RenderWorker(
+            broker, queue=options["queue"], batch_size=options["prefetch"]
+        )
+        worker.setup()
+        self.stdout.write(f"Rendering notifications from {options['queue']}")
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            broker.close()
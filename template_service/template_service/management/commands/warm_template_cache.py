@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from template_service.services import TemplateService
+
+
+class Command(BaseCommand):
+    help = (
+        "Preload the latest active version of every template family into the "
+        "shared cache, e.g. after a deploy or a Redis flush."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TemplateService.BULK_BATCH_SIZE,
+            help="Templates per query chunk and per set_many call",
+        )
+
+    def handle(self, *args, **options):
+        result = TemplateService.warm_cache(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {result['templates']} templates in {result['seconds']:.2f}s"
+            )
+        )
@@ -0,0 +1,459 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Label values recorded once a metric has reached its max_series
+OVERFLOW_LABEL = "__other__"
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time of the block, whether or not it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric(ABC):
+    """
+    A metric family with a fixed set of label names.
+
+    ``max_series`` bounds the number of label combinations kept; values for
+    combinations first seen after that are recorded under OVERFLOW_LABEL,
+    so labels fed from request data cannot grow memory without limit.
+    """
+
+    type = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        max_series: Optional[int] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """The child metric for one combination of label values"""
+        child = self._children.get(values)
+        if child is not None:
+            return child
+
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        with self._lock:
+            if self.max_series is not None and len(self._children) >= self.max_series:
+                key = (OVERFLOW_LABEL,) * len(key)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A child holding the values of one label combination"""
+
+    @abstractmethod
+    def _samples(self, labels: Tuple[str, ...], child) -> List[str]:
+        """The exposition lines of one child"""
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+    def expose(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labels, child in sorted(self._children.items()):
+            lines.extend(self._samples(labels, child))
+        return lines
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self, labels, child) -> List[str]:
+        pairs = _format_labels(zip(self.labelnames, labels))
+        return [f"{self.name}{pairs} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self, labels, child) -> List[str]:
+        pairs = _format_labels(zip(self.labelnames, labels))
+        return [f"{self.name}{pairs} {_format_value(child.value)}"]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self, labels, child) -> List[str]:
+        label_pairs = list(zip(self.labelnames, labels))
+        lines = []
+        cumulative = 0
+        for upper_bound, count in zip(
+            self.upper_bounds + (float("inf"),), list(child.counts)
+        ):
+            cumulative += count
+            pairs = _format_labels(label_pairs + [("le", _format_value(upper_bound))])
+            lines.append(f"{self.name}_bucket{pairs} {cumulative}")
+        pairs = _format_labels(label_pairs)
+        lines.append(f"{self.name}_sum{pairs} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{pairs} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metric families exposed together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def clear(self) -> None:
+        """Drop all recorded values, keeping the registered families"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Run ``collect`` before each exposition, to refresh sampled values"""
+        self._collectors.append(collect)
+
+    def expose(self) -> str:
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception:
+                logger.exception(f"Metrics collector {collect.__name__} failed")
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+render_seconds = registry.register(
+    Histogram(
+        "template_render_seconds",
+        "Time to resolve and render templates, by how the template was referenced",
+        ["path", "mode"],
+    )
+)
+
+template_renders_total = registry.register(
+    Counter(
+        "template_renders_total",
+        "Rendered templates by template name",
+        ["template"],
+        max_series=getattr(settings, "TEMPLATE_METRICS_MAX_TEMPLATES", 200),
+    )
+)
+
+cache_requests_total = registry.register(
+    Counter(
+        "template_cache_requests_total",
+        "Template cache lookups by cache tier and result",
+        ["tier", "result"],
+    )
+)
+
+cache_invalidation_seconds = registry.register(
+    Histogram(
+        "template_cache_invalidation_seconds",
+        "Time to delete invalidated cache keys and bump the list generation",
+    )
+)
+
+db_queries_per_request = registry.register(
+    Histogram(
+        "template_db_queries_per_request",
+        "Database queries run while handling one request, by route",
+        ["route"],
+        buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+        max_series=100,
+    )
+)
+
+db_pool_connections = registry.register(
+    Gauge(
+        "template_db_pool_connections",
+        "Connections of this process' psycopg pool, by database and state",
+        ["database", "state"],
+    )
+)
+
+db_pool_utilization = registry.register(
+    Gauge(
+        "template_db_pool_utilization",
+        "Share of the psycopg pool's max_size checked out, by database",
+        ["database"],
+    )
+)
+
+db_pool_requests_waiting = registry.register(
+    Gauge(
+        "template_db_pool_requests_waiting",
+        "Requests waiting for a connection from the psycopg pool, by database",
+        ["database"],
+    )
+)
+
+db_pool_requests_total = registry.register(
+    Counter(
+        "template_db_pool_requests_total",
+        "Connections requested from the psycopg pool, by database and whether "
+        "they were queued or failed",
+        ["database", "result"],
+    )
+)
+
+db_pool_wait_seconds_total = registry.register(
+    Counter(
+        "template_db_pool_wait_seconds_total",
+        "Time requests spent queued for a connection from the psycopg pool",
+        ["database"],
+    )
+)
+
+redis_pool_connections = registry.register(
+    Gauge(
+        "template_redis_pool_connections",
+        "Connections of this process' Redis pools, by client and state",
+        ["client", "state"],
+    )
+)
+
+redis_pool_utilization = registry.register(
+    Gauge(
+        "template_redis_pool_utilization",
+        "Share of the Redis pools' max_connections in use, by client",
+        ["client"],
+    )
+)
+
+
+def collect_db_pools() -> None:
+    """
+    Sample the psycopg pools opened in this process
+
+    Pools belong to the Postgres backend and are only created once a
+    connection with ``OPTIONS["pool"]`` is first used, so this is a no-op
+    for other databases. The pool's counters are popped and added to ours.
+    """
+    for alias in connections:
+        pool = getattr(connections[alias], "_connection_pools", {}).get(alias)
+        if pool is None:
+            continue
+        stats = pool.pop_stats()
+        size = stats.get("pool_size", 0)
+        idle = stats.get("pool_available", 0)
+        max_size = stats.get("pool_max", pool.max_size)
+        db_pool_connections.labels(alias, "in_use").set(size - idle)
+        db_pool_connections.labels(alias, "idle").set(idle)
+        db_pool_connections.labels(alias, "max").set(max_size)
+        db_pool_utilization.labels(alias).set((size - idle) / max_size)
+        db_pool_requests_waiting.labels(alias).set(stats.get("requests_waiting", 0))
+        db_pool_requests_total.labels(alias, "all").inc(stats.get("requests_num", 0))
+        db_pool_requests_total.labels(alias, "queued").inc(
+            stats.get("requests_queued", 0)
+        )
+        db_pool_requests_total.labels(alias, "error").inc(
+            stats.get("requests_errors", 0)
+        )
+        db_pool_wait_seconds_total.labels(alias).inc(
+            stats.get("requests_wait_ms", 0) / 1e3
+        )
+
+
+def _redis_pool_usage(pool) -> Tuple[int, int]:
+    """In-use and idle connections of a redis-py connection pool"""
+    if hasattr(pool, "_in_use_connections"):
+        return len(pool._in_use_connections), len(pool._available_connections)
+    # Sync BlockingConnectionPool: idle connections wait in a queue padded
+    # with None for the connections it may still open
+    idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+    return len(pool._connections) - idle, idle
+
+
+def collect_redis_pools() -> None:
+    """Sample the connection pools of the template cache's Redis clients"""
+    from template_service.caching import async_cache
+
+    for client, pools in async_cache.connection_pools().items():
+        in_use = idle = max_connections = 0
+        for pool in pools:
+            pool_in_use, pool_idle = _redis_pool_usage(pool)
+            in_use += pool_in_use
+            idle += pool_idle
+            max_connections += pool.max_connections
+        redis_pool_connections.labels(client, "in_use").set(in_use)
+        redis_pool_connections.labels(client, "idle").set(idle)
+        redis_pool_connections.labels(client, "max").set(max_connections)
+        redis_pool_utilization.labels(client).set(
+            in_use / max_connections if max_connections else 0
+        )
+
+
+registry.add_collector(collect_db_pools)
+registry.add_collector(collect_redis_pools)
+
+
+def cache_lookup(tier: str, hit: bool) -> None:
+    cache_requests_total.labels(tier, "hit" if hit else "miss").inc()
+
+
+_query_count: ContextVar[Optional[List[int]]] = ContextVar(
+    "template_query_count", default=None
+)
+
+
+def _count_query(execute, sql, params, many, context):
+    count = _query_count.get()
+    if count is not None:
+        count[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender=None, connection=None, **kwargs) -> None:
+    """
+    Count the queries of a database connection towards the current request
+
+    Connected to ``connection_created`` so every connection, in every
+    thread, runs the wrapper; it is a no-op outside a counted request.
+    """
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+@contextmanager
+def count_queries():
+    """Count the queries run in this context, including sync_to_async calls"""
+    count = [0]
+    token = _query_count.set(count)
+    try:
+        yield count
+    finally:
+        _query_count.reset(token)
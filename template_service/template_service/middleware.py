@@ -0,0 +1,154 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from template_service import profiling
+from template_service.metrics import count_queries, db_queries_per_request
+
+logger = logging.getLogger(__name__)
+
+_profiler_lock = threading.Lock()
+
+
+class QueryCountMiddleware:
+    """
+    Observe the number of database queries each request runs.
+
+    Queries are counted through a connection execute wrapper (see
+    ``metrics.install_query_counter``) and attributed to the request's
+    route pattern, so the label set stays bounded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with count_queries() as count:
+            response = self.get_response(request)
+        self._observe(request, count[0])
+        return response
+
+    async def __acall__(self, request):
+        with count_queries() as count:
+            response = await self.get_response(request)
+        self._observe(request, count[0])
+        return response
+
+    @staticmethod
+    def _observe(request, queries: int) -> None:
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        db_queries_per_request.labels(route).observe(queries)
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in per-phase timings, slow request logs and sampled cProfile dumps.
+
+    Removed from the middleware stack unless TEMPLATE_PROFILING is set, so
+    the only cost left when disabled is the no-op ``profiling.phase`` check.
+    Requests slower than TEMPLATE_SLOW_REQUEST_MS are logged as one JSON
+    object; requests to TEMPLATE_PROFILE_PATH are run under cProfile with
+    probability TEMPLATE_PROFILE_SAMPLE_RATE and dumped to
+    TEMPLATE_PROFILE_DIR.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "TEMPLATE_PROFILING", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, "TEMPLATE_SLOW_REQUEST_MS", 250) / 1e3
+        self.profile_path = getattr(settings, "TEMPLATE_PROFILE_PATH", "")
+        self.sample_rate = getattr(settings, "TEMPLATE_PROFILE_SAMPLE_RATE", 0.01)
+        self.profile_dir = getattr(
+            settings, "TEMPLATE_PROFILE_DIR", ""
+        ) or os.path.join(tempfile.gettempdir(), "template-service-profiles")
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profiler = self._sampled_profiler(request)
+        if profiler is None:
+            with profiling.profile_request() as profile:
+                response = self.get_response(request)
+        else:
+            try:
+                with profiling.profile_request() as profile, profiler:
+                    response = self.get_response(request)
+                self._dump(request, profiler)
+            finally:
+                _profiler_lock.release()
+        self._log_if_slow(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        profiler = self._sampled_profiler(request)
+        if profiler is None:
+            with profiling.profile_request() as profile:
+                response = await self.get_response(request)
+        else:
+            # Only the event loop thread is profiled: requests interleaved on
+            # it show up too, and ORM calls appear as waits on other threads.
+            try:
+                with profiling.profile_request() as profile, profiler:
+                    response = await self.get_response(request)
+                self._dump(request, profiler)
+            finally:
+                _profiler_lock.release()
+        self._log_if_slow(request, response, profile)
+        return response
+
+    def _sampled_profiler(self, request) -> Optional[cProfile.Profile]:
+        if not self.profile_path or request.path_info != self.profile_path:
+            return None
+        if random.random() >= self.sample_rate:
+            return None
+        # One profiler may be active per process at a time
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+        return cProfile.Profile()
+
+    def _log_if_slow(self, request, response, profile) -> None:
+        if profile.total < self.slow_seconds:
+            return
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path_info,
+            "route": match.route if match is not None else None,
+            "status": response.status_code,
+            "total_ms": round(profile.total * 1e3, 3),
+            "phases_ms": profile.timings_ms(),
+        }
+        logger.warning(f"Slow request: {json.dumps(record)}")
+
+    def _dump(self, request, profiler: cProfile.Profile) -> None:
+        os.makedirs(self.profile_dir, exist_ok=True)
+        slug = request.path_info.strip("/").replace("/", "_") or "root"
+        path = os.path.join(self.profile_dir, f"{slug}-{time.time_ns()}.prof")
+        profiler.dump_stats(path)
+        logger.info(f"Wrote cProfile dump for {request.path_info} to {path}")
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:10
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Template",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[("email", "Email"), ("push", "Push Notification")],
+                        default="email",
+                        max_length=20,
+                    ),
+                ),
+                ("subject", models.CharField(blank=True, max_length=255, null=True)),
+                ("body", models.TextField()),
+                (
+                    "language",
+                    models.CharField(db_index=True, default="en", max_length=10),
+                ),
+                ("version", models.IntegerField(default=1)),
+                ("context", models.JSONField(blank=True, default=list)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "templates",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["name", "category", "language", "-version"],
+                        name="templates_name_ddba8d_idx",
+                    ),
+                    models.Index(
+                        fields=["is_active", "is_deleted"],
+                        name="templates_is_acti_7d1be0_idx",
+                    ),
+                ],
+                "unique_together": {("name", "category", "language", "version")},
+            },
+        ),
+    ]
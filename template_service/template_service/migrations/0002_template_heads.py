@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("template_service", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TemplateHead",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[("email", "Email"), ("push", "Push Notification")],
+                        default="email",
+                        max_length=20,
+                    ),
+                ),
+                ("language", models.CharField(default="en", max_length=10)),
+                ("latest_version", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "template_heads",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="template",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="templates_created_9368f5_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="templatehead",
+            name="current",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="template_service.template",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="templatehead",
+            unique_together={("name", "category", "language")},
+        ),
+    ]
@@ -0,0 +1,89 @@
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_bodies(apps, schema_editor):
+    """Store each distinct body once and point templates at it by hash"""
+    Template = apps.get_model("template_service", "Template")
+    TemplateBody = apps.get_model("template_service", "TemplateBody")
+    batch = []
+    for template in Template.objects.only("id", "body").iterator(chunk_size=1000):
+        # Same digest as TemplateBody.hash_of
+        template.body_ref_id = hashlib.sha256(template.body.encode()).hexdigest()
+        batch.append(template)
+        if len(batch) >= 1000:
+            _store(TemplateBody, Template, batch)
+            batch = []
+    if batch:
+        _store(TemplateBody, Template, batch)
+
+
+def _store(TemplateBody, Template, templates):
+    bodies = {
+        template.body_ref_id: TemplateBody(
+            hash=template.body_ref_id, content=template.body
+        )
+        for template in templates
+    }
+    TemplateBody.objects.bulk_create(bodies.values(), ignore_conflicts=True)
+    Template.objects.bulk_update(templates, ["body_ref"])
+
+
+def restore_bodies(apps, schema_editor):
+    Template = apps.get_model("template_service", "Template")
+    batch = []
+    for template in (
+        Template.objects.select_related("body_ref")
+        .only("id", "body_ref__content")
+        .iterator(chunk_size=1000)
+    ):
+        template.body = template.body_ref.content
+        batch.append(template)
+        if len(batch) >= 1000:
+            Template.objects.bulk_update(batch, ["body"])
+            batch = []
+    if batch:
+        Template.objects.bulk_update(batch, ["body"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("template_service", "0002_template_heads"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TemplateBody",
+            fields=[
+                (
+                    "hash",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("content", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "template_bodies",
+            },
+        ),
+        migrations.AddField(
+            model_name="template",
+            name="body_ref",
+            field=models.ForeignKey(
+                db_column="body_hash",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="template_service.templatebody",
+            ),
+        ),
+        # Nullable until 0004 drops it, so migrating back can re-add it empty
+        migrations.AlterField(
+            model_name="template",
+            name="body",
+            field=models.TextField(null=True),
+        ),
+        migrations.RunPython(move_bodies, restore_bodies),
+    ]
@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Make body_ref required once 0003 has moved the bodies, and drop the old
+    column. Kept apart from 0003 so the data copy is committed first:
+    Postgres does not alter a table with pending foreign key checks.
+    """
+
+    dependencies = [
+        ("template_service", "0003_template_bodies"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="template",
+            name="body_ref",
+            field=models.ForeignKey(
+                db_column="body_hash",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="template_service.templatebody",
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="template",
+            name="body",
+        ),
+    ]
@@ -0,0 +1,42 @@
+import re
+
+from django.db import migrations, models
+
+# Same pattern as compiler.PLACEHOLDER_PATTERN
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+
+def index_placeholders(apps, schema_editor):
+    """Store the placeholders of templates written before the column existed"""
+    Template = apps.get_model("template_service", "Template")
+    batch = []
+    for template in (
+        Template.objects.select_related("body_ref")
+        .only("id", "subject", "body_ref__content")
+        .iterator(chunk_size=1000)
+    ):
+        texts = (template.subject or "", template.body_ref.content)
+        template.placeholders = sorted(
+            {name for text in texts for name in PLACEHOLDER_PATTERN.findall(text)}
+        )
+        batch.append(template)
+        if len(batch) >= 1000:
+            Template.objects.bulk_update(batch, ["placeholders"])
+            batch = []
+    if batch:
+        Template.objects.bulk_update(batch, ["placeholders"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("template_service", "0004_remove_template_body"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="template",
+            name="placeholders",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(index_placeholders, migrations.RunPython.noop),
+    ]
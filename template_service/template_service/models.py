@@ -1,13 +1,46 @@
+import hashlib
+from typing import Iterable
 from uuid import uuid4
 
 from django.db import models
 
+from template_service.compiler import extract_placeholders
+
 
 class TemplateCategory(models.TextChoices):
     email = "email", "Email"
     push = "push", "Push Notification"
 
 
+class TemplateBody(models.Model):
+    """
+    Template body text, stored once per distinct content.
+
+    Rows are keyed by the SHA-256 of the content and never change, so
+    versions and languages sharing a body reference a single row.
+    """
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "template_bodies"
+
+    def __str__(self):
+        return self.hash
+
+    @staticmethod
+    def hash_of(content: str) -> str:
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @classmethod
+    def store(cls, bodies: Iterable["TemplateBody"]) -> None:
+        """Insert the bodies that are not stored yet, in one statement"""
+        unique = {body.hash: body for body in bodies}
+        cls.objects.bulk_create(unique.values(), ignore_conflicts=True)
+
+
 class Template(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     name = models.CharField(max_length=255)
@@ -17,11 +50,18 @@ class Template(models.Model):
         default=TemplateCategory.email,
     )
     subject = models.CharField(max_length=255, blank=True, null=True)
-    body = models.TextField()
+    body_ref = models.ForeignKey(
+        TemplateBody,
+        on_delete=models.PROTECT,
+        db_column="body_hash",
+        related_name="+",
+    )
     language = models.CharField(max_length=10, default="en", db_index=True)
     version = models.IntegerField(default=1)
 
     context = models.JSONField(default=list, blank=True)
+    # {{variables}} used by subject and body, extracted when the row is written
+    placeholders = models.JSONField(default=list, blank=True)
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -36,6 +76,8 @@ class Template(models.Model):
         indexes = [
             models.Index(fields=["name", "category", "language", "-version"]),
             models.Index(fields=["is_active", "is_deleted"]),
+            # keyset pagination of template lists
+            models.Index(fields=["-created_at", "-id"]),
         ]
         # makes sure these fields are unique together or no??
         unique_together = [["name", "category", "language", "version"]]
@@ -45,15 +87,84 @@ class Template(models.Model):
             f"{self.name} ({self.category}) - [lang: {self.language}] - v{self.version}"
         )
 
+    @property
+    def body(self) -> str:
+        """Body text; query with select_related("body_ref") to avoid a lookup"""
+        return self.body_ref.content
+
+    @body.setter
+    def body(self, content: str) -> None:
+        self.body_ref = TemplateBody(
+            hash=TemplateBody.hash_of(content), content=content
+        )
+
+    @property
+    def body_hash(self) -> str:
+        return self.body_ref_id
+
+    def save(self, *args, **kwargs):
+        body = self._state.fields_cache.get("body_ref")
+        if body is not None:
+            # Renders key cached output by these, so they follow every edit
+            self.placeholders = sorted(extract_placeholders(self.subject, body.content))
+            if body._state.adding:
+                TemplateBody.store([body])
+                body._state.adding = False
+        super().save(*args, **kwargs)
+
     def get_latest_version(self):
+        head = (
+            TemplateHead.objects.select_related("current__body_ref")
+            .filter(name=self.name, category=self.category, language=self.language)
+            .first()
+        )
+        current = head.current if head else None
+        if current and current.is_active and not current.is_deleted:
+            return current
         template = (
-            Template.objects.filter(
+            Template.objects.select_related("body_ref")
+            .filter(
                 name=self.name,
                 category=self.category,
                 language=self.language,
                 is_deleted=False,
+                is_active=True,
             )
             .order_by("-version")
             .first()
         )
         return template if template else None
+
+
+class TemplateHead(models.Model):
+    """
+    Current version pointer for a (name, category, language) template family.
+
+    ``current`` is the latest active, non-deleted version, so resolving it is
+    a single unique-index probe. ``latest_version`` is the highest version
+    ever assigned; writers lock this row to number new versions atomically.
+    """
+
+    name = models.CharField(max_length=255)
+    category = models.CharField(
+        max_length=20,
+        choices=TemplateCategory.choices,
+        default=TemplateCategory.email,
+    )
+    language = models.CharField(max_length=10, default="en")
+    latest_version = models.IntegerField(default=0)
+    current = models.ForeignKey(
+        Template,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "template_heads"
+        unique_together = [["name", "category", "language"]]
+
+    def __str__(self):
+        return f"{self.name} ({self.category}) - [lang: {self.language}] - head v{self.latest_version}"
@@ -0,0 +1,132 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional
+
+from asgiref.sync import iscoroutinefunction
+
+
+class RequestProfile:
+    """
+    Per-phase timings of one request.
+
+    ``parse`` runs from the start of the request to the start of the view
+    (routing and request schema validation) and ``serialize`` from the end
+    of the view to the response (response schema validation and JSON
+    encoding); other phases are timed by ``phase`` blocks in between.
+    """
+
+    __slots__ = ("started", "view_started", "view_finished", "finished", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started: Optional[float] = None
+        self.view_finished: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+        if self.view_started is not None:
+            self.add("parse", self.view_started - self.started)
+        if self.view_finished is not None:
+            self.add("serialize", self.finished - self.view_finished)
+
+    @property
+    def total(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def timings_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1e3, 3) for name, seconds in self.phases.items()}
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "template_request_profile", default=None
+)
+
+
+@contextmanager
+def profile_request():
+    """Collect phase timings for the code run in this context"""
+    profile = RequestProfile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        profile.finish()
+        _current.reset(token)
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profile.add(self.name, time.perf_counter() - self.started)
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """
+    Time a block as a named phase of the current request
+
+    Outside a profiled request this is a single context variable lookup
+    returning a shared no-op context manager.
+    """
+    profile = _current.get()
+    if profile is None:
+        return _NO_PHASE
+    return _Phase(profile, name)
+
+
+def profiled_view(view):
+    """Mark where a view starts and finishes, separating parse and serialize"""
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return await view(request, *args, **kwargs)
+            profile.view_started = time.perf_counter()
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                profile.view_finished = time.perf_counter()
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return view(request, *args, **kwargs)
+        profile.view_started = time.perf_counter()
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            profile.view_finished = time.perf_counter()
+
+    return wrapper
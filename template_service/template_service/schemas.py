@@ -1,8 +1,8 @@
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
+from typing import Generic, List, Optional, TypeVar, Union
 
 from ninja import Field, ModelSchema, Schema
-from pydantic import model_validator
+from pydantic import BaseModel, ConfigDict, model_validator
 
 from template_service.models import Template
 
@@ -74,6 +74,9 @@ class UpdateTemplate(Schema):
 
 
 class TemplateResponse(ModelSchema):
+    # Stored content-addressed in TemplateBody, read through Template.body
+    body: str
+
     class Meta:
         model = Template
         fields = [
@@ -81,10 +84,46 @@ class TemplateResponse(ModelSchema):
             "name",
             "category",
             "subject",
-            "body",
             "language",
             "version",
             "context",
+            "placeholders",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class BulkImportTemplatesRequest(Schema):
+    templates: List[CreateTemplate] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="Templates to import, each becoming the next version of its family",
+    )
+
+
+class BulkImportResult(Schema):
+    created: int = Field(..., description="Number of template versions created")
+    unchanged: int = Field(
+        ..., description="Templates skipped because they match the current version"
+    )
+    families: int = Field(..., description="Number of template families updated")
+
+
+class BulkImportResponse(ApiResponseData[BulkImportResult]):
+    pass
+
+
+class TemplateSummaryResponse(ModelSchema):
+    class Meta:
+        model = Template
+        fields = [
+            "id",
+            "name",
+            "category",
+            "subject",
+            "language",
+            "version",
             "created_at",
             "updated_at",
         ]
@@ -94,6 +133,11 @@ class TemapleteDataResponse(ApiResponseData[TemplateResponse]):
     pass
 
 
+class TemplateListFields(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
 class TemplatesQuerySchema(Schema):
     page: Optional[int] = Field(1, ge=1, description="Page number for pagination")
     limit: Optional[int] = Field(
@@ -105,6 +149,20 @@ class TemplatesQuerySchema(Schema):
     language: Optional[str] = Field(
         None, description="Filter templates by language code", examples=["en", "fr"]
     )
+    cursor: Optional[str] = Field(
+        None,
+        description=(
+            "Switch to cursor pagination: pass an empty value for the first page, "
+            "then the next_cursor of the previous page. page is ignored."
+        ),
+    )
+    include_total: Optional[bool] = Field(
+        False, description="Count matching templates in cursor mode (slower)"
+    )
+    fields: Optional[TemplateListFields] = Field(
+        TemplateListFields.FULL,
+        description="summary leaves out body and context for lightweight listings",
+    )
 
 
 class PaginationMeta(Schema):
@@ -116,23 +174,42 @@ class PaginationMeta(Schema):
     has_previous: bool = Field(..., description="Indicates if there is a previous page")
 
 
+class CursorPaginationMeta(Schema):
+    limit: int = Field(..., description="Number of items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page, null on the last page"
+    )
+    has_next: bool = Field(..., description="Indicates if there is a next page")
+    total: Optional[int] = Field(
+        None, description="Total number of items, only when include_total is set"
+    )
+
+
 class TemplateListResponse(ApiResponse):
-    data: List[TemplateResponse] = Field(..., description="List of templates")
-    meta: PaginationMeta = Field(..., description="Pagination metadata")
+    data: Union[List[TemplateResponse], List[TemplateSummaryResponse]] = Field(
+        ..., description="List of templates"
+    )
+    meta: Union[PaginationMeta, CursorPaginationMeta] = Field(
+        ..., description="Pagination metadata"
+    )
 
 
-class RenderTemplateRequest(Schema):
+class TemplateReference(Schema):
     id: Optional[str] = Field(None, description="The ID of the template to render")
     name: Optional[str] = Field(None, description="The name of the template to render")
-    context: Optional[dict] = Field(
-        None, description="The context variables for rendering the template"
-    )
     language: Optional[str] = Field(
         "en", description="The language code of the template"
     )
     category: Optional[TemplateCategory] = Field(
         None, description="The category of the template"
     )
+    fallback: bool = Field(
+        True,
+        description=(
+            "When the language has no template, fall back to less specific "
+            "languages (fr-CA, then fr) and then the default language"
+        ),
+    )
 
     @model_validator(mode="after")
     def ensure_id_or_name(self):
@@ -141,6 +218,62 @@ class RenderTemplateRequest(Schema):
         return self
 
 
+class RenderTemplateRequest(TemplateReference):
+    context: Optional[dict] = Field(
+        None, description="The context variables for rendering the template"
+    )
+
+
+class NotificationMessage(BaseModel):
+    """
+    A notification queued for the render worker
+
+    A plain pydantic model rather than a ninja Schema, so fields the worker
+    does not know about are kept and passed on to the channel services.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    notification_type: TemplateCategory = Field(
+        ..., description="The channel to deliver the notification on"
+    )
+    template_code: Optional[str] = Field(
+        None, description="The name of the template to render"
+    )
+    template_id: Optional[str] = Field(
+        None, description="The ID of the template to render"
+    )
+    language: str = Field("en", description="The language code of the template")
+    variables: dict = Field(
+        default_factory=dict, description="The context variables for rendering"
+    )
+    request_id: Optional[str] = Field(None, description="Idempotency key")
+    priority: int = Field(0, ge=0, le=10, description="The message priority")
+
+    @model_validator(mode="after")
+    def ensure_template(self):
+        if not self.template_id and not self.template_code:
+            raise ValueError(
+                "Either 'template_id' or 'template_code' must be provided."
+            )
+        return self
+
+    def template_key(self) -> tuple:
+        """Messages with equal keys render the same template"""
+        if self.template_id:
+            return (self.template_id,)
+        return (self.template_code, self.notification_type, self.language)
+
+
+class BatchRenderTemplateRequest(TemplateReference):
+    contexts: List[dict] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="One context per recipient, rendered in order",
+    )
+
+
 class RenderedTemplateData(Schema):
     template_id: str = Field(..., description="The ID of the rendered template")
     template_name: str = Field(..., description="The name of the rendered template")
@@ -157,3 +290,55 @@ class RenderedTemplateData(Schema):
 
 class RenderedTemplateResponse(ApiResponse):
     data: RenderedTemplateData = Field(..., description="The rendered template data")
+
+
+class BatchRenderedItem(Schema):
+    index: int = Field(..., description="Position of the context in the request")
+    success: bool = Field(..., description="Indicates if the item was rendered")
+    subject: Optional[str] = Field(None, description="The rendered subject")
+    body: Optional[str] = Field(None, description="The rendered body")
+    error: Optional[str] = Field(None, description="Why the item was not rendered")
+
+
+class BatchRenderedTemplateData(Schema):
+    template_id: str = Field(..., description="The ID of the rendered template")
+    template_name: str = Field(..., description="The name of the rendered template")
+    version: int = Field(..., description="The version of the rendered template")
+    category: TemplateCategory = Field(
+        ..., description="The category of the rendered template"
+    )
+    language: str = Field(..., description="The language of the rendered template")
+    items: List[BatchRenderedItem] = Field(
+        ..., description="Rendered subject/body pairs, one per context"
+    )
+
+
+class BatchRenderedTemplateResponse(ApiResponse):
+    data: BatchRenderedTemplateData = Field(..., description="The rendered batch data")
+
+
+class CacheStats(Schema):
+    size: int = Field(..., description="Number of entries currently cached")
+    max_entries: int = Field(..., description="Maximum number of entries")
+    hits: int = Field(..., description="Number of lookups served from the cache")
+    misses: int = Field(..., description="Number of lookups not in the cache")
+    evictions: int = Field(..., description="Entries evicted to stay within size")
+    hit_rate: float = Field(..., description="Hits divided by all lookups")
+
+
+class NegativeCacheStats(Schema):
+    timeout: float = Field(..., description="Seconds a not-found marker is kept")
+    hits: int = Field(..., description="Lookups answered from a not-found marker")
+    stores: int = Field(..., description="Not-found markers written")
+
+
+class CacheStatsData(Schema):
+    l1: CacheStats = Field(..., description="In-process template cache")
+    render: CacheStats = Field(..., description="Rendered output cache")
+    negative: NegativeCacheStats = Field(
+        ..., description="Not-found markers for unknown templates"
+    )
+
+
+class CacheStatsResponse(ApiResponse):
+    data: CacheStatsData = Field(..., description="Statistics for each cache")
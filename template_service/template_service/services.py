@@ -1,19 +1,75 @@
+import json
 import logging
-import re
+import random
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from functools import lru_cache
 from typing import Optional
+from uuid import UUID
 
+from django.conf import settings
 from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
+from django.db.models import Max, OuterRef, Q, Subquery
 
+from template_service.caching import (
+    CachedValue,
+    async_cache,
+    miss_coalescer,
+    negative_cache,
+    render_cache,
+    template_l1_cache,
+)
+from template_service.compiler import (
+    CompiledText,
+    compile_template,
+    extract_placeholders,
+)
 from template_service.exceptions import BaseException, NotFound
-from template_service.models import Template
-from template_service.schemas import CreateTemplate
+from template_service.metrics import (
+    cache_invalidation_seconds,
+    cache_lookup,
+    render_seconds,
+    template_renders_total,
+)
+from template_service.models import Template, TemplateBody, TemplateHead
+from template_service.profiling import phase
+from template_service.schemas import (
+    CreateTemplate,
+    TemplateListFields,
+    TemplateResponse,
+    TemplateSummaryResponse,
+)
+from template_service.snapshots import TemplateSnapshot
 from template_service.utils import schema_to_dict
 
 logger = logging.getLogger(__name__)
 
 
+def _key_part(value) -> str:
+    """Use enum values, not their str() form, so keys match model fields"""
+    return getattr(value, "value", value)
+
+
+@lru_cache(maxsize=1024)
+def language_chain(language: str, fallback: str = "") -> tuple:
+    """
+    Languages to look a template up in, most specific first
+
+    Subtags are dropped one at a time and ``fallback`` is tried last, so
+    ``fr-CA`` with an ``en`` fallback gives ``("fr-CA", "fr", "en")``.
+    """
+    parts = language.replace("_", "-").split("-")
+    chain = [language]
+    for end in range(len(parts) - 1, 0, -1):
+        chain.append("-".join(parts[:end]))
+    if fallback:
+        chain.append(fallback)
+    return tuple(dict.fromkeys(chain))
+
+
 class TemplateCacheKeys:
     """Central cache key management"""
 
@@ -21,17 +77,57 @@ class TemplateCacheKeys:
     def template_by_id(template_id: str) -> str:
         return f"template:id:{template_id}"
 
+    @staticmethod
+    def template_snapshot_by_id(template_id: str) -> str:
+        """Render snapshot of a template version, for renders by id"""
+        return f"template:snapshot:id:{template_id}"
+
     @staticmethod
     def template_latest(name: str, category: str, language: str) -> str:
-        return f"template:latest:{name}:{category}:{language}"
+        return f"template:latest:{name}:{_key_part(category)}:{language}"
 
     @staticmethod
     def template_versions(name: str, category: str, language: str) -> str:
-        return f"template:versions:{name}:{category}:{language}"
+        return f"template:versions:{name}:{_key_part(category)}:{language}"
 
     @staticmethod
-    def template_list_pattern() -> str:
-        return "template:list:*"
+    def template_chain(name: str, category: str) -> str:
+        """Languages that requested languages of a template resolved to"""
+        return f"template:chain:{name}:{_key_part(category)}"
+
+    @staticmethod
+    def template_list_generation() -> str:
+        return "template:list:generation"
+
+    @staticmethod
+    def template_list(
+        generation: int,
+        category: str,
+        language: str,
+        page: int,
+        limit: int,
+        fields: str = "full",
+    ) -> str:
+        return (
+            f"template:list:{generation}:{_key_part(category)}:{language}:"
+            f"page:{page}:limit:{limit}:fields:{_key_part(fields)}"
+        )
+
+    @staticmethod
+    def template_list_cursor(
+        generation: int,
+        category: str,
+        language: str,
+        cursor: str,
+        limit: int,
+        include_total: bool,
+        fields: str = "full",
+    ) -> str:
+        return (
+            f"template:list:{generation}:{_key_part(category)}:{language}:"
+            f"cursor:{cursor or 'start'}:limit:{limit}:total:{int(include_total)}:"
+            f"fields:{_key_part(fields)}"
+        )
 
     @staticmethod
     def template_pattern_for(name: str, category: str, language: str) -> str:
@@ -41,6 +137,9 @@ class TemplateCacheKeys:
 
 class TemplateService:
     CACHE_TIMEOUT = 3600  # 1 hour cache timeout
+    BULK_BATCH_SIZE = 1000
+    # Requested languages remembered per template for fallback resolution
+    MAX_CHAIN_LANGUAGES = 32
 
     @staticmethod
     def create_pagination_meta(paginator, page_obj):
@@ -53,6 +152,29 @@ class TemplateService:
             "has_previous": page_obj.has_previous(),
         }
 
+    @staticmethod
+    def encode_cursor(template) -> str:
+        """Opaque cursor pointing just past a template (or summary row) in list order"""
+        if isinstance(template, dict):
+            created_at, template_id = template["created_at"], template["id"]
+        else:
+            created_at, template_id = template.created_at, template.id
+        position = json.dumps([created_at.isoformat(), str(template_id)])
+        return urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, template_id = json.loads(urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), UUID(template_id)
+        except (ValueError, TypeError, AttributeError):
+            raise BaseException(
+                message="Invalid cursor",
+                detail=f"Invalid pagination cursor: {cursor}",
+                status_code=400,
+            )
+
     @classmethod
     def _invalidate_template_cache(
         cls, name: str, category: str, language: str, template_id: Optional[str] = None
@@ -61,47 +183,260 @@ class TemplateService:
         keys_to_delete = [
             TemplateCacheKeys.template_latest(name, category, language),
             TemplateCacheKeys.template_versions(name, category, language),
+            TemplateCacheKeys.template_chain(name, category),
         ]
 
         if template_id:
             keys_to_delete.append(TemplateCacheKeys.template_by_id(template_id))
+            keys_to_delete.append(
+                TemplateCacheKeys.template_snapshot_by_id(template_id)
+            )
 
-        cache.delete_many(keys_to_delete)
+        cls._invalidate_keys(keys_to_delete)
 
+    @classmethod
+    def _invalidate_families(cls, families) -> None:
+        """Invalidate the caches of many template families in one round trip"""
+        keys_to_delete = []
+        for name, category, language in families:
+            keys_to_delete.append(
+                TemplateCacheKeys.template_latest(name, category, language)
+            )
+            keys_to_delete.append(
+                TemplateCacheKeys.template_versions(name, category, language)
+            )
+            keys_to_delete.append(TemplateCacheKeys.template_chain(name, category))
+        if keys_to_delete:
+            cls._invalidate_keys(keys_to_delete)
+
+    @classmethod
+    def _invalidate_keys(cls, keys_to_delete: list) -> None:
+        with cache_invalidation_seconds.time():
+            cache.delete_many(keys_to_delete)
+            template_l1_cache.invalidate(keys_to_delete)
+
+            try:
+                cls._bump_list_generation()
+            except Exception as e:
+                logger.warning(f"Could not invalidate template list cache: {e}")
+
+    @classmethod
+    async def _alist_generation(cls) -> int:
+        """
+        Current namespace generation for cached template lists
+
+        Seeded from the clock so a generation lost to eviction never
+        resurfaces entries cached under an older one.
+        """
+        key = TemplateCacheKeys.template_list_generation()
+        generation = await async_cache.get(key)
+        if generation is None:
+            await async_cache.add(key, time.time_ns(), None)
+            generation = await async_cache.get(key)
+        return generation
+
+    @classmethod
+    def _bump_list_generation(cls) -> None:
+        """Move list caching to a new namespace; old pages expire by TTL"""
+        key = TemplateCacheKeys.template_list_generation()
         try:
-            pattern = TemplateCacheKeys.template_list_pattern()
-            cache_keys = cache.keys(pattern) if hasattr(cache, "keys") else []
-            if cache_keys:
-                cache.delete_many(cache_keys)
-        except Exception as e:
-            logger.warning(f"Could not delete pattern-based cache: {e}")
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
 
     @classmethod
-    def _get_cached_template(cls, cache_key: str) -> Optional[Template]:
-        """Get template from cache"""
-        return cache.get(cache_key)
+    def _shared_snapshot(cls, cache_key: str, data) -> Optional[TemplateSnapshot]:
+        """Decode a snapshot read from the shared cache into the in-process one"""
+        if negative_cache.is_marker(data):
+            cls._set_l1(cache_key, data)
+            return data
+        if not isinstance(data, tuple):
+            return None
+        snapshot = TemplateSnapshot.decode(data)
+        template_l1_cache.set(cache_key, snapshot)
+        return snapshot
+
+    @staticmethod
+    def _set_l1(cache_key: str, value) -> None:
+        """Copy a shared cache value into the in-process cache"""
+        if negative_cache.is_marker(value):
+            template_l1_cache.set(cache_key, value, negative_cache.timeout)
+        else:
+            template_l1_cache.set(cache_key, value)
+
+    @staticmethod
+    def _negative_hit() -> None:
+        negative_cache.record_hit()
+        cache_lookup("negative", True)
 
     @classmethod
-    def _set_cached_template(cls, cache_key: str, template: Template) -> None:
-        """Set template in cache"""
-        cache.set(cache_key, template, cls.CACHE_TIMEOUT)
+    async def _aset_not_found(cls, cache_key: str) -> None:
+        if not negative_cache.enabled:
+            return
+        negative_cache.record_store()
+        await async_cache.set(cache_key, negative_cache.MARKER, negative_cache.timeout)
+        template_l1_cache.set(cache_key, negative_cache.MARKER, negative_cache.timeout)
+
+    @staticmethod
+    def _unwrap(entry):
+        """
+        The value of a shared cache entry, or None when it should be reloaded
+
+        Values cached without a CachedValue wrapper are returned as they are.
+        """
+        if isinstance(entry, CachedValue):
+            if entry.should_refresh(miss_coalescer.early_refresh_beta):
+                return None
+            return entry.value
+        return entry
 
     @classmethod
-    def create_template(cls, payload: CreateTemplate):
-        payload_dict = schema_to_dict(payload)
-        existing_template = (
-            Template.objects.filter(
-                name=payload.name,
-                category=payload.category,
-                language=payload.language,
-                is_deleted=False,
+    async def _aget_cached_template(cls, cache_key: str) -> Optional[Template]:
+        template = await template_l1_cache.aget(cache_key)
+        cache_lookup("l1", template is not None)
+        if template is not None:
+            return template
+        template = cls._unwrap(await async_cache.get(cache_key))
+        cache_lookup("redis", template is not None)
+        if template is not None:
+            cls._set_l1(cache_key, template)
+        return template
+
+    @classmethod
+    async def _aset_cached_template(
+        cls, cache_key: str, template: Template, delta: float = 0.0
+    ) -> None:
+        await async_cache.set(
+            cache_key,
+            CachedValue.wrap(template, cls.CACHE_TIMEOUT, delta),
+            cls.CACHE_TIMEOUT,
+        )
+        template_l1_cache.set(cache_key, template)
+
+    @classmethod
+    async def _aget_cached_snapshot(cls, cache_key: str) -> Optional[TemplateSnapshot]:
+        snapshot = await template_l1_cache.aget(cache_key)
+        cache_lookup("l1", snapshot is not None)
+        if snapshot is not None:
+            return snapshot
+        data = cls._unwrap(await async_cache.get(cache_key))
+        cache_lookup("redis", data is not None)
+        return cls._shared_snapshot(cache_key, data)
+
+    @classmethod
+    async def _aset_cached_snapshot(
+        cls, cache_key: str, snapshot: TemplateSnapshot, delta: float = 0.0
+    ) -> None:
+        await async_cache.set(
+            cache_key,
+            CachedValue.wrap(snapshot.encode(), cls.CACHE_TIMEOUT, delta),
+            cls.CACHE_TIMEOUT,
+        )
+        template_l1_cache.set(cache_key, snapshot)
+
+    @classmethod
+    def _lock_head(cls, name: str, category: str, language: str) -> TemplateHead:
+        """
+        Lock the head row of a template family, creating it when missing
+
+        Families created before heads existed are backfilled from the
+        templates table. Must be called inside a transaction.
+        """
+        heads = TemplateHead.objects.select_for_update()
+        head = heads.filter(name=name, category=category, language=language).first()
+        if head is not None:
+            return head
+
+        family = Template.objects.filter(
+            name=name, category=category, language=language
+        )
+        latest_version = family.aggregate(Max("version"))["version__max"] or 0
+        try:
+            with transaction.atomic():
+                return TemplateHead.objects.create(
+                    name=name,
+                    category=category,
+                    language=language,
+                    latest_version=latest_version,
+                    current=cls._latest_queryset(name, category, language).first(),
+                )
+        except IntegrityError:
+            return heads.get(name=name, category=category, language=language)
+
+    @staticmethod
+    def _advance_head(head: TemplateHead, template: Template) -> None:
+        head.latest_version = template.version
+        if template.is_active:
+            head.current = template
+        head.save(update_fields=["latest_version", "current", "updated_at"])
+
+    @classmethod
+    def _retire_from_head(cls, template: Template) -> None:
+        """Point the family head past a template that is being deleted"""
+        head = (
+            TemplateHead.objects.select_for_update()
+            .filter(
+                name=template.name,
+                category=template.category,
+                language=template.language,
+                current=template,
             )
-            .order_by("-version")
             .first()
         )
-        if existing_template:
-            payload_dict["version"] = existing_template.version + 1
-        template = Template.objects.create(**payload_dict)
+        if head is None:
+            return
+        head.current = (
+            cls._latest_queryset(template.name, template.category, template.language)
+            .exclude(id=template.id)
+            .first()
+        )
+        head.save(update_fields=["current", "updated_at"])
+
+    @staticmethod
+    def _index_placeholders(template: Template) -> None:
+        """
+        Store the placeholders of a template about to be written
+
+        When the template declares its context, placeholders missing from
+        it are rejected and declared variables that are never used are
+        logged, so broken templates fail at write time rather than render
+        with ``{{variables}}`` left in the output. Templates declaring no
+        context are stored with a warning naming the variables they use.
+        """
+        placeholders = extract_placeholders(template.subject, template.body)
+        template.placeholders = sorted(placeholders)
+        declared = set(template.context or ())
+        if not declared:
+            if placeholders:
+                logger.warning(
+                    f"Template {template.name} declares no context for its "
+                    f"variables: {', '.join(sorted(placeholders))}"
+                )
+            return
+        undeclared = placeholders - declared
+        if undeclared:
+            names = ", ".join(sorted(undeclared))
+            raise BaseException(
+                message=f"Template uses undeclared context variables: {names}",
+                detail=f"Add {names} to context or remove them from the template",
+                status_code=400,
+            )
+        unused = declared - placeholders
+        if unused:
+            logger.warning(
+                f"Template {template.name} declares unused context variables: "
+                f"{', '.join(sorted(unused))}"
+            )
+
+    @classmethod
+    def create_template(cls, payload: CreateTemplate):
+        template = Template(**schema_to_dict(payload))
+        cls._index_placeholders(template)
+        with transaction.atomic():
+            head = cls._lock_head(template.name, template.category, template.language)
+            template.version = head.latest_version + 1
+            template.save(force_insert=True)
+            cls._advance_head(head, template)
         logger.info(
             f"Template {template.name} created with ID: {template.id} version: {template.version}"
         )
@@ -120,23 +455,35 @@ class TemplateService:
                 "name": old_template.name,
                 "category": old_template.category,
                 "subject": old_template.subject,
-                "body": old_template.body,
+                # Reference the stored body rather than copying its text
+                "body_ref_id": old_template.body_ref_id,
                 "language": old_template.language,
                 "context": old_template.context,
             }
             new_template_data.update(update_payload_dict)
-            latest_template = old_template.get_latest_version()
-            latest_version = (
-                latest_template.version if latest_template else old_template.version
-            )
-            new_template_data["version"] = latest_version + 1
-            new_template = Template.objects.create(**new_template_data)
+            new_template = Template(**new_template_data)
+            cls._index_placeholders(new_template)
+            with transaction.atomic():
+                head = cls._lock_head(
+                    new_template.name, new_template.category, new_template.language
+                )
+                new_template.version = head.latest_version + 1
+                new_template.save(force_insert=True)
+                cls._advance_head(head, new_template)
             cls._invalidate_template_cache(
                 new_template.name,
                 new_template.category,
                 new_template.language,
                 template_id,
             )
+            if (old_template.name, old_template.category, old_template.language) != (
+                new_template.name,
+                new_template.category,
+                new_template.language,
+            ):
+                cls._invalidate_template_cache(
+                    old_template.name, old_template.category, old_template.language
+                )
             logger.info(
                 f"Template {new_template.name} updated: "
                 f"old version {old_template.version} (ID: {old_template.id}) -> "
@@ -147,77 +494,408 @@ class TemplateService:
             logger.error(f"Template with ID: {template_id} does not exist")
             raise NotFound(detail=f"Template with id {template_id} not found")
 
+    @staticmethod
+    def _family_key(template) -> tuple:
+        return (template.name, _key_part(template.category), template.language)
+
+    @staticmethod
+    def _chunked(items: list, size: int):
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    @classmethod
+    def _lock_heads(cls, families: set) -> dict:
+        """
+        Lock the heads of many template families, backfilling missing ones
+
+        Bulk counterpart of _lock_head, issuing a fixed number of queries per
+        batch of names instead of several per family. Must be called inside
+        a transaction.
+        """
+        size = cls.BULK_BATCH_SIZE
+        names = sorted({name for name, _, _ in families})
+        existing = set()
+        for chunk in cls._chunked(names, size):
+            existing.update(
+                TemplateHead.objects.filter(name__in=chunk).values_list(
+                    "name", "category", "language"
+                )
+            )
+
+        missing = families - existing
+        if missing:
+            latest_versions = {}
+            currents = {}
+            missing_names = sorted({name for name, _, _ in missing})
+            for chunk in cls._chunked(missing_names, size):
+                rows = (
+                    Template.objects.filter(name__in=chunk)
+                    .values("name", "category", "language")
+                    .annotate(latest_version=Max("version"))
+                    .values_list("name", "category", "language", "latest_version")
+                )
+                for name, category, language, latest_version in rows:
+                    latest_versions[(name, category, language)] = latest_version
+                active = (
+                    Template.objects.filter(
+                        name__in=chunk, is_active=True, is_deleted=False
+                    )
+                    .only("id", "name", "category", "language")
+                    .order_by("-version")
+                )
+                for template in active:
+                    currents.setdefault(cls._family_key(template), template)
+            TemplateHead.objects.bulk_create(
+                [
+                    TemplateHead(
+                        name=name,
+                        category=category,
+                        language=language,
+                        latest_version=latest_versions.get(
+                            (name, category, language), 0
+                        ),
+                        current=currents.get((name, category, language)),
+                    )
+                    for name, category, language in missing
+                ],
+                batch_size=size,
+                ignore_conflicts=True,
+            )
+
+        heads = {}
+        for chunk in cls._chunked(names, size):
+            locked = (
+                TemplateHead.objects.select_for_update(of=("self",))
+                .select_related("current")
+                .filter(name__in=chunk)
+            )
+            for head in locked:
+                heads[cls._family_key(head)] = head
+        return heads
+
+    @staticmethod
+    def _same_content(current: Optional[Template], template: Template) -> bool:
+        return (
+            current is not None
+            and current.subject == template.subject
+            and current.body_hash == template.body_hash
+            and (current.context or []) == (template.context or [])
+        )
+
+    @classmethod
+    def bulk_import_templates(cls, payloads, batch_size: Optional[int] = None) -> dict:
+        """
+        Create or upsert many templates in a single transaction
+
+        Each template becomes the next version of its (name, category,
+        language) family unless it matches the family's current version, so
+        re-running an import is a no-op. Versions for every family are
+        resolved up front, rows are inserted with bulk_create and caches are
+        invalidated once at the end.
+        """
+        batch_size = batch_size or cls.BULK_BATCH_SIZE
+        templates = [Template(**schema_to_dict(payload)) for payload in payloads]
+        for index, template in enumerate(templates):
+            try:
+                cls._index_placeholders(template)
+            except BaseException as e:
+                raise BaseException(
+                    message=f"Template {index} ({template.name}): {e.message}",
+                    detail=e.detail,
+                    status_code=e.status_code,
+                )
+        created = []
+        touched = {}
+        with transaction.atomic():
+            heads = cls._lock_heads({cls._family_key(t) for t in templates})
+            for template in templates:
+                family = cls._family_key(template)
+                head = heads[family]
+                if cls._same_content(head.current, template):
+                    continue
+                head.latest_version += 1
+                template.version = head.latest_version
+                if template.is_active:
+                    head.current = template
+                touched[family] = head
+                created.append(template)
+
+            TemplateBody.store(template.body_ref for template in created)
+            Template.objects.bulk_create(created, batch_size=batch_size)
+            # An upsert writes every head in one statement per batch, where
+            # bulk_update would build a CASE expression per row and field
+            TemplateHead.objects.bulk_create(
+                touched.values(),
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["name", "category", "language"],
+                update_fields=["latest_version", "current", "updated_at"],
+            )
+
+        cls._invalidate_families(touched)
+        logger.info(
+            f"Imported {len(created)} templates across {len(touched)} families "
+            f"({len(templates) - len(created)} unchanged)"
+        )
+        return {
+            "created": len(created),
+            "unchanged": len(templates) - len(created),
+            "families": len(touched),
+        }
+
+    @staticmethod
+    def _is_summary(query_dict: dict) -> bool:
+        return query_dict.get("fields") == TemplateListFields.SUMMARY
+
+    @classmethod
+    def _filtered_queryset(cls, query_dict: dict):
+        """
+        Templates matching the list filters
+
+        Summary listings select only the summary columns as plain dicts, so
+        bodies and context are never read, pickled or cached.
+        """
+        queryset = Template.objects.filter(is_deleted=False)
+        if query_dict.get("category"):
+            queryset = queryset.filter(category=query_dict["category"])
+        if query_dict.get("language") is not None:
+            queryset = queryset.filter(language=query_dict["language"])
+        if cls._is_summary(query_dict):
+            queryset = queryset.values(*TemplateSummaryResponse.model_fields)
+        else:
+            queryset = queryset.select_related("body_ref")
+        return queryset
+
+    @classmethod
+    def _cursor_queryset(cls, query_dict: dict):
+        """
+        One page of templates after the cursor, plus one row to detect a next page
+
+        Rows are ordered by (created_at, id), so a page is an index range
+        scan from the cursor position: deep pages cost the same as the first
+        one and no COUNT(*) or OFFSET is needed.
+        """
+        queryset = cls._filtered_queryset(query_dict).order_by("-created_at", "-id")
+        if query_dict.get("cursor"):
+            created_at, template_id = cls.decode_cursor(query_dict["cursor"])
+            # Written as a range on created_at so the index bounds the scan
+            queryset = queryset.filter(created_at__lte=created_at).exclude(
+                created_at=created_at, id__gte=template_id
+            )
+        return queryset[: query_dict.get("limit", 20) + 1]
+
+    @classmethod
+    def _cursor_page(cls, query_dict: dict, rows: list, total: Optional[int]) -> dict:
+        limit = query_dict.get("limit", 20)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "data": rows,
+            "meta": {
+                "limit": limit,
+                "next_cursor": cls.encode_cursor(rows[-1]) if has_next else None,
+                "has_next": has_next,
+                "total": total,
+            },
+            "message": "Templates retrieved successfully",
+        }
+
+    @staticmethod
+    def _list_cache_key(query_dict: dict, generation: int) -> str:
+        if "cursor" in query_dict:
+            return TemplateCacheKeys.template_list_cursor(
+                generation,
+                query_dict.get("category", "all"),
+                query_dict.get("language", "all"),
+                query_dict["cursor"],
+                query_dict.get("limit", 20),
+                query_dict.get("include_total", False),
+                query_dict.get("fields", "full"),
+            )
+        return TemplateCacheKeys.template_list(
+            generation,
+            query_dict.get("category", "all"),
+            query_dict.get("language", "all"),
+            query_dict.get("page", 1),
+            query_dict.get("limit", 20),
+            query_dict.get("fields", "full"),
+        )
+
+    @staticmethod
+    def _empty_list_result() -> dict:
+        return {
+            "data": [],
+            "meta": {
+                "total": 0,
+                "limit": 20,
+                "page": 1,
+                "total_pages": 0,
+                "has_next": False,
+                "has_previous": False,
+            },
+            "message": "Templates retrieved successfully",
+        }
+
     @classmethod
-    def get_all_templates(cls, query):
+    async def aget_all_templates(cls, query):
+        query_dict = schema_to_dict(query)
+        if query_dict.get("cursor"):
+            cls.decode_cursor(query_dict["cursor"])
         try:
-            query_dict = schema_to_dict(query)
-            cache_key = (
-                f"template:list:"
-                f"{query_dict.get('category', 'all')}:"
-                f"{query_dict.get('language', 'all')}:"
-                f"page:{query_dict.get('page', 1)}:"
-                f"limit:{query_dict.get('limit', 20)}"
-            )
-            cached_result = cache.get(cache_key)
+            cache_key = cls._list_cache_key(query_dict, await cls._alist_generation())
+            cached_result = await async_cache.get(cache_key)
+            cache_lookup("list", bool(cached_result))
             if cached_result:
                 logger.debug(f"Cache hit for template list: {cache_key}")
                 return cached_result
-            queryset = Template.objects.filter(is_deleted=False)
-            if query_dict.get("category"):
-                queryset = queryset.filter(category=query_dict["category"])
-            if query_dict.get("language") is not None:
-                queryset = queryset.filter(language=query_dict["language"])
+            if "cursor" in query_dict:
+                total = None
+                if query_dict.get("include_total"):
+                    total = await cls._filtered_queryset(query_dict).acount()
+                rows = [row async for row in cls._cursor_queryset(query_dict)]
+                result = cls._cursor_page(query_dict, rows, total)
+                await async_cache.set(cache_key, result, cls.CACHE_TIMEOUT // 2)
+                return result
+            queryset = cls._filtered_queryset(query_dict)
 
             paginator = Paginator(
                 queryset.order_by("-created_at"), query_dict.get("limit", 20)
             )
+            # Count asynchronously up front so the paginator never hits the DB
+            paginator.count = await queryset.acount()
             page_obj = paginator.get_page(query_dict.get("page", 1))
             result = {
-                "data": page_obj.object_list,
+                "data": [template async for template in page_obj.object_list],
                 "meta": cls.create_pagination_meta(paginator, page_obj),
                 "message": "Templates retrieved successfully",
             }
 
-            cache.set(cache_key, result, cls.CACHE_TIMEOUT // 2)
+            await async_cache.set(cache_key, result, cls.CACHE_TIMEOUT // 2)
             logger.debug(f"Cached template list: {cache_key}")
             return result
         except Exception:
-            return {
-                "data": [],
-                "meta": {
-                    "total": 0,
-                    "limit": 20,
-                    "page": 1,
-                    "total_pages": 0,
-                    "has_next": False,
-                    "has_previous": False,
-                },
-                "message": "Templates retrieved successfully",
-            }
+            return cls._empty_list_result()
+
+    @classmethod
+    def _list_schema(cls, query_dict: dict):
+        if cls._is_summary(query_dict):
+            return TemplateSummaryResponse
+        return TemplateResponse
+
+    @classmethod
+    def _stream_queryset(cls, query_dict: dict):
+        """The page of templates a listing asks for, sliced as the JSON path does"""
+        limit = query_dict.get("limit", 20)
+        if "cursor" in query_dict:
+            return cls._cursor_queryset(query_dict)[:limit]
+        offset = (query_dict.get("page", 1) - 1) * limit
+        queryset = cls._filtered_queryset(query_dict).order_by("-created_at")
+        return queryset[offset : offset + limit]
+
+    @classmethod
+    async def aiter_templates(cls, query):
+        """
+        Rows of the page of templates a listing query asks for, for NDJSON
+
+        Pages are sliced like the JSON listing, ``limit`` rows at ``page`` or
+        after ``cursor``. The page is fetched before returning, so an invalid
+        cursor or failing query raises here instead of cutting a stream
+        short; rows are serialized as they are streamed by an async
+        iterator, so ASGI does not buffer them.
+        """
+        query_dict = schema_to_dict(query)
+        schema = cls._list_schema(query_dict)
+        templates = [template async for template in cls._stream_queryset(query_dict)]
+
+        async def rows():
+            for template in templates:
+                yield schema.from_orm(template)
+
+        return rows()
 
     @classmethod
-    def get_template_by_id(cls, template_id):
+    async def aget_template_by_id(cls, template_id):
         cache_key = TemplateCacheKeys.template_by_id(template_id)
-        template = cls._get_cached_template(cache_key)
-        if template:
+        template = await cls._aget_cached_template(cache_key)
+        if not template:
+            template = await miss_coalescer.aload(
+                cache_key,
+                lambda: cls._aload_template_by_id(cache_key, template_id),
+                lambda: cls._aget_cached_template(cache_key),
+            )
+        elif not negative_cache.is_marker(template):
             logger.debug(f"Cache hit for template ID: {template_id}")
             return template
 
-        template = Template.objects.filter(id=template_id, is_deleted=False).first()
+        if negative_cache.is_marker(template):
+            cls._negative_hit()
+            return None
+        return template
+
+    @classmethod
+    async def _aload_template_by_id(cls, cache_key: str, template_id):
+        start = time.perf_counter()
+        template = (
+            await Template.objects.select_related("body_ref")
+            .filter(id=template_id, is_deleted=False)
+            .afirst()
+        )
         if template:
-            cls._set_cached_template(cache_key, template)
+            await cls._aset_cached_template(
+                cache_key, template, time.perf_counter() - start
+            )
             logger.debug(f"Cached template ID: {template_id}")
+        else:
+            await cls._aset_not_found(cache_key)
         return template
 
     @classmethod
-    def get_latest_template(cls, name, category, language):
-        cache_key = TemplateCacheKeys.template_latest(name, category, language)
-        cached_template = cls._get_cached_template(cache_key)
-        if cached_template:
-            logger.debug(f"Cache hit for latest template: {name}/{category}/{language}")
-            return cached_template
-        template = (
-            Template.objects.filter(
+    async def aget_snapshot_by_id(cls, template_id) -> Optional[TemplateSnapshot]:
+        """
+        Render snapshot of a template version, or None when it has none
+
+        Cached apart from the model instance ``aget_template_by_id`` caches,
+        so renders by id read the same flat snapshot as renders by name.
+        """
+        cache_key = TemplateCacheKeys.template_snapshot_by_id(template_id)
+        snapshot = await cls._aget_cached_snapshot(cache_key)
+        if not snapshot:
+            snapshot = await miss_coalescer.aload(
+                cache_key,
+                lambda: cls._aload_snapshot_by_id(cache_key, template_id),
+                lambda: cls._aget_cached_snapshot(cache_key),
+            )
+        if negative_cache.is_marker(snapshot):
+            cls._negative_hit()
+            return None
+        return snapshot
+
+    @classmethod
+    async def _aload_snapshot_by_id(cls, cache_key: str, template_id):
+        start = time.perf_counter()
+        template = await cls._snapshot_queryset().filter(id=template_id).afirst()
+        if template is None:
+            await cls._aset_not_found(cache_key)
+            return None
+        snapshot = TemplateSnapshot.from_model(template)
+        await cls._aset_cached_snapshot(
+            cache_key, snapshot, time.perf_counter() - start
+        )
+        return snapshot
+
+    @staticmethod
+    def _snapshot_queryset():
+        return (
+            Template.objects.select_related("body_ref")
+            .filter(is_deleted=False)
+            .only(*TemplateSnapshot.MODEL_FIELDS)
+        )
+
+    @staticmethod
+    def _latest_queryset(name, category, language):
+        return (
+            Template.objects.select_related("body_ref")
+            .filter(
                 name=name,
                 category=category,
                 language=language,
@@ -225,69 +903,714 @@ class TemplateService:
                 is_active=True,
             )
             .order_by("-version")
-            .first()
         )
 
+    @staticmethod
+    def _latest_templates():
+        """Latest active version of every template family, in a single query"""
+        latest = Template.objects.filter(
+            name=OuterRef("name"),
+            category=OuterRef("category"),
+            language=OuterRef("language"),
+            is_deleted=False,
+            is_active=True,
+        ).order_by("-version")
+        return (
+            Template.objects.select_related("body_ref")
+            .filter(
+                is_deleted=False, is_active=True, id=Subquery(latest.values("id")[:1])
+            )
+            .only(*TemplateSnapshot.MODEL_FIELDS)
+        )
+
+    @classmethod
+    def _set_many_snapshots(cls, encoded: dict) -> None:
+        """
+        Write encoded snapshots to the shared cache in one round trip
+
+        Each batch gets a timeout up to 10% shorter at random, so keys
+        warmed together do not all expire in the same instant.
+        """
+        timeout = cls.CACHE_TIMEOUT * (1 - random.random() * 0.1)
+        cache.set_many(
+            {key: CachedValue.wrap(data, timeout) for key, data in encoded.items()},
+            timeout,
+        )
+
+    @classmethod
+    def warm_cache(cls, batch_size: Optional[int] = None, local: bool = False) -> dict:
+        """
+        Preload the latest version of every template family into the cache
+
+        Snapshots are written with one set_many per batch, a single pipelined
+        round trip on Redis, so a cold cache after a deploy or flush does not
+        send every first render to the database at once. With ``local`` the
+        in-process cache of this worker is filled too.
+        """
+        batch_size = batch_size or cls.BULK_BATCH_SIZE
+        start = time.perf_counter()
+        warmed = 0
+        batch = {}
+        for template in cls._latest_templates().iterator(chunk_size=batch_size):
+            cache_key = TemplateCacheKeys.template_latest(
+                template.name, template.category, template.language
+            )
+            snapshot = TemplateSnapshot.from_model(template)
+            batch[cache_key] = snapshot.encode()
+            if local:
+                template_l1_cache.set(cache_key, snapshot)
+            if len(batch) >= batch_size:
+                cls._set_many_snapshots(batch)
+                warmed += len(batch)
+                batch = {}
+        if batch:
+            cls._set_many_snapshots(batch)
+            warmed += len(batch)
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Warmed template cache with {warmed} templates in {elapsed:.2f}s")
+        return {"templates": warmed, "seconds": elapsed}
+
+    @staticmethod
+    def _head_queryset(name, category, language):
+        return TemplateHead.objects.select_related("current__body_ref").filter(
+            name=name, category=category, language=language
+        )
+
+    @classmethod
+    def _current_from_head(cls, head: Optional[TemplateHead]):
+        """
+        The template a head points at, or False when it cannot be trusted
+
+        Heads are only missing for families never written through the
+        service; a pointer to a row changed behind the service's back
+        (e.g. through the admin) is not trusted either.
+        """
+        if head is None:
+            return False
+        current = head.current
+        if current is not None and (current.is_deleted or not current.is_active):
+            return False
+        return current
+
+    @classmethod
+    async def aget_latest_template(cls, name, category, language) -> TemplateSnapshot:
+        cache_key = TemplateCacheKeys.template_latest(name, category, language)
+        snapshot = await cls._aget_cached_snapshot(cache_key)
+        if not snapshot:
+            snapshot = await miss_coalescer.aload(
+                cache_key,
+                lambda: cls._aload_latest_template(cache_key, name, category, language),
+                lambda: cls._aget_cached_snapshot(cache_key),
+            )
+        elif not negative_cache.is_marker(snapshot):
+            logger.debug(f"Cache hit for latest template: {name}/{category}/{language}")
+            return snapshot
+
+        if negative_cache.is_marker(snapshot):
+            cls._negative_hit()
+            raise cls._latest_not_found(name, category, language)
+        return snapshot
+
+    @classmethod
+    async def _aload_latest_template(
+        cls, cache_key: str, name, category, language
+    ) -> TemplateSnapshot:
+        start = time.perf_counter()
+        template = cls._current_from_head(
+            await cls._head_queryset(name, category, language).afirst()
+        )
+        if template is False:
+            template = await cls._latest_queryset(name, category, language).afirst()
+
         if not template:
             logger.warning(f"No active template found for {name}/{category}/{language}")
-            raise ValueError(f"Template '{name}' ({category}, {language}) not found")
+            await cls._aset_not_found(cache_key)
+            raise cls._latest_not_found(name, category, language)
 
-        cls._set_cached_template(cache_key, template)
+        snapshot = TemplateSnapshot.from_model(template)
+        await cls._aset_cached_snapshot(
+            cache_key, snapshot, time.perf_counter() - start
+        )
         logger.debug(f"Cached latest template: {name}/{category}/{language}")
 
-        return template
+        return snapshot
 
     @classmethod
-    def render_template(cls, payload):
+    async def aresolve_latest_template(
+        cls, name, category, language
+    ) -> TemplateSnapshot:
+        """
+        Latest version of a template in the first language of the requested
+        language's fallback chain that has one (see ``language_chain``)
+
+        Languages a request resolved to are cached per template, so repeat
+        lookups are two in-process cache hits. Otherwise every language of
+        the chain is read in one ``get_many``, and if the cache cannot
+        decide, in one database query.
+        """
+        chain = cls._language_chain(language)
+        if len(chain) == 1:
+            return await cls.aget_latest_template(name, category, language)
+
+        chain_key = TemplateCacheKeys.template_chain(name, category)
+        resolved = await cls._aget_cached_chain(chain_key)
+        if language in resolved:
+            snapshot = await cls._aget_cached_snapshot(
+                TemplateCacheKeys.template_latest(name, category, resolved[language])
+            )
+            if snapshot is not None and not negative_cache.is_marker(snapshot):
+                return snapshot
+
+        keys = cls._chain_keys(name, category, chain)
+        found = await cls._al1_snapshots(keys)
+        snapshot = cls._first_in_chain(name, category, chain, found)
+        if snapshot is None:
+            missing = [key for key in keys if key not in found]
+            entries = await async_cache.get_many(missing)
+            for key in missing:
+                cls._found_shared_snapshot(found, key, entries.get(key))
+            snapshot = cls._first_in_chain(name, category, chain, found)
+        if snapshot is None:
+            snapshot = await cls._aload_chain(name, category, chain, keys)
+        await cls._aset_cached_chain(chain_key, resolved, language, snapshot.language)
+        return snapshot
+
+    @staticmethod
+    def _language_chain(language) -> tuple:
+        fallback = getattr(settings, "TEMPLATE_FALLBACK_LANGUAGE", "en")
+        return language_chain(language or fallback, fallback)
+
+    @staticmethod
+    def _chain_keys(name, category, chain: tuple) -> list:
+        return [
+            TemplateCacheKeys.template_latest(name, category, language)
+            for language in chain
+        ]
+
+    @staticmethod
+    def _l1_snapshots(keys: list) -> dict:
+        found = {}
+        for key in keys:
+            value = template_l1_cache.get(key)
+            cache_lookup("l1", value is not None)
+            if value is not None:
+                found[key] = value
+        return found
+
+    @staticmethod
+    async def _al1_snapshots(keys: list) -> dict:
+        found = {}
+        for key in keys:
+            value = await template_l1_cache.aget(key)
+            cache_lookup("l1", value is not None)
+            if value is not None:
+                found[key] = value
+        return found
+
+    @classmethod
+    def _found_shared_snapshot(cls, found: dict, key: str, entry) -> None:
+        value = cls._shared_snapshot(key, cls._unwrap(entry))
+        cache_lookup("redis", value is not None)
+        if value is not None:
+            found[key] = value
+
+    @classmethod
+    def _first_in_chain(cls, name, category, chain: tuple, found: dict):
+        """
+        The snapshot of the first language in the chain with a template
+
+        None when the cache cannot tell: a language before it is neither
+        cached nor known to be missing.
+        """
+        for language in chain:
+            value = found.get(
+                TemplateCacheKeys.template_latest(name, category, language)
+            )
+            if value is None:
+                return None
+            if not negative_cache.is_marker(value):
+                return value
+        cls._negative_hit()
+        raise cls._chain_not_found(name, category, chain)
+
+    @classmethod
+    async def _aload_chain(
+        cls, name, category, chain: tuple, keys: list
+    ) -> TemplateSnapshot:
+        start = time.perf_counter()
+        latest = {
+            template.language: template
+            async for template in cls._latest_in_languages(name, category, chain)
+        }
+        delta = time.perf_counter() - start
+        for language, key in zip(chain, keys):
+            template = latest.get(language)
+            if template is None:
+                await cls._aset_not_found(key)
+                continue
+            snapshot = TemplateSnapshot.from_model(template)
+            await cls._aset_cached_snapshot(key, snapshot, delta)
+            return snapshot
+        logger.warning(f"No active template found for {name}/{category}/{chain}")
+        raise cls._chain_not_found(name, category, chain)
+
+    @staticmethod
+    def _latest_in_languages(name, category, languages: tuple):
+        latest = Template.objects.filter(
+            name=OuterRef("name"),
+            category=OuterRef("category"),
+            language=OuterRef("language"),
+            is_deleted=False,
+            is_active=True,
+        ).order_by("-version")
+        return Template.objects.select_related("body_ref").filter(
+            name=name,
+            category=category,
+            language__in=languages,
+            id=Subquery(latest.values("id")[:1]),
+        )
+
+    @classmethod
+    async def _aget_cached_chain(cls, chain_key: str) -> dict:
+        resolved = await template_l1_cache.aget(chain_key)
+        if resolved is None:
+            resolved = await async_cache.get(chain_key)
+            if resolved is not None:
+                template_l1_cache.set(chain_key, resolved)
+        cache_lookup("chain", resolved is not None)
+        return resolved or {}
+
+    @classmethod
+    def _chain_entry(cls, resolved: dict, language, resolved_language):
+        """The resolved languages with a new entry, or None to leave them as is"""
+        if resolved.get(language) == resolved_language:
+            return None
+        if len(resolved) >= cls.MAX_CHAIN_LANGUAGES:
+            return None
+        return {**resolved, language: resolved_language}
+
+    @classmethod
+    async def _aset_cached_chain(
+        cls, chain_key: str, resolved: dict, language, resolved_language
+    ) -> None:
+        resolved = cls._chain_entry(resolved, language, resolved_language)
+        if resolved is not None:
+            await async_cache.set(chain_key, resolved, cls.CACHE_TIMEOUT)
+            template_l1_cache.set(chain_key, resolved)
+
+    @staticmethod
+    def _chain_not_found(name, category, chain: tuple) -> ValueError:
+        return ValueError(
+            f"Template '{name}' ({category}) not found in any of: {', '.join(chain)}"
+        )
+
+    @staticmethod
+    def _latest_not_found(name, category, language) -> ValueError:
+        return ValueError(f"Template '{name}' ({category}, {language}) not found")
+
+    @staticmethod
+    def _id_not_found(template_id) -> ValueError:
+        return ValueError(f"Template with ID '{template_id}' not found")
+
+    @classmethod
+    def _checked_id(cls, template_id) -> str:
+        """A template id in canonical form; malformed ids never reach the database"""
         try:
-            if payload.id:
-                try:
-                    template = Template.objects.get(id=payload.id, is_deleted=False)
-                except (ValueError, ObjectDoesNotExist):
-                    raise ValueError(f"Template with ID '{payload.id}' not found")
-            elif payload.name:
-                template = cls.get_latest_template(
-                    name=payload.name,
-                    category=payload.category,
-                    language=payload.language,
+            return str(UUID(str(template_id)))
+        except ValueError:
+            raise cls._id_not_found(template_id)
+
+    @classmethod
+    def resolve_templates(cls, references: list) -> list:
+        """
+        Resolve the render snapshots of many template references together
+
+        References by id read their snapshots from the in-process cache and
+        one ``get_many``, and the ones missing are loaded in one ``id__in``
+        query and written back with one ``set_many``. References by name
+        read every language of their fallback chains from the in-process
+        cache and one ``get_many``, and the families the cache cannot
+        decide are loaded in one query and written back with one
+        ``set_many``, so N templates cost O(1) round trips. Each entry of
+        the result is the reference's snapshot, or the ValueError it would
+        have raised from ``_aresolve_template``.
+        """
+        results = [None] * len(references)
+        by_id = {}
+        by_name = {}
+        for index, reference in enumerate(references):
+            if reference.id:
+                by_id[index] = reference.id
+            elif reference.name:
+                chain = (
+                    cls._language_chain(reference.language)
+                    if reference.fallback
+                    else (reference.language,)
                 )
+                by_name[index] = (reference.name, reference.category, chain)
             else:
-                raise ValueError("Either 'id' or 'name' must be provided")
+                results[index] = ValueError("Either 'id' or 'name' must be provided")
 
-            required_vars = set(template.context) if template.context else set()
-            provided_vars = set(payload.context.keys())
-            missing_vars = required_vars - provided_vars
-            if missing_vars:
-                raise BaseException(
-                    message="Missing required context variables",
-                    detail=f"Missing required context variables: {', '.join(sorted(missing_vars))}",
-                    status_code=400,
-                )
+        snapshots = cls._get_snapshots_by_ids(by_id.values()) if by_id else {}
+        for index, template_id in by_id.items():
+            snapshot = snapshots[template_id]
+            results[index] = (
+                snapshot if snapshot is not None else cls._id_not_found(template_id)
+            )
+        if by_name:
+            for index, result in cls._resolve_latest_many(by_name).items():
+                results[index] = result
+        return results
 
-            rendered_subject = cls._replace_variables(
-                template.subject or "", payload.context
+    @classmethod
+    def _get_snapshots_by_ids(cls, template_ids) -> dict:
+        """Render snapshots for many ids, or None for ids without a template"""
+        snapshots = {}
+        keys = {}
+        checked_ids = {}
+        for template_id in template_ids:
+            try:
+                checked = cls._checked_id(template_id)
+            except ValueError:
+                snapshots[template_id] = None
+                continue
+            keys[template_id] = TemplateCacheKeys.template_snapshot_by_id(checked)
+            checked_ids[keys[template_id]] = checked
+
+        found = cls._get_many_cached(list(checked_ids), cls._shared_snapshot)
+        missing = {
+            key: checked for key, checked in checked_ids.items() if key not in found
+        }
+        if missing:
+            found.update(cls._load_snapshots_by_ids(missing))
+
+        for template_id, key in keys.items():
+            snapshot = found.get(key)
+            if negative_cache.is_marker(snapshot):
+                cls._negative_hit()
+                snapshot = None
+            snapshots[template_id] = snapshot
+        return snapshots
+
+    @classmethod
+    def _load_snapshots_by_ids(cls, missing: dict) -> dict:
+        """Load the snapshots of cache keys to ids in one query and cache them"""
+        snapshots = {
+            TemplateCacheKeys.template_snapshot_by_id(template.id): (
+                TemplateSnapshot.from_model(template)
             )
-            rendered_body = cls._replace_variables(template.body, payload.context)
+            for template in cls._snapshot_queryset().filter(
+                id__in=list(missing.values())
+            )
+        }
+        if snapshots:
+            cls._set_many_snapshots(
+                {key: snapshot.encode() for key, snapshot in snapshots.items()}
+            )
+            for key, snapshot in snapshots.items():
+                template_l1_cache.set(key, snapshot)
+        cls._set_many_not_found([key for key in missing if key not in snapshots])
+        return snapshots
 
-            logger.info(
-                f"Template '{template.name}' (v{template.version}) rendered successfully"
+    @classmethod
+    def _resolve_latest_many(cls, references: dict) -> dict:
+        keys = list(
+            dict.fromkeys(
+                key
+                for name, category, chain in references.values()
+                for key in cls._chain_keys(name, category, chain)
             )
+        )
+        found = cls._get_many_cached(keys, cls._shared_snapshot)
 
-            return {
-                "template_id": str(template.id),
-                "template_name": template.name,
-                "version": template.version,
-                "category": template.category,
-                "language": template.language,
-                "subject": rendered_subject,
-                "body": rendered_body,
-            }
+        results = {}
+        undecided = {}
+        for index, (name, category, chain) in references.items():
+            try:
+                snapshot = cls._first_in_chain(name, category, chain, found)
+            except ValueError:
+                results[index] = cls._not_found_in(name, category, chain)
+                continue
+            if snapshot is None:
+                undecided[index] = (name, category, chain)
+            else:
+                results[index] = snapshot
+
+        if undecided:
+            families = {}
+            for name, category, chain in undecided.values():
+                for language, key in zip(chain, cls._chain_keys(name, category, chain)):
+                    if key not in found:
+                        families[key] = (name, category, language)
+            loaded = cls._load_latest_many(families)
+            for index, (name, category, chain) in undecided.items():
+                results[index] = cls._first_loaded(name, category, chain, found, loaded)
+        return results
+
+    @classmethod
+    def _load_latest_many(cls, families: dict) -> dict:
+        """
+        Load the latest version of many template families in one query
+
+        ``families`` maps cache keys to (name, category, language); the
+        snapshots found are returned by key and written back with one
+        ``set_many``, and families without a template are negatively cached.
+        """
+        query = Q()
+        for name, category, language in families.values():
+            query |= Q(name=name, category=_key_part(category), language=language)
+        snapshots = {
+            TemplateCacheKeys.template_latest(
+                template.name, template.category, template.language
+            ): TemplateSnapshot.from_model(template)
+            for template in cls._latest_templates().filter(query)
+        }
+        if snapshots:
+            cls._set_many_snapshots(
+                {key: snapshot.encode() for key, snapshot in snapshots.items()}
+            )
+            for key, snapshot in snapshots.items():
+                template_l1_cache.set(key, snapshot)
+        cls._set_many_not_found([key for key in families if key not in snapshots])
+        return snapshots
+
+    @classmethod
+    def _first_loaded(cls, name, category, chain: tuple, found: dict, loaded: dict):
+        """The first language of the chain with a template, cached or just loaded"""
+        for key in cls._chain_keys(name, category, chain):
+            snapshot = found.get(key) or loaded.get(key)
+            if snapshot is not None and not negative_cache.is_marker(snapshot):
+                return snapshot
+        return cls._not_found_in(name, category, chain)
+
+    @classmethod
+    def _not_found_in(cls, name, category, chain: tuple) -> ValueError:
+        if len(chain) == 1:
+            return cls._latest_not_found(name, category, chain[0])
+        return cls._chain_not_found(name, category, chain)
+
+    @classmethod
+    def _get_many_cached(cls, keys: list, shared) -> dict:
+        """
+        Values of many keys from the in-process cache, then one ``get_many``
+
+        ``shared`` turns a value read from the shared cache into the one
+        kept in-process, copying it there, or returns None on a miss.
+        """
+        found = cls._l1_snapshots(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            entries = cache.get_many(missing)
+            for key in missing:
+                value = shared(key, cls._unwrap(entries.get(key)))
+                cache_lookup("redis", value is not None)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    @classmethod
+    def _set_many_not_found(cls, cache_keys: list) -> None:
+        """Negatively cache many keys with one ``set_many``"""
+        if not cache_keys or not negative_cache.enabled:
+            return
+        for cache_key in cache_keys:
+            negative_cache.record_store()
+            template_l1_cache.set(
+                cache_key, negative_cache.MARKER, negative_cache.timeout
+            )
+        cache.set_many(
+            dict.fromkeys(cache_keys, negative_cache.MARKER), negative_cache.timeout
+        )
+
+    @classmethod
+    async def _aresolve_template(cls, payload) -> TemplateSnapshot:
+        """
+        Resolve the render snapshot of the template referenced by a request
+
+        Ids and names both resolve through the cache hierarchy (in-process,
+        Redis, then a coalesced database load); unknown references are
+        negatively cached for TEMPLATE_NEGATIVE_CACHE_TIMEOUT seconds.
+        """
+        if payload.id:
+            snapshot = await cls.aget_snapshot_by_id(cls._checked_id(payload.id))
+            if snapshot is None:
+                raise cls._id_not_found(payload.id)
+            return snapshot
+        elif payload.name:
+            resolve = (
+                cls.aresolve_latest_template
+                if payload.fallback
+                else cls.aget_latest_template
+            )
+            return await resolve(
+                name=payload.name,
+                category=payload.category,
+                language=payload.language,
+            )
+        raise ValueError("Either 'id' or 'name' must be provided")
+
+    @staticmethod
+    def _path(payload) -> str:
+        """How a render request references its template, for metrics"""
+        return "id" if payload.id else "name"
+
+    @staticmethod
+    def _template_meta(template) -> dict:
+        return {
+            "template_id": str(template.id),
+            "template_name": template.name,
+            "version": template.version,
+            "category": template.category,
+            "language": template.language,
+        }
+
+    @classmethod
+    async def arender_template(cls, payload):
+        try:
+            with render_seconds.labels(cls._path(payload), "single").time():
+                with phase("resolve"):
+                    template = await cls._aresolve_template(payload)
+                return cls._render(template, payload.context or {})
+        except Exception as e:
+            raise BaseException(
+                message="Template rendering failed", detail=str(e), status_code=400
+            )
+
+    @classmethod
+    def _render(cls, template: TemplateSnapshot, context: dict) -> dict:
+        with phase("validate"):
+            missing_vars = template.required_vars.difference(context)
+        if missing_vars:
+            raise BaseException(
+                message="Missing required context variables",
+                detail=f"Missing required context variables: {', '.join(sorted(missing_vars))}",
+                status_code=400,
+            )
+
+        with phase("substitute"):
+            compiled = compile_template(template)
+            rendered_subject, rendered_body = cls._render_pair(
+                template, compiled, context
+            )
+        template_renders_total.labels(template.name).inc()
+
+        logger.info(
+            f"Template '{template.name}' (v{template.version}) rendered successfully"
+        )
+
+        return {
+            **cls._template_meta(template),
+            "subject": rendered_subject,
+            "body": rendered_body,
+        }
+
+    @classmethod
+    async def arender_batch(cls, payload):
+        """
+        Render one template for many contexts
+
+        The template is resolved and compiled once; each context is only
+        checked against the precomputed set of required variables.
+        """
+        with render_seconds.labels(cls._path(payload), "batch").time():
+            with phase("resolve"):
+                template = await cls._aresolve_batch_template(payload)
+            return cls._render_batch(template, payload.contexts)
+
+    @classmethod
+    def _render_batch(cls, template: TemplateSnapshot, contexts) -> dict:
+        # Per-context validation is interleaved with substitution here
+        with phase("substitute"):
+            items = list(cls.iter_rendered_items(template, contexts))
+        template_renders_total.labels(template.name).inc(
+            sum(item["success"] for item in items)
+        )
+        logger.info(
+            f"Template '{template.name}' (v{template.version}) rendered for "
+            f"{len(items)} contexts"
+        )
+        return {**cls._template_meta(template), "items": items}
+
+    @classmethod
+    async def astream_render_batch(cls, payload):
+        """
+        Lazily render one template for many contexts
+
+        The template is resolved eagerly so lookup errors surface before
+        streaming starts; each item carries the template id and version.
+        Returns an async iterator so ASGI streams items as they are rendered
+        instead of buffering a sync iterator.
+        """
+        template = await cls._aresolve_batch_template(payload)
+        meta = {"template_id": str(template.id), "version": template.version}
+        renders = template_renders_total.labels(template.name)
+
+        async def items():
+            for item in cls.iter_rendered_items(template, payload.contexts):
+                if item["success"]:
+                    renders.inc()
+                yield {**item, **meta}
+
+        return items()
 
+    @classmethod
+    async def _aresolve_batch_template(cls, payload):
+        try:
+            return await cls._aresolve_template(payload)
         except Exception as e:
             raise BaseException(
                 message="Template rendering failed", detail=str(e), status_code=400
             )
 
+    @classmethod
+    def iter_rendered_items(cls, template, contexts):
+        """Yield one rendered item per context, in order"""
+        compiled = compile_template(template)
+        required_vars = template.required_vars
+
+        for index, context in enumerate(contexts):
+            missing_vars = required_vars.difference(context)
+            if missing_vars:
+                yield {
+                    "index": index,
+                    "success": False,
+                    "subject": None,
+                    "body": None,
+                    "error": f"Missing required context variables: {', '.join(sorted(missing_vars))}",
+                }
+                continue
+            subject, body = cls._render_pair(template, compiled, context)
+            yield {
+                "index": index,
+                "success": True,
+                "subject": subject,
+                "body": body,
+                "error": None,
+            }
+
+    @staticmethod
+    def _render_pair(template, compiled, context: dict) -> tuple:
+        """Render subject and body, through the render cache when enabled"""
+        if not render_cache.enabled:
+            return compiled.subject.render(context), compiled.body.render(context)
+        key = render_cache.key_for(template, context)
+        rendered = render_cache.get(key)
+        cache_lookup("render", rendered is not None)
+        if rendered is None:
+            rendered = (compiled.subject.render(context), compiled.body.render(context))
+            render_cache.set(key, rendered)
+        return rendered
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss statistics of the in-process caches"""
+        return {
+            "l1": template_l1_cache.stats(),
+            "render": render_cache.stats(),
+            "negative": negative_cache.stats(),
+        }
+
     @staticmethod
     def _replace_variables(text: str, context: dict) -> str:
         """
@@ -300,20 +1623,16 @@ class TemplateService:
         Returns:
             Text with variables replaced
         """
-
-        def replace_match(match):
-            var_name = match.group(1)
-            return str(context.get(var_name, match.group(0)))
-
-        pattern = r"\{\{(\w+)\}\}"
-        return re.sub(pattern, replace_match, text)
+        return CompiledText(text).render(context)
 
     @classmethod
     def delete_template(cls, template_id):
         try:
-            template = Template.objects.get(id=template_id, is_deleted=False)
-            template.is_deleted = True
-            template.save(update_fields=["is_deleted", "updated_at"])
+            with transaction.atomic():
+                template = Template.objects.get(id=template_id, is_deleted=False)
+                template.is_deleted = True
+                template.save(update_fields=["is_deleted", "updated_at"])
+                cls._retire_from_head(template)
             cls._invalidate_template_cache(
                 template.name, template.category, template.language, template_id
             )
@@ -325,12 +1644,14 @@ class TemplateService:
     @classmethod
     def permanently_delete_template(cls, template_id):
         try:
-            template = Template.objects.get(id=template_id)
-            name = template.name
-            category = template.category
-            language = template.language
+            with transaction.atomic():
+                template = Template.objects.get(id=template_id)
+                name = template.name
+                category = template.category
+                language = template.language
 
-            template.delete()
+                cls._retire_from_head(template)
+                template.delete()
 
             cls._invalidate_template_cache(name, category, language, template_id)
 
@@ -0,0 +1,135 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from template_service.compiler import extract_placeholders
+from template_service.models import TemplateBody
+
+
+class TemplateSnapshot:
+    """
+    Immutable view of a template version holding only what rendering needs.
+
+    Cached as a flat tuple of primitives instead of a pickled model instance,
+    so cache hits skip Django model reconstruction entirely.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "category",
+        "language",
+        "version",
+        "subject",
+        "body",
+        "body_hash",
+        "context",
+        "required_vars",
+        "placeholders",
+    )
+
+    # Model fields a snapshot is built from, for .only() with
+    # select_related("body_ref")
+    MODEL_FIELDS = (
+        "id",
+        "name",
+        "category",
+        "language",
+        "version",
+        "subject",
+        "body_ref__content",
+        "context",
+        "placeholders",
+    )
+
+    def __init__(
+        self,
+        id: UUID,
+        name: str,
+        category: str,
+        language: str,
+        version: int,
+        subject: Optional[str],
+        body: str,
+        context: tuple = (),
+        body_hash: Optional[str] = None,
+        placeholders: Optional[Iterable[str]] = None,
+    ):
+        set_attr = object.__setattr__
+        set_attr(self, "id", id)
+        set_attr(self, "name", name)
+        set_attr(self, "category", category)
+        set_attr(self, "language", language)
+        set_attr(self, "version", version)
+        set_attr(self, "subject", subject)
+        set_attr(self, "body", body)
+        set_attr(self, "body_hash", body_hash or TemplateBody.hash_of(body))
+        set_attr(self, "context", tuple(context))
+        set_attr(self, "required_vars", frozenset(context))
+        # Stored with the row when it is written; only extracted again for
+        # entries cached before the column existed
+        set_attr(
+            self,
+            "placeholders",
+            tuple(sorted(extract_placeholders(subject, body)))
+            if placeholders is None
+            else tuple(placeholders),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TemplateSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("TemplateSnapshot is immutable")
+
+    def __repr__(self):
+        return f"<TemplateSnapshot {self.name} ({self.category}, {self.language}) v{self.version}>"
+
+    @classmethod
+    def from_model(cls, template) -> "TemplateSnapshot":
+        return cls(
+            id=template.id,
+            name=template.name,
+            category=template.category,
+            language=template.language,
+            version=template.version,
+            subject=template.subject,
+            body=template.body,
+            context=template.context or (),
+            body_hash=template.body_hash,
+            placeholders=template.placeholders,
+        )
+
+    def encode(self) -> tuple:
+        """Encode as a tuple of primitives, cheap to pickle and unpickle"""
+        return (
+            str(self.id),
+            self.name,
+            self.category,
+            self.language,
+            self.version,
+            self.subject,
+            self.body,
+            self.context,
+            self.body_hash,
+            self.placeholders,
+        )
+
+    @classmethod
+    def decode(cls, data: tuple) -> "TemplateSnapshot":
+        # Entries cached before body hashes and placeholders were added hold
+        # 8 and 9 items
+        id, name, category, language, version, subject, body, context = data[:8]
+        body_hash = data[8] if len(data) > 8 else None
+        placeholders = data[9] if len(data) > 9 else None
+        return cls(
+            UUID(id),
+            name,
+            category,
+            language,
+            version,
+            subject,
+            body,
+            context,
+            body_hash,
+            placeholders,
+        )
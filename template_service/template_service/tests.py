@@ -1,14 +1,86 @@
+import asyncio
+import inspect
 import json
-from unittest.mock import patch, MagicMock
-
-from django.test import TestCase
+import os
+import pstats
+import tempfile
+import threading
+import time
+from base64 import urlsafe_b64encode
+from io import StringIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import redis
+import redis.asyncio as aioredis
+from asgiref.sync import async_to_sync, sync_to_async
 from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import TestCase
 from django.urls import reverse
-from ninja.testing import TestClient
+from django_redis.cache import RedisCache
+from ninja.testing import TestAsyncClient
+from ninja.testing.client import NinjaResponse
 
-from template_service.models import Template, TemplateCategory
+from template_service import profiling, utils
+from template_service.admin import TemplateAdminForm
 from template_service.api import router
-from template_service.services import TemplateService
+from template_service.caching import (
+    AsyncCache,
+    CachedValue,
+    MissCoalescer,
+    NegativeCache,
+    RenderCache,
+    TemplateL1Cache,
+    async_cache,
+    template_l1_cache,
+)
+from template_service.compiler import CompiledText, compile_template
+from template_service.exceptions import BaseException as TemplateError
+from template_service.metrics import Counter, Gauge, Histogram, registry
+from template_service.middleware import ProfilingMiddleware
+from template_service.models import (
+    Template,
+    TemplateBody,
+    TemplateCategory,
+    TemplateHead,
+)
+from template_service.schemas import (
+    BatchRenderTemplateRequest,
+    CreateTemplate,
+    RenderTemplateRequest,
+    TemplateReference,
+    TemplatesQuerySchema,
+    UpdateTemplate,
+)
+from template_service.services import TemplateCacheKeys, TemplateService, language_chain
+from template_service.snapshots import TemplateSnapshot
+from template_service.worker import (
+    EXCHANGE,
+    RENDER_ROUTING_KEY,
+    InMemoryBroker,
+    RenderWorker,
+)
+
+
+class TestClient(TestAsyncClient):
+    """Drives the router, including its async operations, from sync tests"""
+
+    def request(self, *args, **kwargs):
+        return async_to_sync(super().request)(*args, **kwargs)
+
+    async def _call(self, func, request, kwargs):
+        if inspect.iscoroutinefunction(func):
+            response = await func(request, **kwargs)
+        else:
+            # Sync views run in a worker thread, as Django's ASGI handler does
+            response = await sync_to_async(func)(request, **kwargs)
+        if getattr(response, "is_async", False):
+            response.streaming_content = [
+                chunk async for chunk in response.streaming_content
+            ]
+        return NinjaResponse(response)
 
 
 class TemplateServiceTestCase(TestCase):
@@ -16,6 +88,7 @@ class TemplateServiceTestCase(TestCase):
         """Set up test data"""
         self.client = TestClient(router)
         cache.clear()
+        template_l1_cache.clear()
 
         # Create test template
         self.template_data = {
@@ -162,6 +235,94 @@ class TemplateAPITestCase(TemplateServiceTestCase):
         self.assertEqual(response_data["meta"]["limit"], 10)
         self.assertTrue(response_data["meta"]["has_next"])
 
+    def test_get_all_templates_cursor_pagination(self):
+        """Test walking every page with keyset cursors"""
+        for i in range(24):
+            Template.objects.create(
+                name=f"template_{i}", category="email", body=f"Body {i}", language="en"
+            )
+
+        seen = []
+        cursor = ""
+        while True:
+            response = self.client.get(f"/templates?limit=10&cursor={cursor}")
+            self.assertEqual(response.status_code, 200)
+            response_data = response.json()
+            seen.extend(item["id"] for item in response_data["data"])
+            meta = response_data["meta"]
+            self.assertNotIn("page", meta)
+            self.assertIsNone(meta["total"])
+            if not meta["has_next"]:
+                self.assertIsNone(meta["next_cursor"])
+                break
+            cursor = meta["next_cursor"]
+
+        expected = Template.objects.order_by("-created_at", "-id").values_list(
+            "id", flat=True
+        )
+        self.assertEqual(seen, [str(template_id) for template_id in expected])
+
+    def test_get_all_templates_cursor_pagination_with_total(self):
+        """Test the total count is only computed when requested"""
+        response = self.client.get("/templates?cursor=&include_total=true")
+
+        self.assertEqual(response.status_code, 200)
+        meta = response.json()["meta"]
+        self.assertEqual(meta["total"], 1)
+        self.assertFalse(meta["has_next"])
+
+    def test_get_all_templates_invalid_cursor(self):
+        """Test a malformed cursor is rejected"""
+        response = self.client.get("/templates?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+
+    def test_get_all_templates_cursor_with_wrong_types(self):
+        """Test a well-formed cursor holding the wrong types is rejected"""
+        for position in (["2024-01-01T00:00:00", 5], [5, "not-a-uuid"]):
+            cursor = urlsafe_b64encode(json.dumps(position).encode()).decode()
+            with self.assertRaises(TemplateError) as ctx:
+                TemplateService.decode_cursor(cursor)
+            self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_get_all_templates_summary(self):
+        """Test summary listings leave out body and context"""
+        response = self.client.get("/templates?fields=summary")
+
+        self.assertEqual(response.status_code, 200)
+        item = response.json()["data"][0]
+        self.assertEqual(item["id"], str(self.template.id))
+        self.assertEqual(item["subject"], "Welcome {{user_name}}!")
+        self.assertNotIn("body", item)
+        self.assertNotIn("context", item)
+
+    def test_get_all_templates_summary_cached_separately(self):
+        """Test a cached summary page is never served as a full page"""
+        self.client.get("/templates?fields=summary")
+        response = self.client.get("/templates")
+
+        item = response.json()["data"][0]
+        self.assertEqual(item["body"], self.template.body)
+        self.assertEqual(item["context"], ["user_name"])
+
+    def test_get_all_templates_summary_with_cursor(self):
+        """Test summary listings page with cursors too"""
+        for i in range(3):
+            Template.objects.create(
+                name=f"template_{i}", category="email", body=f"Body {i}", language="en"
+            )
+
+        first = self.client.get("/templates?fields=summary&limit=2&cursor=").json()
+        cursor = first["meta"]["next_cursor"]
+        second = self.client.get(
+            f"/templates?fields=summary&limit=2&cursor={cursor}"
+        ).json()
+
+        ids = [item["id"] for item in first["data"] + second["data"]]
+        self.assertEqual(len(set(ids)), 4)
+        self.assertNotIn("body", second["data"][0])
+
     def test_get_template_by_id_success(self):
         """Test getting template by ID"""
         response = self.client.get(f"/templates/{self.template.id}")
@@ -233,6 +394,163 @@ class TemplateAPITestCase(TemplateServiceTestCase):
 
         self.assertEqual(response.status_code, 422)  # Validation error
 
+    def test_render_template_batch_success(self):
+        """Test rendering one template for many contexts"""
+        render_data = {
+            "name": "welcome_email",
+            "category": "email",
+            "language": "en",
+            "contexts": [
+                {"user_name": "Ada"},
+                {"other": "value"},
+                {"user_name": "Grace"},
+            ],
+        }
+
+        response = self.client.post("/templates/render/batch", json=render_data)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["template_id"], str(self.template.id))
+        self.assertEqual([item["index"] for item in data["items"]], [0, 1, 2])
+        self.assertEqual(data["items"][0]["subject"], "Welcome Ada!")
+        self.assertFalse(data["items"][1]["success"])
+        self.assertIn("user_name", data["items"][1]["error"])
+        self.assertEqual(
+            data["items"][2]["body"], "Hello Grace, welcome to our platform!"
+        )
+
+    def test_render_responses_encoded_directly(self):
+        """Test render responses skip validation but keep the schema's shape"""
+        response = self.client.post(
+            "templates/render",
+            json={"id": str(self.template.id), "context": {"user_name": "Ada"}},
+        )
+        batch = self.client.post(
+            "/templates/render/batch",
+            json={"id": str(self.template.id), "contexts": [{"user_name": "Ada"}, {}]},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], utils.JSON_CONTENT_TYPE)
+        self.assertEqual(
+            list(response.json()["data"]),
+            [
+                "template_id",
+                "template_name",
+                "version",
+                "category",
+                "language",
+                "subject",
+                "body",
+            ],
+        )
+        self.assertTrue(response.json()["success"])
+        items = batch.json()["data"]["items"]
+        self.assertEqual(
+            [list(item) for item in items],
+            [["index", "success", "subject", "body", "error"]] * 2,
+        )
+        self.assertIsNone(items[0]["error"])
+        self.assertIsNone(items[1]["body"])
+
+    def test_dump_json_falls_back_to_stdlib(self):
+        """Test the stdlib encoder produces the same JSON as orjson"""
+        data = {"data": {"body": "<p>Grüße</p>", "version": 2, "error": None}}
+        with patch.object(utils, "orjson", None):
+            fallback = utils.dump_json(data)
+
+        self.assertEqual(json.loads(fallback), data)
+        self.assertEqual(json.loads(utils.dump_json(data)), data)
+
+    def test_render_template_batch_not_found(self):
+        """Test batch rendering of a non-existent template"""
+        render_data = {
+            "id": "550e8400-e29b-41d4-a716-446655440999",
+            "contexts": [{"user_name": "Ada"}],
+        }
+
+        response = self.client.post("/templates/render/batch", json=render_data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+
+    def test_render_template_batch_ndjson(self):
+        """Test batch rendering streamed as NDJSON"""
+        render_data = {
+            "id": str(self.template.id),
+            "contexts": [{"user_name": f"user-{i}"} for i in range(3)],
+        }
+
+        response = self.client.post(
+            "/templates/render/batch",
+            json=render_data,
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = [json.loads(line) for line in response.content.splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2]["subject"], "Welcome user-2!")
+        self.assertEqual(lines[2]["template_id"], str(self.template.id))
+
+    def test_get_all_templates_ndjson(self):
+        """Test listing templates streamed as NDJSON"""
+        for i in range(3):
+            Template.objects.create(
+                name=f"template_{i}", category="push", body=f"Body {i}", language="en"
+            )
+
+        response = self.client.get(
+            "/templates?category=push", headers={"Accept": "application/x-ndjson"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in response.content.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row["category"] == "push" for row in rows))
+
+    def test_get_all_templates_ndjson_pages(self):
+        """Test NDJSON listings stream one page, by page or after a cursor"""
+        for i in range(3):
+            Template.objects.create(
+                name=f"template_{i}", category="push", body=f"Body {i}", language="en"
+            )
+        ndjson = {"Accept": "application/x-ndjson"}
+
+        second = self.client.get("/templates?limit=2&page=2", headers=ndjson)
+        rows = [json.loads(line) for line in second.content.splitlines()]
+        self.assertEqual(len(rows), 2)
+
+        first = self.client.get("/templates?limit=2&cursor=").json()
+        after = self.client.get(
+            f"/templates?limit=2&cursor={first['meta']['next_cursor']}",
+            headers=ndjson,
+        )
+        ids = [json.loads(line)["id"] for line in after.content.splitlines()]
+        self.assertEqual(ids, [row["id"] for row in rows])
+
+    def test_get_all_templates_ndjson_invalid_cursor(self):
+        """Test a malformed cursor is rejected before streaming starts"""
+        response = self.client.get(
+            "/templates?cursor=not-a-cursor", headers={"Accept": "application/x-ndjson"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+
+    def test_get_all_templates_summary_ndjson(self):
+        """Test streaming summary rows as NDJSON"""
+        response = self.client.get(
+            "/templates?fields=summary", headers={"Accept": "application/x-ndjson"}
+        )
+
+        rows = [json.loads(line) for line in response.content.splitlines()]
+        self.assertEqual(rows[0]["id"], str(self.template.id))
+        self.assertNotIn("body", rows[0])
+
     def test_delete_template_success(self):
         """Test successful template deletion"""
         response = self.client.delete(f"/templates/{self.template.id}")
@@ -260,8 +578,6 @@ class TemplateServiceBusinessLogicTestCase(TemplateServiceTestCase):
 
     def test_create_template_service(self):
         """Test TemplateService.create_template method"""
-        from template_service.schemas import CreateTemplate
-
         new_data = CreateTemplate(
             name="service_test",
             category="email",
@@ -278,8 +594,6 @@ class TemplateServiceBusinessLogicTestCase(TemplateServiceTestCase):
 
     def test_update_template_service(self):
         """Test TemplateService.update_template method"""
-        from template_service.schemas import UpdateTemplate
-
         update_data = UpdateTemplate(
             subject="Updated Service Subject", body="Updated Service Body"
         )
@@ -293,21 +607,21 @@ class TemplateServiceBusinessLogicTestCase(TemplateServiceTestCase):
         self.assertEqual(updated_template.version, 2)
 
     def test_get_latest_template(self):
-        """Test TemplateService.get_latest_template method"""
-        latest = TemplateService.get_latest_template(
+        """Test TemplateService.aget_latest_template method"""
+        latest = async_to_sync(TemplateService.aget_latest_template)(
             name="welcome_email", category="email", language="en"
         )
 
         self.assertEqual(latest.id, self.template.id)
 
     def test_render_template_service(self):
-        """Test TemplateService.render_template method"""
+        """Test TemplateService.arender_template method"""
         render_request = MagicMock()
         render_request.id = str(self.template.id)
         render_request.name = None
         render_request.context = {"user_name": "Test User"}
 
-        result = TemplateService.render_template(render_request)
+        result = async_to_sync(TemplateService.arender_template)(render_request)
 
         self.assertEqual(result["template_id"], str(self.template.id))
         self.assertIn("Test User", result["subject"])
@@ -331,27 +645,399 @@ class TemplateServiceBusinessLogicTestCase(TemplateServiceTestCase):
         self.assertEqual(result, "Hello John, your order {{order_id}} is ready!")
 
 
+class TemplateHeadTestCase(TemplateServiceTestCase):
+    """Test cases for the per-family current version pointer"""
+
+    def _head(self, name="welcome_email"):
+        return TemplateHead.objects.get(name=name, category="email", language="en")
+
+    def test_create_template_backfills_and_advances_head(self):
+        template = TemplateService.create_template(
+            CreateTemplate(name="welcome_email", category="email", body="v2")
+        )
+
+        head = self._head()
+        self.assertEqual(template.version, 2)
+        self.assertEqual(head.latest_version, 2)
+        self.assertEqual(head.current_id, template.id)
+
+    def test_version_numbering_skips_soft_deleted_versions(self):
+        TemplateService.delete_template(str(self.template.id))
+        template = TemplateService.create_template(
+            CreateTemplate(name="welcome_email", category="email", body="v2")
+        )
+
+        self.assertEqual(template.version, 2)
+
+    def test_update_template_moves_head(self):
+        updated = TemplateService.update_template(
+            str(self.template.id), UpdateTemplate(body="Updated {{user_name}}")
+        )
+
+        self.assertEqual(self._head().current_id, updated.id)
+        latest = async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+        self.assertEqual(latest.id, updated.id)
+
+    def test_delete_current_template_falls_back_to_previous_version(self):
+        updated = TemplateService.update_template(
+            str(self.template.id), UpdateTemplate(body="Updated {{user_name}}")
+        )
+        TemplateService.delete_template(str(updated.id))
+
+        self.assertEqual(self._head().current_id, self.template.id)
+        latest = async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+        self.assertEqual(latest.id, self.template.id)
+
+    def test_permanently_deleting_last_version_clears_head(self):
+        template = TemplateService.create_template(
+            CreateTemplate(name="one_off", category="email", body="Hi")
+        )
+        TemplateService.permanently_delete_template(str(template.id))
+
+        head = self._head("one_off")
+        self.assertIsNone(head.current_id)
+        self.assertEqual(head.latest_version, 1)
+        with self.assertRaises(ValueError):
+            async_to_sync(TemplateService.aget_latest_template)(
+                "one_off", "email", "en"
+            )
+
+    def test_get_latest_template_resolves_through_head(self):
+        template = TemplateService.create_template(
+            CreateTemplate(name="welcome_email", category="email", body="v2")
+        )
+        cache.clear()
+        template_l1_cache.clear()
+
+        with self.assertNumQueries(1):
+            latest = async_to_sync(TemplateService.aget_latest_template)(
+                "welcome_email", "email", "en"
+            )
+        self.assertEqual(latest.id, template.id)
+        self.assertEqual(self.template.get_latest_version().id, template.id)
+
+    def test_stale_head_is_not_trusted(self):
+        template = TemplateService.create_template(
+            CreateTemplate(name="welcome_email", category="email", body="v2")
+        )
+        Template.objects.filter(id=template.id).update(is_active=False)
+        cache.clear()
+        template_l1_cache.clear()
+
+        latest = async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+        self.assertEqual(latest.id, self.template.id)
+
+
+class TemplateBulkImportTestCase(TemplateServiceTestCase):
+    """Test cases for bulk template import"""
+
+    def _payloads(self, *rows):
+        return [CreateTemplate(category="email", **row) for row in rows]
+
+    def test_bulk_import_versions_new_and_existing_families(self):
+        result = TemplateService.bulk_import_templates(
+            self._payloads(
+                {"name": "welcome_email", "body": "Hi {{user_name}}"},
+                {"name": "welcome_email", "body": "Hello again {{user_name}}"},
+                {"name": "receipt", "body": "Receipt"},
+                {"name": "receipt", "body": "Receipt", "language": "fr"},
+            )
+        )
+
+        self.assertEqual(result, {"created": 4, "unchanged": 0, "families": 3})
+        versions = Template.objects.filter(name="welcome_email").order_by("version")
+        self.assertEqual([t.version for t in versions], [1, 2, 3])
+        head = TemplateHead.objects.get(
+            name="welcome_email", category="email", language="en"
+        )
+        self.assertEqual(head.latest_version, 3)
+        self.assertEqual(head.current_id, versions.last().id)
+        self.assertEqual(Template.objects.get(name="receipt", language="fr").version, 1)
+
+    def test_bulk_import_skips_unchanged_templates(self):
+        rows = ({"name": "receipt", "body": "Receipt"},)
+        TemplateService.bulk_import_templates(self._payloads(*rows))
+
+        result = TemplateService.bulk_import_templates(
+            self._payloads(
+                *rows,
+                {
+                    "name": "welcome_email",
+                    "subject": self.template.subject,
+                    "body": self.template.body,
+                    "context": ["user_name"],
+                },
+            )
+        )
+
+        self.assertEqual(result, {"created": 0, "unchanged": 2, "families": 0})
+        self.assertEqual(Template.objects.count(), 2)
+
+    def test_bulk_import_invalidates_latest_cache(self):
+        async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+
+        TemplateService.bulk_import_templates(
+            self._payloads({"name": "welcome_email", "body": "New {{user_name}}"})
+        )
+
+        latest = async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+        self.assertEqual(latest.version, 2)
+        self.assertEqual(latest.body, "New {{user_name}}")
+
+    def test_bulk_import_api(self):
+        response = self.client.post(
+            "/templates/bulk",
+            json={
+                "templates": [
+                    {"name": "a", "category": "email", "body": "A"},
+                    {"name": "b", "category": "push", "body": "B"},
+                ]
+            },
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["data"]["created"], 2)
+
+    def test_import_templates_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as f:
+            f.write(json.dumps({"name": "a", "category": "email", "body": "A"}))
+            f.write("\n\n")
+            f.write(json.dumps({"name": "b", "category": "push", "body": "B"}))
+            f.flush()
+            out = StringIO()
+            call_command("import_templates", f.name, stdout=out)
+
+        self.assertIn("Imported 2 templates across 2 families", out.getvalue())
+        self.assertTrue(Template.objects.filter(name="b", category="push").exists())
+
+    def test_import_templates_command_rejects_invalid_rows(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+            json.dump([{"name": "a", "category": "email"}], f)
+            f.flush()
+            with self.assertRaises(CommandError):
+                call_command("import_templates", f.name)
+        self.assertFalse(Template.objects.filter(name="a").exists())
+
+
+class TemplateCacheWarmupTestCase(TemplateServiceTestCase):
+    """Test cases for cache warm-up"""
+
+    def test_warm_cache_loads_latest_active_versions(self):
+        newer = Template.objects.create(
+            name="welcome_email",
+            category="email",
+            body="v2 {{user_name}}",
+            version=2,
+            context=["user_name"],
+        )
+        Template.objects.create(
+            name="welcome_email",
+            category="email",
+            body="v3",
+            version=3,
+            is_active=False,
+        )
+        Template.objects.create(name="gone", category="push", body="x", is_deleted=True)
+        push = Template.objects.create(name="alert", category="push", body="Alert")
+
+        result = TemplateService.warm_cache(batch_size=1)
+
+        self.assertEqual(result["templates"], 2)
+        key = TemplateCacheKeys.template_latest("welcome_email", "email", "en")
+        self.assertEqual(cache.get(key).value[0], str(newer.id))
+        key = TemplateCacheKeys.template_latest("alert", "push", "en")
+        self.assertEqual(cache.get(key).value[0], str(push.id))
+        self.assertIsNone(
+            cache.get(TemplateCacheKeys.template_latest("gone", "push", "en"))
+        )
+
+    def test_warm_cache_serves_renders_without_queries(self):
+        TemplateService.warm_cache()
+        template_l1_cache.clear()
+
+        with self.assertNumQueries(0):
+            latest = async_to_sync(TemplateService.aget_latest_template)(
+                "welcome_email", "email", "en"
+            )
+        self.assertEqual(latest.id, self.template.id)
+
+    def test_warm_cache_local(self):
+        TemplateService.warm_cache(local=True)
+
+        key = TemplateCacheKeys.template_latest("welcome_email", "email", "en")
+        self.assertEqual(template_l1_cache.get(key).id, self.template.id)
+
+    def test_warm_template_cache_command(self):
+        out = StringIO()
+        call_command("warm_template_cache", stdout=out)
+
+        self.assertIn("Warmed 1 templates", out.getvalue())
+
+
+class TemplateAsyncServiceTestCase(TemplateServiceTestCase):
+    """Test cases for the async service paths used by the ASGI routes"""
+
+    async def test_arender_template_by_name(self):
+        """Test async rendering resolves through the async cache and ORM"""
+        payload = RenderTemplateRequest(
+            name="welcome_email",
+            category="email",
+            language="en",
+            context={"user_name": "Ada"},
+        )
+
+        result = await TemplateService.arender_template(payload)
+
+        self.assertEqual(result["subject"], "Welcome Ada!")
+        cached = await cache.aget(
+            TemplateCacheKeys.template_latest("welcome_email", "email", "en")
+        )
+        self.assertIsInstance(cached, tuple)
+
+    async def test_aget_template_by_id_populates_cache(self):
+        """Test async lookup by id fills the shared cache"""
+        template = await TemplateService.aget_template_by_id(str(self.template.id))
+
+        self.assertEqual(template.id, self.template.id)
+        cached = await cache.aget(
+            TemplateCacheKeys.template_by_id(str(self.template.id))
+        )
+        self.assertEqual(cached.value.id, self.template.id)
+
+    async def test_aget_all_templates_paginates(self):
+        """Test async listing counts and pages without sync queries"""
+        result = await TemplateService.aget_all_templates(TemplatesQuerySchema(limit=1))
+
+        self.assertEqual(len(result["data"]), 1)
+        self.assertEqual(result["meta"]["total"], 1)
+        self.assertFalse(result["meta"]["has_next"])
+
+
+class TemplateAsyncRedisCacheTestCase(TemplateServiceTestCase):
+    """Test cases for the async cache commands sent to Redis by django_redis"""
+
+    def setUp(self):
+        super().setUp()
+        self.backend = RedisCache(
+            "redis://localhost:6379/0",
+            {"OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"}},
+        )
+        self.async_cache = AsyncCache(self.backend)
+        # A real redis.asyncio client validates the SET arguments; only the
+        # command itself is faked, so no server is needed
+        self.client = aioredis.Redis()
+        self.client.execute_command = AsyncMock(return_value=True)
+        patcher = patch.object(AsyncCache, "_redis_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def commands(self) -> list:
+        return [call.args for call in self.client.execute_command.await_args_list]
+
+    def test_not_found_marker_with_float_timeout(self):
+        """Test float timeouts from settings are sent as milliseconds"""
+        negative_cache = NegativeCache(timeout=30.0)
+        key = TemplateCacheKeys.template_by_id("00000000-0000-0000-0000-000000000000")
+
+        with (
+            patch("template_service.services.negative_cache", negative_cache),
+            patch("template_service.services.async_cache", self.async_cache),
+        ):
+            async_to_sync(TemplateService._aset_not_found)(key)
+
+        ((command, redis_key, value, *expiry),) = self.commands()
+        self.assertEqual(command, "SET")
+        self.assertEqual(redis_key, self.backend.client.make_key(key))
+        self.assertEqual(expiry, ["PX", 30000])
+
+    def test_async_lock_is_taken_in_redis(self):
+        """Test a fractional lock timeout takes and releases the Redis lock"""
+        coalescer = MissCoalescer(lock_timeout=0.5, shared_cache=self.backend)
+        lock_key = self.backend.client.make_key("lock:key")
+
+        async def loader():
+            return "value"
+
+        async def lookup():
+            return None
+
+        with self.assertNoLogs("template_service.caching", level="WARNING"):
+            result = async_to_sync(coalescer.aload)("key", loader, lookup)
+
+        self.assertEqual(result, "value")
+        take, release = self.commands()
+        self.assertEqual(take[:2], ("SET", lock_key))
+        self.assertEqual(take[3:], ("PX", 500, "NX"))
+        self.assertEqual(release, ("DEL", lock_key))
+
+
+class TemplateCompilerTestCase(TemplateServiceTestCase):
+    """Test cases for precompiled template rendering"""
+
+    def test_compiled_text_matches_regex_substitution(self):
+        """Test compiled rendering keeps unknown placeholders untouched"""
+        compiled = CompiledText("{{greeting}} {{name}}, {{ name }} {{missing}}!")
+
+        self.assertEqual(compiled.variables, ("greeting", "name", "missing"))
+        self.assertEqual(
+            compiled.render({"greeting": "Hi", "name": 42}),
+            "Hi 42, {{ name }} {{missing}}!",
+        )
+
+    def test_compile_template_is_cached_per_content(self):
+        """Test templates compile once per body hash and subject"""
+        compiled = compile_template(self.template)
+        self.assertIs(compile_template(self.template), compiled)
+        self.assertEqual(compiled.placeholders, frozenset({"user_name"}))
+
+        self.template.version += 1
+        self.assertIs(compile_template(self.template), compiled)
+
+        self.template.subject = "Hi {{user_name}}"
+        resubjected = compile_template(self.template)
+        self.assertIsNot(resubjected, compiled)
+        self.assertIs(resubjected.body, compiled.body)
+
+        self.template.body = "Bye {{user_name}}"
+        self.assertIsNot(compile_template(self.template).body, compiled.body)
+
+
 class TemplateCacheTestCase(TemplateServiceTestCase):
     """Test cases for caching functionality"""
 
-    @patch("template_service.services.cache")
+    @patch("template_service.services.async_cache")
     def test_cache_hit_for_template_by_id(self, mock_cache):
         """Test cache hit when getting template by ID"""
         # Mock cache hit
-        mock_cache.get.return_value = self.template
+        mock_cache.get = AsyncMock(return_value=self.template)
 
-        result = TemplateService.get_template_by_id(str(self.template.id))
+        result = async_to_sync(TemplateService.aget_template_by_id)(
+            str(self.template.id)
+        )
 
         self.assertEqual(result, self.template)
         mock_cache.get.assert_called_once()
 
-    @patch("template_service.services.cache")
+    @patch("template_service.services.async_cache")
     def test_cache_miss_for_template_by_id(self, mock_cache):
         """Test cache miss when getting template by ID"""
         # Mock cache miss
-        mock_cache.get.return_value = None
+        mock_cache.get = AsyncMock(return_value=None)
+        mock_cache.set = AsyncMock()
 
-        result = TemplateService.get_template_by_id(str(self.template.id))
+        result = async_to_sync(TemplateService.aget_template_by_id)(
+            str(self.template.id)
+        )
 
         self.assertEqual(result, self.template)
         mock_cache.set.assert_called_once()
@@ -359,8 +1045,6 @@ class TemplateCacheTestCase(TemplateServiceTestCase):
     @patch("template_service.services.cache")
     def test_cache_invalidation_on_create(self, mock_cache):
         """Test cache invalidation on template creation"""
-        from template_service.schemas import CreateTemplate
-
         new_data = CreateTemplate(
             name="cache_test", category="email", body="Test body", language="en"
         )
@@ -373,8 +1057,6 @@ class TemplateCacheTestCase(TemplateServiceTestCase):
     @patch("template_service.services.cache")
     def test_cache_invalidation_on_update(self, mock_cache):
         """Test cache invalidation on template update"""
-        from template_service.schemas import UpdateTemplate
-
         update_data = UpdateTemplate(subject="Updated Subject")
 
         TemplateService.update_template(str(self.template.id), update_data)
@@ -382,10 +1064,33 @@ class TemplateCacheTestCase(TemplateServiceTestCase):
         # Verify cache delete was called
         mock_cache.delete_many.assert_called()
 
+    def test_list_cache_invalidated_by_generation_bump(self):
+        """Test writes move list caching to a new generation"""
+        query = TemplatesQuerySchema()
+        first = async_to_sync(TemplateService.aget_all_templates)(query)
+        generation = async_to_sync(TemplateService._alist_generation)()
+
+        TemplateService.create_template(
+            CreateTemplate(name="new_one", category="email", body="Body")
+        )
+
+        self.assertEqual(
+            async_to_sync(TemplateService._alist_generation)(), generation + 1
+        )
+        second = async_to_sync(TemplateService.aget_all_templates)(query)
+        self.assertEqual(second["meta"]["total"], first["meta"]["total"] + 1)
+
+    def test_list_generation_recovers_from_eviction(self):
+        """Test a lost generation is reseeded above every previous one"""
+        generation = async_to_sync(TemplateService._alist_generation)()
+        cache.delete(TemplateCacheKeys.template_list_generation())
+
+        self.assertGreater(
+            async_to_sync(TemplateService._alist_generation)(), generation
+        )
+
     def test_cache_keys_generation(self):
         """Test cache key generation methods"""
-        from template_service.services import TemplateCacheKeys
-
         # Test template_by_id key
         key = TemplateCacheKeys.template_by_id("test-id")
         self.assertEqual(key, "template:id:test-id")
@@ -399,6 +1104,710 @@ class TemplateCacheTestCase(TemplateServiceTestCase):
         self.assertEqual(key, "template:versions:test:email:en")
 
 
+class TemplateSnapshotTestCase(TemplateServiceTestCase):
+    """Test cases for cached render snapshots"""
+
+    def test_snapshot_round_trip(self):
+        """Test snapshots encode to primitives and decode unchanged"""
+        snapshot = TemplateSnapshot.from_model(self.template)
+        decoded = TemplateSnapshot.decode(snapshot.encode())
+
+        self.assertEqual(decoded.id, self.template.id)
+        self.assertEqual(decoded.body, self.template.body)
+        self.assertEqual(decoded.required_vars, frozenset({"user_name"}))
+        with self.assertRaises(AttributeError):
+            decoded.body = "changed"
+
+    def test_legacy_snapshot_without_body_hash_decodes(self):
+        """Test snapshots cached before body hashes existed still decode"""
+        encoded = TemplateSnapshot.from_model(self.template).encode()
+        decoded = TemplateSnapshot.decode(encoded[:-1])
+
+        self.assertEqual(decoded.body, self.template.body)
+        self.assertEqual(decoded.body_hash, self.template.body_hash)
+
+    def test_latest_template_cached_as_snapshot(self):
+        """Test the render path caches snapshots rather than model instances"""
+        latest = async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+
+        self.assertIsInstance(latest, TemplateSnapshot)
+        cached = cache.get(
+            TemplateCacheKeys.template_latest("welcome_email", "email", "en")
+        )
+        self.assertIsInstance(cached.value, tuple)
+        self.assertNotIn(self.template.created_at, cached.value)
+
+
+class TemplateL1CacheTestCase(TemplateServiceTestCase):
+    """Test cases for the in-process template cache"""
+
+    @patch("template_service.services.async_cache")
+    def test_l1_hit_skips_redis(self, mock_cache):
+        """Test repeated lookups are served from the in-process cache"""
+        mock_cache.get = AsyncMock(return_value=self.template)
+
+        async_to_sync(TemplateService.aget_template_by_id)(str(self.template.id))
+        result = async_to_sync(TemplateService.aget_template_by_id)(
+            str(self.template.id)
+        )
+
+        self.assertEqual(result, self.template)
+        mock_cache.get.assert_called_once()
+
+    def test_l1_lru_eviction_and_stats(self):
+        """Test least recently used entries are evicted at the size limit"""
+        l1 = TemplateL1Cache(max_entries=2, stamp_check_interval=60)
+        l1.set("a", 1)
+        l1.set("b", 2)
+        l1.get("a")
+        l1.set("c", 3)
+
+        self.assertIsNone(l1.get("b"))
+        self.assertEqual(l1.get("a"), 1)
+        stats = l1.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+    def test_l1_entries_expire(self):
+        """Test entries are dropped once their TTL passes"""
+        l1 = TemplateL1Cache(timeout=0, stamp_check_interval=60)
+        l1.set("a", 1)
+
+        self.assertIsNone(l1.get("a"))
+
+    def test_l1_invalidation_reaches_other_workers(self):
+        """Test invalidating in one worker clears another through the stamp"""
+        worker_a = TemplateL1Cache(stamp_check_interval=0)
+        worker_b = TemplateL1Cache(stamp_check_interval=0)
+        worker_a.set("template:id:1", "v1")
+        worker_b.set("template:id:1", "v1")
+        self.assertEqual(worker_b.get("template:id:1"), "v1")
+
+        worker_a.invalidate(["template:id:1"])
+
+        self.assertIsNone(worker_a.get("template:id:1"))
+        self.assertIsNone(worker_b.get("template:id:1"))
+
+
+class TemplateMissCoalescingTestCase(TemplateServiceTestCase):
+    """Test cases for single-flight cache miss loading and early refresh"""
+
+    def test_concurrent_misses_load_once(self):
+        coalescer = MissCoalescer()
+        calls = []
+        barrier = threading.Barrier(8)
+        results = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        def worker():
+            barrier.wait()
+            results.append(coalescer.load("key", loader, lambda: None))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_loader_errors_reach_waiters_and_are_not_cached(self):
+        coalescer = MissCoalescer()
+
+        def loader():
+            raise ValueError("not found")
+
+        with self.assertRaises(ValueError):
+            coalescer.load("key", loader, lambda: None)
+        self.assertEqual(coalescer.load("key", lambda: "value", lambda: None), "value")
+
+    def test_concurrent_async_misses_load_once(self):
+        coalescer = MissCoalescer()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def lookup():
+            return None
+
+        async def run():
+            return await asyncio.gather(
+                *(coalescer.aload("key", loader, lookup) for _ in range(5))
+            )
+
+        self.assertEqual(async_to_sync(run)(), ["value"] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_held_shared_lock_waits_for_other_process(self):
+        coalescer = MissCoalescer(lock_timeout=1, poll_interval=0.01)
+        cache.add(MissCoalescer.LOCK_PREFIX + "key", 1, 1)
+
+        result = coalescer.load("key", self.fail, lambda: "loaded elsewhere")
+
+        self.assertEqual(result, "loaded elsewhere")
+
+    def test_expired_shared_lock_falls_back_to_loading(self):
+        coalescer = MissCoalescer(lock_timeout=0.05, poll_interval=0.01)
+        cache.add(MissCoalescer.LOCK_PREFIX + "key", 1, 1)
+
+        self.assertEqual(coalescer.load("key", lambda: "value", lambda: None), "value")
+
+    def test_shared_lock_released_after_loading(self):
+        coalescer = MissCoalescer(lock_timeout=1)
+
+        coalescer.load("key", lambda: "value", lambda: None)
+
+        self.assertIsNone(cache.get(MissCoalescer.LOCK_PREFIX + "key"))
+
+    def test_should_refresh(self):
+        fresh = CachedValue.wrap("value", timeout=3600, delta=0.01)
+        expiring = CachedValue.wrap("value", timeout=-1, delta=0.01)
+
+        self.assertFalse(fresh.should_refresh(beta=1.0))
+        self.assertTrue(expiring.should_refresh(beta=1.0))
+        self.assertFalse(expiring.should_refresh(beta=0))
+
+    def test_entry_near_expiry_is_refreshed_early(self):
+        key = TemplateCacheKeys.template_latest("welcome_email", "email", "en")
+        snapshot = TemplateSnapshot.from_model(self.template)
+        cache.set(key, CachedValue.wrap(snapshot.encode(), timeout=-1, delta=0.01))
+
+        async_to_sync(TemplateService.aget_latest_template)(
+            "welcome_email", "email", "en"
+        )
+
+        self.assertGreater(cache.get(key).expires_at, time.time() + 60)
+
+    def test_unwrapped_legacy_entries_are_still_hits(self):
+        key = TemplateCacheKeys.template_by_id(str(self.template.id))
+        cache.set(key, self.template)
+
+        with self.assertNumQueries(0):
+            result = async_to_sync(TemplateService.aget_template_by_id)(
+                str(self.template.id)
+            )
+        self.assertEqual(result.id, self.template.id)
+
+
+class TemplateNegativeCacheTestCase(TemplateServiceTestCase):
+    """Test cases for render lookups through the cache and not-found markers"""
+
+    def setUp(self):
+        super().setUp()
+        self.negative_cache = NegativeCache(timeout=30)
+        patcher = patch("template_service.services.negative_cache", self.negative_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self, **reference):
+        return async_to_sync(TemplateService.arender_template)(
+            RenderTemplateRequest(context={"user_name": "Ada"}, **reference)
+        )
+
+    def test_render_by_id_uses_snapshot_cache(self):
+        """Test renders by id are served from the cached render snapshot"""
+        self.render(id=str(self.template.id))
+        template_l1_cache.clear()
+
+        with self.assertNumQueries(0):
+            result = self.render(id=str(self.template.id))
+        self.assertEqual(result["body"], "Hello Ada, welcome to our platform!")
+
+    def test_unknown_id_is_queried_once(self):
+        """Test a missing id reaches the database once, then the marker"""
+        missing = "00000000-0000-0000-0000-000000000000"
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                with self.assertRaises(Exception):
+                    self.render(id=missing)
+
+        self.assertEqual(self.negative_cache.stats()["stores"], 1)
+        self.assertEqual(self.negative_cache.stats()["hits"], 2)
+        self.assertIsNone(async_to_sync(TemplateService.aget_template_by_id)(missing))
+
+    def test_unknown_name_is_queried_once_per_process_and_redis(self):
+        """Test a missing name is answered from Redis after L1 is cleared"""
+        with self.assertRaises(ValueError):
+            async_to_sync(TemplateService.aget_latest_template)(
+                "missing", "email", "en"
+            )
+        template_l1_cache.clear()
+
+        with self.assertNumQueries(0):
+            with self.assertRaisesMessage(ValueError, "not found"):
+                async_to_sync(TemplateService.aget_latest_template)(
+                    "missing", "email", "en"
+                )
+        self.assertEqual(self.negative_cache.stats()["hits"], 1)
+
+    def test_creating_template_clears_marker(self):
+        """Test a family created after a miss is found immediately"""
+        with self.assertRaises(ValueError):
+            async_to_sync(TemplateService.aget_latest_template)(
+                "late_email", "email", "en"
+            )
+        TemplateService.create_template(
+            CreateTemplate(name="late_email", category="email", body="Hi")
+        )
+
+        snapshot = async_to_sync(TemplateService.aget_latest_template)(
+            "late_email", "email", "en"
+        )
+        self.assertEqual(snapshot.body, "Hi")
+
+    def test_malformed_id_is_not_found_without_query(self):
+        """Test ids that are not UUIDs never reach the database"""
+        with self.assertNumQueries(0):
+            with self.assertRaises(Exception) as ctx:
+                self.render(id="not-a-uuid")
+        self.assertIn("not-a-uuid", str(ctx.exception.detail))
+
+    def test_disabled_negative_cache_stores_nothing(self):
+        """Test a zero timeout turns negative caching off"""
+        self.negative_cache.timeout = 0
+        missing = "00000000-0000-0000-0000-000000000000"
+
+        with self.assertNumQueries(2):
+            async_to_sync(TemplateService.aget_template_by_id)(missing)
+            async_to_sync(TemplateService.aget_template_by_id)(missing)
+        self.assertEqual(self.negative_cache.stats()["stores"], 0)
+
+    def test_cache_stats_include_negative_cache(self):
+        """Test not-found marker counters are exposed over the API"""
+        async_to_sync(TemplateService.aget_template_by_id)(
+            "00000000-0000-0000-0000-000000000000"
+        )
+
+        response = TestClient(router).get("/cache/stats")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["negative"]["stores"], 1)
+
+
+class TemplateRenderCacheTestCase(TemplateServiceTestCase):
+    """Test cases for memoized render output"""
+
+    def setUp(self):
+        super().setUp()
+
+        self.render_cache = RenderCache(max_entries=10)
+        patcher = patch("template_service.services.render_cache", self.render_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self, **context):
+        return async_to_sync(TemplateService.arender_template)(
+            RenderTemplateRequest(
+                name="welcome_email", category="email", language="en", context=context
+            )
+        )
+
+    def test_repeated_render_is_served_from_cache(self):
+        """Test identical renders skip substitution and count as hits"""
+        first = self.render(user_name="Ada")
+        with patch("template_service.compiler.CompiledText.render") as mock_render:
+            second = self.render(user_name="Ada", unused="ignored")
+
+        mock_render.assert_not_called()
+        self.assertEqual(first["body"], second["body"])
+        self.assertEqual(self.render_cache.stats()["hits"], 1)
+
+    def test_new_version_renders_under_new_key(self):
+        """Test updating a template bypasses output cached for the old version"""
+        self.render(user_name="Ada")
+        TemplateService.update_template(
+            str(self.template.id), UpdateTemplate(body="Bye {{user_name}}")
+        )
+
+        self.assertEqual(self.render(user_name="Ada")["body"], "Bye Ada")
+        self.assertEqual(self.render_cache.stats()["hits"], 0)
+
+    def test_cache_stats_endpoint(self):
+        """Test cache statistics are exposed over the API"""
+        self.render(user_name="Ada")
+        self.render(user_name="Ada")
+
+        response = TestClient(router).get("/cache/stats")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["render"]["hits"], 1)
+        self.assertEqual(response.json()["data"]["render"]["hit_rate"], 0.5)
+
+
+class TemplateMetricsTestCase(TemplateServiceTestCase):
+    """Test cases for the Prometheus metrics registry and endpoint"""
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def scrape(self) -> str:
+        response = self.client_class().get("/api/v1/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_exposition_format(self):
+        """Test counters and cumulative histogram buckets are exposed"""
+        counter = Counter("test_total", "Test counter", ["kind"])
+        histogram = Histogram("test_seconds", "Test histogram", buckets=(0.1, 1))
+        counter.labels('say "hi"').inc(2)
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        lines = counter.expose() + histogram.expose()
+
+        self.assertIn('test_total{kind="say \\"hi\\""} 2.0', lines)
+        self.assertIn('test_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("test_seconds_count 2", lines)
+
+    def test_label_cardinality_is_bounded(self):
+        """Test label values past max_series share one overflow series"""
+        counter = Counter("bounded_total", "Test counter", ["template"], max_series=2)
+        for name in ("a", "b", "c", "d"):
+            counter.labels(name).inc()
+
+        self.assertEqual(
+            counter.expose()[2:],
+            [
+                'bounded_total{template="__other__"} 2.0',
+                'bounded_total{template="a"} 1.0',
+                'bounded_total{template="b"} 1.0',
+            ],
+        )
+
+    def test_render_metrics(self):
+        """Test renders are timed by resolution path and counted per template"""
+        context = {"user_name": "Ada"}
+        async_to_sync(TemplateService.arender_template)(
+            RenderTemplateRequest(id=str(self.template.id), context=context)
+        )
+        async_to_sync(TemplateService.arender_template)(
+            RenderTemplateRequest(
+                name="welcome_email", category="email", context=context
+            )
+        )
+
+        body = self.scrape()
+        self.assertIn('template_render_seconds_count{path="id",mode="single"} 1', body)
+        self.assertIn(
+            'template_render_seconds_count{path="name",mode="single"} 1', body
+        )
+        self.assertIn('template_renders_total{template="welcome_email"} 2.0', body)
+
+    def test_batch_renders_count_successful_items(self):
+        """Test batch and streamed renders count only the contexts that render"""
+        payload = BatchRenderTemplateRequest(
+            id=str(self.template.id), contexts=[{"user_name": "Ada"}, {}]
+        )
+        async_to_sync(TemplateService.arender_batch)(payload)
+
+        async def stream():
+            items = await TemplateService.astream_render_batch(payload)
+            return [item async for item in items]
+
+        async_to_sync(stream)()
+
+        self.assertIn(
+            'template_renders_total{template="welcome_email"} 2.0', self.scrape()
+        )
+
+    def test_cache_tier_metrics(self):
+        """Test lookups are counted per cache tier"""
+        async_to_sync(TemplateService.aget_template_by_id)(str(self.template.id))
+        async_to_sync(TemplateService.aget_template_by_id)(str(self.template.id))
+
+        body = self.scrape()
+        self.assertIn('template_cache_requests_total{tier="l1",result="hit"} 1.0', body)
+        self.assertIn('template_cache_requests_total{tier="redis",result="miss"}', body)
+
+    def test_invalidation_is_timed(self):
+        """Test template writes observe invalidation durations"""
+        TemplateService.update_template(
+            str(self.template.id), UpdateTemplate(body="Bye {{user_name}}")
+        )
+
+        self.assertIn("template_cache_invalidation_seconds_count 1", self.scrape())
+
+    def test_db_queries_per_request(self):
+        """Test the middleware counts queries per request route"""
+        self.client_class().get(
+            f"/api/v1/template-service/templates/{self.template.id}"
+        )
+
+        self.assertIn(
+            "template_db_queries_per_request_sum"
+            '{route="api/v1/template-service/templates/<template_id>"} 1.0',
+            self.scrape(),
+        )
+
+    def test_gauge_exposition(self):
+        """Test gauges expose the last value set"""
+        gauge = Gauge("test_connections", "Test gauge", ["state"])
+        gauge.labels("idle").set(3)
+        gauge.labels("idle").set(2)
+
+        self.assertEqual(
+            gauge.expose(),
+            [
+                "# HELP test_connections Test gauge",
+                "# TYPE test_connections gauge",
+                'test_connections{state="idle"} 2.0',
+            ],
+        )
+
+    def test_db_pool_metrics(self):
+        """Test psycopg pool stats are sampled and their counters accumulated"""
+        pool = MagicMock(max_size=10)
+        pool.pop_stats.return_value = {
+            "pool_max": 10,
+            "pool_size": 4,
+            "pool_available": 1,
+            "requests_waiting": 2,
+            "requests_num": 50,
+            "requests_queued": 5,
+            "requests_wait_ms": 1500,
+        }
+        with patch.object(
+            connections["default"],
+            "_connection_pools",
+            {"default": pool},
+            create=True,
+        ):
+            registry.expose()
+            body = registry.expose()
+
+        self.assertIn(
+            'template_db_pool_connections{database="default",state="in_use"} 3.0',
+            body,
+        )
+        self.assertIn('template_db_pool_utilization{database="default"} 0.3', body)
+        self.assertIn('template_db_pool_requests_waiting{database="default"} 2.0', body)
+        self.assertIn(
+            'template_db_pool_requests_total{database="default",result="queued"} 10.0',
+            body,
+        )
+        self.assertIn(
+            'template_db_pool_wait_seconds_total{database="default"} 3.0', body
+        )
+
+    def test_redis_pool_metrics(self):
+        """Test Redis pool usage is sampled from the cache's clients"""
+
+        def connection(**kwargs):
+            return MagicMock(pid=os.getpid(), **{"can_read.return_value": False})
+
+        pool = redis.BlockingConnectionPool(
+            max_connections=4, connection_class=connection
+        )
+        pool.get_connection()
+        pool.release(pool.get_connection())
+        with patch.object(
+            async_cache, "connection_pools", return_value={"sync": [pool]}
+        ):
+            body = registry.expose()
+
+        self.assertIn(
+            'template_redis_pool_connections{client="sync",state="in_use"} 1.0', body
+        )
+        self.assertIn(
+            'template_redis_pool_connections{client="sync",state="idle"} 1.0', body
+        )
+        self.assertIn('template_redis_pool_utilization{client="sync"} 0.25', body)
+
+
+class TemplateProfilingTestCase(TemplateServiceTestCase):
+    """Test cases for request phase timings and sampled cProfile dumps"""
+
+    def render_request(self):
+        return self.client_class().post(
+            "/api/v1/template-service/templates/render",
+            {"id": str(self.template.id), "context": {"user_name": "Ada"}},
+            content_type="application/json",
+        )
+
+    def test_phase_is_noop_outside_profiled_request(self):
+        """Test phases cost a shared no-op when profiling is off"""
+        self.assertIs(profiling.phase("resolve"), profiling.phase("substitute"))
+
+    def test_render_phases_are_recorded(self):
+        """Test a render records resolve, validate and substitute phases"""
+        with profiling.profile_request() as profile:
+            async_to_sync(TemplateService.arender_template)(
+                RenderTemplateRequest(
+                    id=str(self.template.id), context={"user_name": "Ada"}
+                )
+            )
+
+        self.assertEqual(set(profile.phases), {"resolve", "validate", "substitute"})
+
+    def test_middleware_removed_when_disabled(self):
+        """Test the middleware takes itself out of the stack by default"""
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
+
+    def test_slow_request_log(self):
+        """Test requests over the threshold log their phases as JSON"""
+        with self.settings(TEMPLATE_PROFILING=True, TEMPLATE_SLOW_REQUEST_MS=0):
+            with self.assertLogs("template_service.middleware", "WARNING") as logs:
+                response = self.render_request()
+
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(logs.output[0].split("Slow request: ", 1)[1])
+        self.assertEqual(record["route"], "api/v1/template-service/templates/render")
+        self.assertEqual(
+            set(record["phases_ms"]),
+            {"parse", "resolve", "validate", "substitute", "serialize"},
+        )
+
+    def test_sampled_cprofile_dump(self):
+        """Test sampled requests to the configured path are dumped"""
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with self.settings(
+                TEMPLATE_PROFILING=True,
+                TEMPLATE_PROFILE_PATH="/api/v1/template-service/templates/render",
+                TEMPLATE_PROFILE_SAMPLE_RATE=1,
+                TEMPLATE_PROFILE_DIR=profile_dir,
+            ):
+                self.render_request()
+                self.client_class().get("/api/v1/metrics")
+
+            dumps = os.listdir(profile_dir)
+            self.assertEqual(len(dumps), 1)
+            self.assertTrue(dumps[0].startswith("api_v1_template-service_templates"))
+            pstats.Stats(os.path.join(profile_dir, dumps[0]))
+
+
+class TemplateRenderWorkerTestCase(TemplateServiceTestCase):
+    """Test cases for the pre-render worker against the in-memory broker"""
+
+    def setUp(self):
+        super().setUp()
+        self.broker = InMemoryBroker()
+        for channel in ("email", "push", "failed"):
+            self.broker.declare(f"{channel}.queue", EXCHANGE, channel)
+        self.worker = RenderWorker(self.broker, batch_size=10)
+        self.worker.setup()
+        self.publish = lambda body: self.broker.publish(
+            EXCHANGE,
+            RENDER_ROUTING_KEY,
+            body if isinstance(body, bytes) else json.dumps(body).encode(),
+        )
+        Template.objects.create(
+            name="welcome_email",
+            category="push",
+            subject="Hi {{user_name}}",
+            body="{{user_name}} joined",
+        )
+
+    def message(self, notification_type="email", **fields):
+        return {
+            "notification_type": notification_type,
+            "template_code": "welcome_email",
+            "variables": {"user_name": "Ada"},
+            "request_id": "req-1",
+            "user_id": "user-1",
+            **fields,
+        }
+
+    def drain(self, queue):
+        return [json.loads(body) for body in self.broker.queues.pop(queue, [])]
+
+    def test_renders_and_routes_by_channel(self):
+        """Test messages are rendered and published to their channel queue"""
+        self.publish(self.message(variables={"user_name": "Ada"}))
+        self.publish(self.message(variables={"user_name": "Grace"}))
+        self.publish(self.message("push"))
+
+        self.worker.run(max_batches=1)
+
+        emails = self.drain("email.queue")
+        self.assertEqual(
+            [email["rendered"]["body"] for email in emails],
+            [
+                "Hello Ada, welcome to our platform!",
+                "Hello Grace, welcome to our platform!",
+            ],
+        )
+        self.assertEqual(emails[0]["request_id"], "req-1")
+        self.assertEqual(emails[0]["user_id"], "user-1")
+        self.assertEqual(emails[0]["rendered"]["template_id"], str(self.template.id))
+        self.assertEqual(self.drain("push.queue")[0]["rendered"]["body"], "Ada joined")
+        self.assertEqual(self.broker.unacked, {})
+
+    def test_one_resolution_per_template(self):
+        """Test a batch resolves each template once"""
+        for index in range(5):
+            self.publish(self.message(request_id=f"req-{index}"))
+        self.publish(self.message("push"))
+
+        with (
+            patch.object(
+                TemplateService,
+                "resolve_templates",
+                wraps=TemplateService.resolve_templates,
+            ) as resolve,
+            self.assertNumQueries(1),
+        ):
+            result = self.worker.process_batch(
+                self.broker.get_batch("template.render.queue", 10, 0)
+            )
+
+        self.assertEqual(resolve.call_count, 1)
+        self.assertEqual(len(resolve.call_args.args[0]), 2)
+        self.assertEqual(result, {"rendered": 6, "failed": 0, "templates": 2})
+
+    def test_failures_go_to_failed_queue(self):
+        """Test unparseable, unknown and incomplete messages are failed"""
+        self.publish(b"not json")
+        self.publish({"template_code": "welcome_email"})
+        self.publish(self.message(template_code="missing_template"))
+        self.publish(self.message(variables={}))
+        self.publish(self.message())
+
+        self.worker.run(max_batches=1)
+
+        failed = self.drain("failed.queue")
+        self.assertEqual(len(failed), 4)
+        self.assertTrue(all(set(f) == {"message", "raw", "error"} for f in failed))
+        self.assertEqual((failed[0]["message"], failed[0]["raw"]), (None, "not json"))
+        self.assertEqual(failed[1]["message"], {"template_code": "welcome_email"})
+        self.assertIsNone(failed[1]["raw"])
+        self.assertIn("not found", failed[2]["error"])
+        self.assertEqual(failed[2]["message"]["template_code"], "missing_template")
+        self.assertIn("user_name", failed[3]["error"])
+        self.assertEqual(len(self.drain("email.queue")), 1)
+        self.assertEqual(self.broker.unacked, {})
+
+    def test_batch_is_redelivered_when_publishing_fails(self):
+        """Test a batch is only acknowledged after all results are published"""
+        self.publish(self.message(request_id="req-1"))
+        self.publish(self.message(request_id="req-2"))
+
+        with patch.object(self.broker, "publish", side_effect=ConnectionError):
+            with self.assertRaises(ConnectionError):
+                self.worker.run(max_batches=1)
+        self.broker.recover()
+
+        self.worker.run(max_batches=1)
+        self.assertEqual(
+            [email["request_id"] for email in self.drain("email.queue")],
+            ["req-1", "req-2"],
+        )
+
+
 class TemplateModelTestCase(TemplateServiceTestCase):
     """Test cases for Template model"""
 
@@ -412,6 +1821,26 @@ class TemplateModelTestCase(TemplateServiceTestCase):
         latest = self.template.get_latest_version()
         self.assertEqual(latest.id, self.template.id)
 
+    def test_template_get_latest_version_skips_inactive_versions(self):
+        """Test get_latest_version ignores inactive versions without a head"""
+        Template.objects.create(
+            **{**self.template_data, "version": 2, "is_active": False}
+        )
+
+        self.assertEqual(self.template.get_latest_version().id, self.template.id)
+
+    def test_template_get_latest_version_skips_inactive_head(self):
+        """Test get_latest_version falls back when the head is inactive"""
+        template = TemplateService.create_template(
+            CreateTemplate(name="welcome_email", category="email", body="v2")
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(self.template.get_latest_version().id, template.id)
+
+        Template.objects.filter(id=template.id).update(is_active=False)
+
+        self.assertEqual(self.template.get_latest_version().id, self.template.id)
+
     def test_template_unique_constraint(self):
         """Test unique constraint on name, category, language, version"""
         # This should raise an IntegrityError due to unique constraint
@@ -439,3 +1868,423 @@ class TemplateModelTestCase(TemplateServiceTestCase):
         self.assertFalse(
             Template.objects.filter(id=template_id, is_deleted=False).exists()
         )
+
+
+class TemplateBodyTestCase(TemplateServiceTestCase):
+    """Test cases for content-addressed template bodies"""
+
+    def test_identical_bodies_are_stored_once(self):
+        """Test languages and versions sharing a body reference one row"""
+        french = TemplateService.create_template(
+            CreateTemplate(**{**self.template_data, "language": "fr"})
+        )
+        updated = TemplateService.update_template(
+            str(self.template.id), UpdateTemplate(subject="Hi {{user_name}}")
+        )
+
+        self.assertEqual(TemplateBody.objects.count(), 1)
+        self.assertEqual(french.body_hash, self.template.body_hash)
+        self.assertEqual(updated.body_hash, self.template.body_hash)
+        self.assertEqual(updated.body, self.template.body)
+
+    def test_admin_form_edits_body_text(self):
+        """Test the admin form shows and saves the body, not its hash"""
+        data = {
+            **self.template_data,
+            "context": '["user_name"]',
+            "placeholders": "[]",
+            "version": 1,
+            "is_active": True,
+        }
+        form = TemplateAdminForm(instance=self.template)
+        self.assertEqual(form["body"].initial, self.template.body)
+        self.assertNotIn("body_ref", form.fields)
+
+        form = TemplateAdminForm(
+            {**data, "body": "Bye {{user_name}}"}, instance=self.template
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        template = form.save()
+
+        template.refresh_from_db()
+        self.assertEqual(template.body, "Bye {{user_name}}")
+        self.assertEqual(TemplateBody.objects.count(), 2)
+
+    def test_changed_body_stores_new_row(self):
+        """Test a body update adds a row and keeps the old version's body"""
+        updated = TemplateService.update_template(
+            str(self.template.id), UpdateTemplate(body="Bye {{user_name}}")
+        )
+
+        self.assertEqual(TemplateBody.objects.count(), 2)
+        self.assertEqual(updated.body_hash, TemplateBody.hash_of("Bye {{user_name}}"))
+        self.template.refresh_from_db()
+        self.assertEqual(
+            self.template.body, "Hello {{user_name}}, welcome to our platform!"
+        )
+
+    def test_bulk_import_deduplicates_bodies(self):
+        """Test bulk imports store each distinct body once"""
+        payloads = [
+            CreateTemplate(name=f"import_{i}", category="email", body="Shared body")
+            for i in range(5)
+        ]
+        TemplateService.bulk_import_templates(payloads)
+
+        self.assertEqual(TemplateBody.objects.count(), 2)
+        imported = Template.objects.filter(name__startswith="import_")
+        self.assertEqual(
+            set(imported.values_list("body_ref_id", flat=True)),
+            {TemplateBody.hash_of("Shared body")},
+        )
+
+    def test_render_cache_is_shared_across_identical_bodies(self):
+        """Test renders of another language with the same content hit the cache"""
+        TemplateService.create_template(
+            CreateTemplate(**{**self.template_data, "language": "fr"})
+        )
+        render_cache = RenderCache(max_entries=10)
+        with patch("template_service.services.render_cache", render_cache):
+            for language in ("en", "fr"):
+                async_to_sync(TemplateService.arender_template)(
+                    RenderTemplateRequest(
+                        name="welcome_email",
+                        category="email",
+                        language=language,
+                        context={"user_name": "Ada"},
+                    )
+                )
+
+        self.assertEqual(render_cache.stats()["hits"], 1)
+
+    def test_template_response_includes_body(self):
+        """Test API responses still carry the body text"""
+        response = self.client.get(f"/templates/{self.template.id}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["body"], self.template.body)
+
+
+class TemplatePlaceholderTestCase(TemplateServiceTestCase):
+    """Test cases for placeholders extracted when templates are written"""
+
+    def test_placeholders_stored_on_create(self):
+        """Test subject and body placeholders are stored with the row"""
+        template = TemplateService.create_template(
+            CreateTemplate(
+                name="order_shipped",
+                category="email",
+                subject="Order {{order_id}}",
+                body="Hi {{user_name}}, {{order_id}} has shipped",
+                context=["user_name", "order_id"],
+            )
+        )
+
+        template.refresh_from_db()
+        self.assertEqual(template.placeholders, ["order_id", "user_name"])
+
+    def test_placeholders_follow_body_edits(self):
+        """Test rows saved directly, as the admin does, keep placeholders current"""
+        self.assertEqual(self.template.placeholders, ["user_name"])
+
+        self.template.body = "Bye {{first_name}}"
+        self.template.save()
+
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.placeholders, ["first_name", "user_name"])
+
+    def test_snapshot_reads_stored_placeholders(self):
+        """Test snapshots take placeholders from the row instead of the body"""
+        Template.objects.filter(id=self.template.id).update(placeholders=["stored"])
+        template = Template.objects.select_related("body_ref").get(id=self.template.id)
+
+        snapshot = TemplateSnapshot.from_model(template)
+        self.assertEqual(snapshot.placeholders, ("stored",))
+        decoded = TemplateSnapshot.decode(snapshot.encode())
+        self.assertEqual(decoded.placeholders, ("stored",))
+        legacy = TemplateSnapshot.decode(snapshot.encode()[:-1])
+        self.assertEqual(legacy.placeholders, ("user_name",))
+
+    def test_undeclared_placeholder_rejected(self):
+        """Test writes fail when the body uses a variable missing from context"""
+        with self.assertRaises(TemplateError) as ctx:
+            TemplateService.create_template(
+                CreateTemplate(
+                    name="broken",
+                    category="email",
+                    body="Hi {{user_nmae}}",
+                    context=["user_name"],
+                )
+            )
+        self.assertIn("user_nmae", str(ctx.exception))
+        self.assertFalse(Template.objects.filter(name="broken").exists())
+
+        with self.assertRaises(TemplateError):
+            TemplateService.update_template(
+                str(self.template.id), UpdateTemplate(body="Bye {{company}}")
+            )
+        self.assertEqual(Template.objects.filter(name="welcome_email").count(), 1)
+
+    def test_create_endpoint_reports_undeclared_placeholders(self):
+        """Test the API returns 400 with the undeclared variables"""
+        response = self.client.post(
+            "/templates",
+            json={
+                "name": "broken",
+                "category": "email",
+                "body": "Hi {{first}}",
+                "context": ["name"],
+            },
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("first", response.json()["message"])
+
+    def test_template_without_context_is_not_checked(self):
+        """Test templates that declare no context are stored as before"""
+        template = TemplateService.create_template(
+            CreateTemplate(name="free_form", category="email", body="Hi {{anyone}}")
+        )
+
+        self.assertEqual(template.placeholders, ["anyone"])
+
+    def test_template_without_context_warns_about_placeholders(self):
+        """Test variables used without a declared context are logged"""
+        with self.assertLogs("template_service.services", "WARNING") as logs:
+            TemplateService.create_template(
+                CreateTemplate(name="free_form", category="email", body="Hi {{anyone}}")
+            )
+
+        self.assertIn("declares no context for its variables: anyone", logs.output[0])
+
+    def test_update_endpoint_reports_undeclared_placeholders(self):
+        """Test a PATCH with an undeclared variable returns 400, not 404"""
+        response = self.client.patch(
+            f"/templates/{self.template.id}", json={"body": "Bye {{company}}"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("company", response.json()["message"])
+
+    def test_bulk_import_rejects_undeclared_placeholders(self):
+        """Test one broken template fails the whole import"""
+        payloads = [
+            CreateTemplate(
+                name="good", category="email", body="Hi {{name}}", context=["name"]
+            ),
+            CreateTemplate(
+                name="bad", category="email", body="Hi {{nmae}}", context=["name"]
+            ),
+        ]
+        with self.assertRaises(TemplateError) as ctx:
+            TemplateService.bulk_import_templates(payloads)
+
+        self.assertIn("Template 1 (bad)", str(ctx.exception))
+        self.assertFalse(Template.objects.filter(name="good").exists())
+
+
+class TemplateLanguageFallbackTestCase(TemplateServiceTestCase):
+    """Test cases for resolving renders through language fallback chains"""
+
+    def setUp(self):
+        super().setUp()
+        self.negative_cache = NegativeCache(timeout=30)
+        patcher = patch("template_service.services.negative_cache", self.negative_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self, language, **reference):
+        return async_to_sync(TemplateService.arender_template)(
+            RenderTemplateRequest(
+                name="welcome_email",
+                category="email",
+                language=language,
+                context={"user_name": "Ada"},
+                **reference,
+            )
+        )
+
+    def create(self, language, body):
+        return TemplateService.create_template(
+            CreateTemplate(**{**self.template_data, "language": language, "body": body})
+        )
+
+    def test_language_chain(self):
+        """Test chains drop subtags one at a time, then use the fallback"""
+        self.assertEqual(language_chain("fr-CA", "en"), ("fr-CA", "fr", "en"))
+        self.assertEqual(
+            language_chain("zh_Hant_TW", "en"), ("zh_Hant_TW", "zh-Hant", "zh", "en")
+        )
+        self.assertEqual(language_chain("en-GB", "en"), ("en-GB", "en"))
+        self.assertEqual(language_chain("fr", ""), ("fr",))
+
+    def test_falls_back_to_default_language(self):
+        """Test a locale without templates renders the default language"""
+        result = self.render("fr-CA")
+
+        self.assertEqual(result["language"], "en")
+        self.assertEqual(result["body"], "Hello Ada, welcome to our platform!")
+
+    def test_prefers_most_specific_language(self):
+        """Test the first language of the chain with a template wins"""
+        self.create("fr", "Bonjour {{user_name}}")
+
+        self.assertEqual(self.render("fr-CA")["body"], "Bonjour Ada")
+        self.create("fr-CA", "Allô {{user_name}}")
+        self.assertEqual(self.render("fr-CA")["body"], "Allô Ada")
+
+    def test_cold_chain_resolves_in_one_query(self):
+        """Test a cold lookup reads every language of the chain in one query"""
+        with self.assertNumQueries(1):
+            self.render("fr-CA")
+
+        template_l1_cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render("fr-CA")["language"], "en")
+
+    def test_resolved_chain_is_cached(self):
+        """Test repeat lookups go straight to the resolved language"""
+        self.render("fr-CA")
+
+        with patch.object(TemplateService, "_first_in_chain") as first_in_chain:
+            with self.assertNumQueries(0):
+                self.render("fr-CA")
+        first_in_chain.assert_not_called()
+        self.assertEqual(
+            cache.get(TemplateCacheKeys.template_chain("welcome_email", "email")),
+            {"fr-CA": "en"},
+        )
+
+    def test_unknown_template_is_negatively_cached(self):
+        """Test a name missing in every language is not queried again"""
+        request = RenderTemplateRequest(
+            name="missing", category="email", language="fr-CA", context={}
+        )
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                with self.assertRaises(TemplateError) as ctx:
+                    async_to_sync(TemplateService.arender_template)(request)
+                self.assertIn("fr-CA, fr, en", ctx.exception.detail)
+
+    def test_fallback_can_be_disabled(self):
+        """Test fallback=False only looks up the requested language"""
+        with self.assertRaises(TemplateError):
+            self.render("fr-CA", fallback=False)
+
+    async def test_async_resolution_matches_sync(self):
+        """Test async renders resolve chains the same way"""
+        await sync_to_async(self.create)("fr", "Bonjour {{user_name}}")
+        result = await TemplateService.arender_template(
+            RenderTemplateRequest(
+                name="welcome_email",
+                category="email",
+                language="fr-CA",
+                context={"user_name": "Ada"},
+            )
+        )
+
+        self.assertEqual(result["language"], "fr")
+        self.assertEqual(result["body"], "Bonjour Ada")
+
+
+class TemplateBulkResolutionTestCase(TemplateServiceTestCase):
+    """Test cases for resolving many templates in one cache round trip"""
+
+    def setUp(self):
+        super().setUp()
+        self.negative_cache = NegativeCache(timeout=30)
+        patcher = patch("template_service.services.negative_cache", self.negative_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.other = Template.objects.create(
+            **{**self.template_data, "name": "goodbye_email"}
+        )
+
+    def reference(self, **fields):
+        return TemplateReference(**fields)
+
+    def test_ids_resolve_with_one_query_then_from_cache(self):
+        """Test cold ids load in one query and are written back to the cache"""
+        references = [
+            self.reference(id=str(self.template.id)),
+            self.reference(id=str(self.other.id)),
+        ]
+
+        with self.assertNumQueries(1):
+            snapshots = TemplateService.resolve_templates(references)
+        self.assertEqual(snapshots[1].name, "goodbye_email")
+
+        template_l1_cache.clear()
+        with (
+            self.assertNumQueries(0),
+            patch.object(cache, "get_many", wraps=cache.get_many) as get_many,
+        ):
+            snapshots = TemplateService.resolve_templates(references)
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(snapshots[0].name, "welcome_email")
+
+    def test_ids_resolve_to_cached_snapshots(self):
+        """Test id references cache encoded snapshots shared with renders by id"""
+        template_id = str(self.template.id)
+        key = TemplateCacheKeys.template_snapshot_by_id(template_id)
+
+        with self.assertNumQueries(1):
+            (snapshot,) = TemplateService.resolve_templates(
+                [self.reference(id=template_id)]
+            )
+        self.assertEqual(cache.get(key).value, snapshot.encode())
+
+        template_l1_cache.clear()
+        with self.assertNumQueries(0):
+            cached = async_to_sync(TemplateService.aget_snapshot_by_id)(template_id)
+        self.assertEqual(cached.encode(), snapshot.encode())
+
+    def test_unknown_ids_are_negatively_cached(self):
+        """Test unknown ids resolve to errors and malformed ids skip the database"""
+        unknown = "00000000-0000-0000-0000-000000000000"
+
+        with self.assertNumQueries(1):
+            results = TemplateService.resolve_templates(
+                [self.reference(id=unknown), self.reference(id="not-a-uuid")]
+            )
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+        with self.assertNumQueries(0):
+            TemplateService.resolve_templates([self.reference(id=unknown)])
+        self.assertEqual(self.negative_cache.hits, 1)
+
+    def test_names_resolve_through_fallback_in_one_query(self):
+        """Test name references of several families load in one query"""
+        references = [
+            self.reference(name="welcome_email", category="email", language="fr-CA"),
+            self.reference(name="goodbye_email", category="email", language="en"),
+            self.reference(
+                name="welcome_email", category="email", language="fr", fallback=False
+            ),
+        ]
+
+        with self.assertNumQueries(1):
+            results = TemplateService.resolve_templates(references)
+
+        self.assertEqual(results[0].id, self.template.id)
+        self.assertEqual(results[1].id, self.other.id)
+        self.assertIsInstance(results[2], ValueError)
+        self.assertIn("fr) not found", str(results[2]))
+        with self.assertNumQueries(0):
+            TemplateService.resolve_templates(references)
+
+    def test_mixed_references_keep_their_order(self):
+        """Test results line up with references, with errors in place"""
+        missing = "00000000-0000-0000-0000-000000000000"
+        results = TemplateService.resolve_templates(
+            [
+                self.reference(name="goodbye_email", category="email"),
+                self.reference(id=missing),
+                self.reference(id=str(self.template.id)),
+            ]
+        )
+
+        self.assertIsInstance(results[0], TemplateSnapshot)
+        self.assertEqual(results[0].name, "goodbye_email")
+        self.assertEqual(str(results[1]), f"Template with ID '{missing}' not found")
+        self.assertEqual(results[2].name, "welcome_email")
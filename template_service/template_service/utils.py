@@ -1,3 +1,17 @@
+import json
+
+from django.http import HttpResponse, StreamingHttpResponse
+from ninja.responses import NinjaJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - a dependency; kept for benchmarks
+    orjson = None
+
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
 def schema_to_dict(schema) -> dict:
     if not schema:
         return {}
@@ -6,3 +20,47 @@ def schema_to_dict(schema) -> dict:
     elif isinstance(schema, dict):
         return {k: v for k, v in schema.items() if v is not None}
     return {}
+
+
+def dump_json(data) -> bytes:
+    """Encode JSON with orjson when installed, else with Ninja's encoder"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=NinjaJSONEncoder).encode()
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """
+    Encode a response body directly, skipping response schema validation
+
+    Only for payloads the service builds itself in the shape of the
+    operation's documented response schema, which keeps documenting it.
+    """
+    return HttpResponse(dump_json(data), status=status, content_type=JSON_CONTENT_TYPE)
+
+
+def wants_ndjson(request) -> bool:
+    return NDJSON_CONTENT_TYPE in request.headers.get("Accept", "")
+
+
+def _ndjson_line(row) -> str:
+    return json.dumps(row, cls=NinjaJSONEncoder) + "\n"
+
+
+def ndjson_response(rows) -> StreamingHttpResponse:
+    """
+    Stream rows as newline-delimited JSON, serializing each one lazily
+
+    Accepts sync or async iterables; under ASGI only async iterables are
+    streamed without being buffered first.
+    """
+    if hasattr(rows, "__aiter__"):
+
+        async def lines():
+            async for row in rows:
+                yield _ndjson_line(row)
+
+        return StreamingHttpResponse(lines(), content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(
+        (_ndjson_line(row) for row in rows), content_type=NDJSON_CONTENT_TYPE
+    )
@@ -0,0 +1,278 @@
+import itertools
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, NamedTuple, Optional
+
+from django.db import close_old_connections
+from pydantic import ValidationError
+
+from template_service.metrics import render_seconds, template_renders_total
+from template_service.schemas import NotificationMessage, TemplateReference
+from template_service.services import TemplateService
+
+try:
+    import pika
+except ImportError:  # pragma: no cover - only needed against a real broker
+    pika = None
+
+logger = logging.getLogger(__name__)
+
+# Topology shared with the channel services (email_service/src/bootstrap)
+EXCHANGE = "notifications.direct"
+RENDER_QUEUE = "template.render.queue"
+RENDER_ROUTING_KEY = "render"
+FAILED_ROUTING_KEY = "failed"
+
+
+class Delivery(NamedTuple):
+    delivery_tag: int
+    body: bytes
+
+
+class InMemoryBroker:
+    """
+    Stand-in for RabbitMQ with direct exchange routing and manual acks.
+
+    Unacknowledged deliveries are requeued by ``recover``, like a broker
+    does when a consumer's channel closes.
+    """
+
+    def __init__(self):
+        self.queues: Dict[str, deque] = defaultdict(deque)
+        self.bindings: Dict[tuple, List[str]] = defaultdict(list)
+        self.unacked: Dict[int, tuple] = {}
+        self._tags = itertools.count(1)
+
+    def declare(self, queue: str, exchange: str, routing_key: str) -> None:
+        if queue not in self.bindings[(exchange, routing_key)]:
+            self.bindings[(exchange, routing_key)].append(queue)
+
+    def publish(
+        self, exchange: str, routing_key: str, body: bytes, priority: int = 0
+    ) -> None:
+        for queue in self.bindings.get((exchange, routing_key), ()):
+            self.queues[queue].append(body)
+
+    def get_batch(self, queue: str, max_count: int, timeout: float) -> List[Delivery]:
+        messages = self.queues[queue]
+        batch = []
+        while messages and len(batch) < max_count:
+            body = messages.popleft()
+            tag = next(self._tags)
+            self.unacked[tag] = (queue, body)
+            batch.append(Delivery(tag, body))
+        return batch
+
+    def ack(self, delivery_tag: int, multiple: bool = False) -> None:
+        tags = (
+            [t for t in self.unacked if t <= delivery_tag]
+            if multiple
+            else [delivery_tag]
+        )
+        for tag in tags:
+            self.unacked.pop(tag, None)
+
+    def recover(self) -> None:
+        for tag in sorted(self.unacked, reverse=True):
+            queue, body = self.unacked.pop(tag)
+            self.queues[queue].appendleft(body)
+
+    def close(self) -> None:
+        self.recover()
+
+
+class PikaBroker:
+    """RabbitMQ over a blocking pika connection, prefetching ``prefetch`` messages"""
+
+    def __init__(self, url: str, prefetch: int):
+        if pika is None:
+            raise RuntimeError("The render worker needs pika: pip install pika")
+        self.connection = pika.BlockingConnection(pika.URLParameters(url))
+        self.channel = self.connection.channel()
+        self.channel.basic_qos(prefetch_count=prefetch)
+
+    def declare(self, queue: str, exchange: str, routing_key: str) -> None:
+        self.channel.exchange_declare(exchange, "direct", durable=False)
+        self.channel.queue_declare(
+            queue, durable=True, arguments={"x-max-priority": 10}
+        )
+        self.channel.queue_bind(queue, exchange, routing_key)
+
+    def publish(
+        self, exchange: str, routing_key: str, body: bytes, priority: int = 0
+    ) -> None:
+        self.channel.basic_publish(
+            exchange,
+            routing_key,
+            body,
+            properties=pika.BasicProperties(
+                content_type="application/json", delivery_mode=2, priority=priority
+            ),
+        )
+
+    def get_batch(self, queue: str, max_count: int, timeout: float) -> List[Delivery]:
+        """
+        Wait up to ``timeout`` for a first message, then take the messages
+        already prefetched by this consumer, up to ``max_count``
+        """
+        batch = []
+        for method, _properties, body in self.channel.consume(
+            queue, inactivity_timeout=timeout
+        ):
+            if method is None:
+                break
+            batch.append(Delivery(method.delivery_tag, body))
+            if len(batch) >= max_count or not self.channel.get_waiting_message_count():
+                break
+        return batch
+
+    def ack(self, delivery_tag: int, multiple: bool = False) -> None:
+        self.channel.basic_ack(delivery_tag, multiple=multiple)
+
+    def close(self) -> None:
+        self.channel.cancel()
+        self.connection.close()
+
+
+class RenderWorker:
+    """
+    Render notification messages before they reach the channel services.
+
+    Messages are taken from the render queue in batches of up to
+    ``batch_size``, grouped by template so each template is resolved once
+    per batch, rendered with the variables of each message and published
+    to the queue of their notification type (``email`` or ``push``).
+    Messages that cannot be rendered go to the ``failed`` queue with the
+    reason. A batch is acknowledged once all of its results are published,
+    so a worker that dies mid-batch gets the whole batch redelivered.
+    """
+
+    def __init__(
+        self,
+        broker,
+        queue: str = RENDER_QUEUE,
+        batch_size: int = 100,
+        timeout: float = 1.0,
+    ):
+        self.broker = broker
+        self.queue = queue
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+    def setup(self) -> None:
+        self.broker.declare(self.queue, EXCHANGE, RENDER_ROUTING_KEY)
+
+    def run(self, max_batches: Optional[int] = None) -> None:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            deliveries = self.broker.get_batch(
+                self.queue, self.batch_size, self.timeout
+            )
+            if deliveries:
+                close_old_connections()
+                self.process_batch(deliveries)
+            batches += 1
+
+    def process_batch(self, deliveries: List[Delivery]) -> dict:
+        start = time.perf_counter()
+        groups: Dict[tuple, list] = defaultdict(list)
+        failed = 0
+        for delivery in deliveries:
+            try:
+                message = NotificationMessage.model_validate_json(delivery.body)
+            except ValidationError as e:
+                self._publish_failed(*self._unparsed(delivery.body), str(e))
+                failed += 1
+                continue
+            groups[message.template_key()].append(message)
+
+        # Every template of the batch is resolved in one cache round trip
+        references = [self._reference(messages[0]) for messages in groups.values()]
+        templates = TemplateService.resolve_templates(references)
+
+        rendered = 0
+        for messages, template in zip(groups.values(), templates):
+            group_rendered = self._render_group(messages, template)
+            rendered += group_rendered
+            failed += len(messages) - group_rendered
+
+        if deliveries:
+            self.broker.ack(deliveries[-1].delivery_tag, multiple=True)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Rendered {rendered} messages for {len(groups)} templates "
+            f"({failed} failed) in {elapsed:.3f}s"
+        )
+        return {"rendered": rendered, "failed": failed, "templates": len(groups)}
+
+    @staticmethod
+    def _reference(message) -> TemplateReference:
+        return TemplateReference(
+            id=message.template_id,
+            name=message.template_code,
+            category=message.notification_type,
+            language=message.language,
+        )
+
+    def _render_group(self, messages: list, template) -> int:
+        """Render a group of messages with their resolved template, or fail them"""
+        if isinstance(template, Exception):
+            for message in messages:
+                self._publish_failed(
+                    message.model_dump(mode="json"), None, str(template)
+                )
+            return 0
+
+        path = "id" if messages[0].template_id else "name"
+        with render_seconds.labels(path, "worker").time():
+            contexts = [message.variables for message in messages]
+            rendered = 0
+            for message, item in zip(
+                messages, TemplateService.iter_rendered_items(template, contexts)
+            ):
+                payload = message.model_dump(mode="json")
+                if not item["success"]:
+                    self._publish_failed(payload, None, item["error"])
+                    continue
+                payload["rendered"] = {
+                    "template_id": str(template.id),
+                    "version": template.version,
+                    "subject": item["subject"],
+                    "body": item["body"],
+                }
+                self.broker.publish(
+                    EXCHANGE,
+                    message.notification_type.value,
+                    json.dumps(payload).encode(),
+                    priority=message.priority,
+                )
+                rendered += 1
+
+        template_renders_total.labels(template.name).inc(rendered)
+        return rendered
+
+    @staticmethod
+    def _unparsed(body: bytes) -> tuple:
+        """The message and raw text to fail an invalid delivery with"""
+        text = body.decode(errors="replace")
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return None, text
+        return (message, None) if isinstance(message, dict) else (None, text)
+
+    def _publish_failed(
+        self, message: Optional[dict], raw: Optional[str], error: str
+    ) -> None:
+        """
+        Publish a message to the failed queue
+
+        Every entry is ``{"message", "raw", "error"}``: ``message`` is the
+        message object, or null when the delivery was not a JSON object, in
+        which case ``raw`` holds its text.
+        """
+        logger.warning(f"Could not render notification message: {error}")
+        body = json.dumps({"message": message, "raw": raw, "error": error}).encode()
+        self.broker.publish(EXCHANGE, FAILED_ROUTING_KEY, body)